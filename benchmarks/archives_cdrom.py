@@ -0,0 +1,100 @@
+"""directory records / second for cdrom.Directory, read_struct per field vs. StructReader"""
+# usage: python -m benchmarks.archives_cdrom [num_sectors]
+import io
+import struct
+import sys
+import time
+
+from breki import binary
+from breki.archives import cdrom
+
+
+def raw_record(name: bytes, lba: int, size: int) -> bytes:
+    length = 33 + len(name) + ((len(name) + 1) % 2)
+    return b"".join([
+        struct.pack("<2B", length, 0),
+        struct.pack("<I", lba), struct.pack(">I", lba),
+        struct.pack("<I", size), struct.pack(">I", size),
+        bytes([99, 12, 31, 23, 59, 59, 0]),  # TimeStamp
+        bytes([cdrom.FileFlag.HIDDEN, 0, 0]),
+        struct.pack("<H", 1), struct.pack(">H", 1),  # volume_sequence_index
+        bytes([len(name)]), name,
+        b"\x00" if len(name) % 2 == 0 else b""])
+
+
+def raw_sector(index: int) -> bytes:
+    """".", ".." & as many files as will fit in 2048 bytes"""
+    out = raw_record(b"\x00", 20, 2048) + raw_record(b"\x01", 20, 2048)
+    for i in range(64):
+        record = raw_record(f"FILE_{index:04d}_{i:02d}.BIN;1".encode(), 100 + i, 1234)
+        if len(out) + len(record) >= 2048:
+            break
+        out += record
+    return out + b"\x00" * (2048 - len(out))
+
+
+def per_field(stream: io.BytesIO) -> cdrom.Directory:
+    """binary.read_struct per field (as cdrom.Directory.from_stream was before StructReader)"""
+    out = cdrom.Directory()
+    out.length, out.ear_length = binary.read_struct(stream, "2B")
+    if out.length == 0:
+        return None
+    out.le_data_lba = binary.read_struct(stream, "<I")
+    out.be_data_lba = binary.read_struct(stream, ">I")
+    out.le_data_size = binary.read_struct(stream, "<I")
+    out.be_data_size = binary.read_struct(stream, ">I")
+    if out.le_data_lba == out.be_data_lba:
+        out.data_lba, out.data_size = out.le_data_lba, out.le_data_size
+    else:
+        out.data_lba, out.data_size = out.be_data_lba, out.be_data_size
+    year, month, day = binary.read_struct(stream, "3B")
+    hour, minute, second = binary.read_struct(stream, "3B")
+    timezone = binary.read_struct(stream, "B")
+    out.timestamp = cdrom.TimeStamp(year, month, day, hour, minute, second, 0, timezone)
+    out.flags = cdrom.FileFlag(binary.read_struct(stream, "B"))
+    out.interleaved_unit_size = binary.read_struct(stream, "B")
+    out.interleaved_gap_size = binary.read_struct(stream, "B")
+    little_endian = binary.read_struct(stream, "<H")
+    assert little_endian == binary.read_struct(stream, ">H")
+    out.volume_sequence_index = little_endian
+    filename_length = binary.read_struct(stream, "B")
+    filename = binary.read_struct(stream, f"{filename_length}s")
+    out.is_file = filename.endswith(b";1")
+    out.name = filename.decode()[:-2] if out.is_file else filename.decode()
+    assert len(set(out.name).difference(cdrom.strD)) == 0 or not out.is_file
+    if filename_length % 2 == 0:
+        assert stream.read(1) == b"\x00"
+    out.extras = None
+    return out
+
+
+def parse_sectors(parse, wrap, raw_sectors) -> int:
+    count = 0
+    for raw in raw_sectors:
+        stream = wrap(raw)
+        while parse(stream) is not None:
+            count += 1
+    return count
+
+
+def records_per_second(parse, wrap, raw_sectors) -> float:
+    """best of 5"""
+    durations = list()
+    for i in range(5):
+        start = time.perf_counter()
+        count = parse_sectors(parse, wrap, raw_sectors)
+        durations.append(time.perf_counter() - start)
+    return count / min(durations)
+
+
+if __name__ == "__main__":
+    num_sectors = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    raw_sectors = [raw_sector(i) for i in range(num_sectors)]
+    results = {
+        "read_struct per field": records_per_second(per_field, io.BytesIO, raw_sectors),
+        "Directory (io.BytesIO)": records_per_second(cdrom.Directory.from_stream, io.BytesIO, raw_sectors),
+        "Directory (StructReader)": records_per_second(cdrom.Directory.from_stream, binary.StructReader, raw_sectors)}
+    # NOTE: io.BytesIO wraps each record in a new StructReader, which seeks back after every record
+    baseline = results["read_struct per field"]
+    for method, result in results.items():
+        print(f"{method:<28} {result:>12,.0f} records/s ({result / baseline:.1f}x)")
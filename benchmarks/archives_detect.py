@@ -0,0 +1,60 @@
+"""seconds to open a folder of mixed .pak files, parse & retry each class vs. archives.detect"""
+# usage: python -m benchmarks.archives_detect [num_paks] [num_entries]
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from breki.archives import id_software, ion_storm, runecraft
+from breki import archives
+
+
+def raw_pak(archive_class, num_entries: int) -> bytes:
+    if archive_class is runecraft.Pak:
+        return b"NPCK" + struct.pack("I", num_entries) + struct.pack("3I", 0, 0, 0) * num_entries
+    sizeof_entry = 64 if archive_class is id_software.Pak else 72
+    entries = b"".join(
+        struct.pack("56s2I", f"folder/file_{i:05d}.bin".encode(), 12 + i, 1).ljust(sizeof_entry, b"\x00")
+        for i in range(num_entries))
+    return b"PACK" + struct.pack("2I", 12 + num_entries, len(entries)) + b"\x00" * num_entries + entries
+
+
+def parse_and_retry(filepath: str):
+    """each candidate in order, until one parses"""
+    for archive_class in archives.formats.candidates(os.path.basename(filepath)):
+        archive = archive_class.from_file(filepath)
+        try:
+            archive.parse()
+            return archive
+        except (AssertionError, UnicodeDecodeError):
+            continue
+    raise RuntimeError(f"couldn't parse {filepath!r}")
+
+
+def detect_and_parse(filepath: str):
+    archive = archives.detect(filepath).from_file(filepath)
+    archive.parse()
+    return archive
+
+
+if __name__ == "__main__":
+    num_paks = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    num_entries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    with tempfile.TemporaryDirectory() as folder:
+        filepaths = dict()
+        for i in range(num_paks):
+            archive_class = (id_software.Pak, ion_storm.Pak, runecraft.Pak)[i % 3]
+            filepaths[os.path.join(folder, f"pak{i:03d}.pak")] = archive_class
+            with open(os.path.join(folder, f"pak{i:03d}.pak"), "wb") as pak_file:
+                pak_file.write(raw_pak(archive_class, num_entries))
+        results = dict()
+        for method in (parse_and_retry, detect_and_parse):
+            start = time.perf_counter()
+            wrong_class = sum(
+                type(method(filepath)) is not archive_class
+                for filepath, archive_class in filepaths.items())
+            results[method.__name__] = (time.perf_counter() - start, wrong_class)
+    baseline = results["parse_and_retry"][0]
+    for method, (duration, wrong_class) in results.items():
+        print(f"{method:<18} {duration:>8.3f}s ({baseline / duration:.1f}x) {wrong_class} opened as the wrong class")
@@ -0,0 +1,82 @@
+"""MB/s & files/s extracting a stored .pak & a zlib compressed .dat, 1 file at a time vs. Archive.extract_all"""
+# usage: python -m benchmarks.archives_extract [num_files] [file_size] [workers]
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+from breki.archives import id_software, ion_storm
+
+
+def file_data(i: int, size: int) -> bytes:
+    """compressible, but not trivially"""
+    rng = random.Random(i)
+    words = [bytes(rng.choices(b"abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 10))) for _ in range(256)]
+    return b" ".join(rng.choices(words, k=size // 6))[:size]
+
+
+def raw_pak(num_files: int, file_size: int) -> bytes:
+    data, entries, offset = list(), list(), 12
+    for i in range(num_files):
+        data.append(file_data(i, file_size))
+        entries.append(struct.pack("56s2I", f"data/folder_{i // 100:04d}/file_{i:06d}.bin".encode(), offset, file_size))
+        offset += file_size
+    return b"PACK" + struct.pack("2I", offset, len(entries) * 64) + b"".join(data) + b"".join(entries)
+
+
+def raw_dat(num_files: int, file_size: int) -> bytes:
+    data, entries, offset = list(), list(), 16
+    for i in range(num_files):
+        stored = zlib.compress(file_data(i, file_size))
+        filename = f"data/folder_{i // 100:04d}/file_{i:06d}.bin".encode()
+        entries.append(struct.pack("128s4I", filename, offset, file_size, len(stored), 0))
+        data.append(stored)
+        offset += len(stored)
+    return struct.pack("4s3I", b"ADAT", offset, len(entries) * 144, 9) + b"".join(data) + b"".join(entries)
+
+
+def extract_one_at_a_time(archive, to_path: str):
+    """Archive.extract_all, before .names & ._extract_many"""
+    for filename in archive.names:
+        if filename not in archive.namelist():
+            raise FileNotFoundError(f"Couldn't find {filename!r} to extract")
+        out_filename = os.path.join(to_path, filename)
+        os.makedirs(os.path.dirname(out_filename), exist_ok=True)
+        with open(out_filename, "wb") as out_file:
+            out_file.write(archive.read(filename))
+
+
+if __name__ == "__main__":
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    file_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2 ** 20
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    total_mb = num_files * file_size / 2 ** 20
+    temp_folder = tempfile.mkdtemp()
+    try:
+        for archive_class, raw_func, ext in [(id_software.Pak, raw_pak, "pak"), (ion_storm.Dat, raw_dat, "dat")]:
+            archive_filename = os.path.join(temp_folder, f"test.{ext}")
+            with open(archive_filename, "wb") as archive_file:
+                archive_file.write(raw_func(num_files, file_size))
+            print(f"{archive_class.__name__}: {num_files:,} x {file_size:,} byte files ({total_mb:,.0f} MB)")
+            methods = {
+                "one at a time": extract_one_at_a_time,
+                "extract_all": lambda archive, to_path: archive.extract_all(to_path),
+                f"{workers} workers": lambda archive, to_path: archive.extract_all(to_path, workers=workers)}
+            baseline = None
+            for method, func in methods.items():
+                archive = archive_class(archive_filename)
+                archive.parse()
+                to_path = os.path.join(temp_folder, "out")
+                start = time.perf_counter()
+                func(archive, to_path)
+                duration = time.perf_counter() - start
+                baseline = duration if baseline is None else baseline
+                print(f"  {method:<16} {duration:>8.3f}s {total_mb / duration:>8,.1f} MB/s",
+                      f"{num_files / duration:>10,.0f} files/s ({baseline / duration:.1f}x)")
+                shutil.rmtree(to_path)
+    finally:
+        shutil.rmtree(temp_folder)
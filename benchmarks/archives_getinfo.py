@@ -0,0 +1,47 @@
+"""seconds to total the size of every file in a compressed ion_storm.Dat, len(.read()) vs. .sizeof (.getinfo)"""
+# usage: python -m benchmarks.archives_getinfo [num_files] [file_size]
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+from breki.archives import ion_storm
+
+
+def raw_dat(num_files: int, file_size: int) -> bytes:
+    data = zlib.compress(bytes(range(256)) * (file_size // 256))
+    entries = b"".join(
+        struct.pack("128s4I", f"folder/file_{i:05d}.bin".encode(), 16, file_size // 256 * 256, len(data), 0)
+        for i in range(num_files))
+    # NOTE: every entry shares the same data
+    return struct.pack("4s3I", b"ADAT", 16 + len(data), len(entries), 9) + data + entries
+
+
+def sizeof_by_read(dat) -> int:
+    """base.Archive.sizeof, before .getinfo"""
+    return sum(len(dat.read(filename)) for filename in dat.namelist())
+
+
+def sizeof_by_getinfo(dat) -> int:
+    return sum(dat.sizeof(filename) for filename in dat.namelist())
+
+
+if __name__ == "__main__":
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    file_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2 ** 20
+    with tempfile.TemporaryDirectory() as folder:
+        filepath = os.path.join(folder, "test.dat")
+        with open(filepath, "wb") as dat_file:
+            dat_file.write(raw_dat(num_files, file_size))
+        results = dict()
+        for method in (sizeof_by_read, sizeof_by_getinfo):
+            dat = ion_storm.Dat.from_file(filepath)
+            dat.parse()
+            start = time.perf_counter()
+            total = method(dat)
+            results[method.__name__] = (time.perf_counter() - start, total)
+    baseline = results["sizeof_by_read"][0]
+    for method, (duration, total) in results.items():
+        print(f"{method:<18} {duration:>8.3f}s ({baseline / duration:,.0f}x) {total / 2 ** 20:,.0f}MB")
@@ -0,0 +1,42 @@
+"""seconds to check & read every file in an .apk, `in .namelist()` per file vs. the cached Archive.names"""
+# usage: python -m benchmarks.archives_namelist [num_files]
+import struct
+import sys
+import time
+
+from breki.archives import utoplanet
+
+
+def raw_apk(num_files: int) -> bytes:
+    dir_offset = 16 + num_files
+    entries, next_entry_offset = list(), dir_offset
+    for i in range(num_files):
+        filename = f"data/folder_{i // 100:04d}/file_{i:06d}.bin".encode()
+        next_entry_offset += 4 + len(filename) + 1 + 16
+        entry = struct.pack("4I", 16 + i, 1, next_entry_offset, 0)
+        entries.append(struct.pack("I", len(filename)) + filename + b"\x00" + entry)
+    return struct.pack("4s3I", b"\x57\x23\x00\x00", 16, num_files, dir_offset) + bytes(num_files) + b"".join(entries)
+
+
+def read_all_namelist(apk) -> int:
+    """Archive.extract_all, before .names (minus the disk writes)"""
+    return sum(len(apk.read(filename)) for filename in apk.namelist() if filename in apk.namelist())
+
+
+def read_all_names(apk) -> int:
+    return sum(len(apk.read(filename)) for filename in apk.names if filename in apk.names)
+
+
+if __name__ == "__main__":
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    raw = raw_apk(num_files)
+    results = dict()
+    for method in (read_all_namelist, read_all_names):
+        apk = utoplanet.Apk.from_bytes("test.apk", raw)
+        apk.parse()
+        start = time.perf_counter()
+        assert method(apk) == num_files
+        results[method.__name__] = time.perf_counter() - start
+    baseline = results["read_all_namelist"]
+    for method, duration in results.items():
+        print(f"{method:<18} {duration:>8.3f}s ({baseline / duration:,.0f}x)")
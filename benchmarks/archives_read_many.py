@@ -0,0 +1,66 @@
+"""seconds to read many small files from a .pak on disk, .read() in name order vs. Archive.read_many"""
+# NOTE: "cold" drops the .pak from the OS page cache first (needs os.posix_fadvise)
+# usage: python -m benchmarks.archives_read_many [num_files] [file_size]
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+
+from breki import files
+from breki.archives import id_software
+
+
+def raw_pak(num_files: int, file_size: int) -> bytes:
+    """files are stored in a different order to their names"""
+    order = list(range(num_files))
+    random.Random(0).shuffle(order)
+    entries = b"".join(
+        struct.pack("56s2I", f"data/file_{i:06d}.bin".encode(), 12 + order[i] * file_size, file_size)
+        for i in range(num_files))
+    data = os.urandom(num_files * file_size)
+    return b"PACK" + struct.pack("2I", 12 + len(data), len(entries)) + data + entries
+
+
+def drop_cache(filename: str):
+    files.handle_pool.close()
+    fd = os.open(filename, os.O_RDONLY)
+    os.fsync(fd)
+    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    os.close(fd)
+
+
+def read_loop(pak, filenames) -> int:
+    return sum(len(pak.read(filename)) for filename in filenames)
+
+
+def read_many(pak, filenames) -> int:
+    return sum(len(data) for filename, data in pak.read_many(filenames))
+
+
+if __name__ == "__main__":
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    file_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    with tempfile.TemporaryDirectory() as temp_folder:
+        pak_filename = os.path.join(temp_folder, "test.pak")
+        with open(pak_filename, "wb") as pak_file:
+            pak_file.write(raw_pak(num_files, file_size))
+        subset = random.Random(1).sample(range(num_files), num_files // 4)
+        caches = ["warm", "cold"] if hasattr(os, "posix_fadvise") else ["warm"]
+        for label, indices in [("every file", range(num_files)), ("1/4 of files", sorted(subset))]:
+            filenames = [f"data/file_{i:06d}.bin" for i in indices]
+            print(f"{label}: {len(filenames):,} x {file_size:,} bytes")
+            for cache in caches:
+                results = dict()
+                for method in (read_loop, read_many):
+                    pak = id_software.Pak(pak_filename)
+                    pak.parse()
+                    if cache == "cold":
+                        drop_cache(pak_filename)
+                    start = time.perf_counter()
+                    assert method(pak, filenames) == len(filenames) * file_size
+                    results[method.__name__] = time.perf_counter() - start
+                baseline = results["read_loop"]
+                for method, duration in results.items():
+                    print(f"  {cache} {method:<10} {duration:>8.3f}s ({baseline / duration:.1f}x)")
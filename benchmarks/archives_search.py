@@ -0,0 +1,44 @@
+"""seconds to run many searches on 1 archive, fnmatch.filter over .namelist() per search vs. Archive.search"""
+# usage: python -m benchmarks.archives_search [num_files] [rounds]
+import fnmatch
+import struct
+import sys
+import time
+
+from breki.archives import id_software
+
+extensions = ["bsp", "mdl", "vmt", "vtf", "wav", "txt", "cfg", "vtx"]
+globs = [f"*.{ext}" for ext in extensions] + ["materials/*/wall*", "*crate*", "sound/ambience/*"]
+
+
+def raw_pak(num_files: int) -> bytes:
+    folders = ["maps", "materials/brick", "materials/concrete", "models/props", "sound/ambience", "scripts"]
+    entries = b"".join(
+        struct.pack("56s2I", f"{folders[i % 6]}/file_{i:06d}.{extensions[i % 8]}".encode(), 12, 0)
+        for i in range(num_files))
+    return b"PACK" + struct.pack("2I", 12, len(entries)) + entries
+
+
+def search_fnmatch(pak) -> int:
+    """Archive.search, before query.Query"""
+    return sum(len(fnmatch.filter(pak.namelist(), glob)) for glob in globs)
+
+
+def search_query(pak) -> int:
+    return sum(len(pak.search(glob)) for glob in globs)
+
+
+if __name__ == "__main__":
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    raw = raw_pak(num_files)
+    results = dict()
+    for method in (search_fnmatch, search_query):
+        pak = id_software.Pak.from_bytes("test.pak", raw)
+        pak.parse()
+        start = time.perf_counter()
+        num_matches = sum(method(pak) for i in range(rounds))
+        results[method.__name__] = (time.perf_counter() - start, num_matches)
+    baseline = results["search_fnmatch"][0]
+    for method, (duration, num_matches) in results.items():
+        print(f"{method:<16} {duration:>8.3f}s ({baseline / duration:.1f}x) {num_matches:,} matches")
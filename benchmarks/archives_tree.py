@@ -0,0 +1,69 @@
+"""seconds to list every folder in a .pak, rescanning .namelist() per call vs. Archive.file_tree"""
+# usage: python -m benchmarks.archives_tree [num_files] [files_per_folder]
+import struct
+import sys
+import time
+from typing import List
+
+from breki.archives import base, id_software
+
+
+def raw_pak(num_files: int, files_per_folder: int) -> bytes:
+    entries = b"".join(
+        struct.pack("56s2I", f"data/folder_{i // files_per_folder:04d}/file_{i:06d}.bin".encode(), 12, 0)
+        for i in range(num_files))
+    return b"PACK" + struct.pack("2I", 12, len(entries)) + entries
+
+
+# Archive.is_dir & .listdir, before .file_tree
+def is_dir(archive, filepath: str) -> bool:
+    all_dirs = {base.path_tuple(fn)[:-1] for fn in archive.namelist()}
+    all_dirs.update({tuple_[:i] for tuple_ in all_dirs for i in range(1, len(tuple_))})
+    all_dirs.update({base.path_tuple(root) for root in (".", "./", "/")})
+    return base.path_tuple(filepath) in all_dirs
+
+
+def listdir(archive, folder: str) -> List[str]:
+    if not is_dir(archive, folder):
+        raise FileNotFoundError(f"no such directory: {folder}")
+    folder_tuple = base.path_tuple(folder)
+    if folder_tuple in {base.path_tuple(root) for root in (".", "./", "/")}:
+        folder_tuple = tuple()
+    folder_contents = set()
+    for fn in archive.namelist():
+        path = base.path_tuple(fn)
+        if path[:-1] == folder_tuple:
+            folder_contents.add(path[-1] + ("/" if is_dir(archive, fn) else ""))
+        elif is_dir(archive, fn):
+            continue
+        elif path[:len(folder_tuple)] == folder_tuple:
+            folder_contents.add(path[len(folder_tuple):][0] + "/")
+    return sorted(folder_contents)
+
+
+def list_folders(listdir_func, archive, folder: str = ".") -> int:
+    """like Archive.tree, w/o printing; returns the number of folders listed"""
+    out = 1
+    for filename in listdir_func(folder):
+        if filename.endswith("/"):
+            out += list_folders(listdir_func, archive, f"{folder}/{filename[:-1]}")
+    return out
+
+
+if __name__ == "__main__":
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    files_per_folder = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    raw = raw_pak(num_files, files_per_folder)
+    results = dict()
+    archive = id_software.Pak.from_bytes("test.pak", raw)
+    start = time.perf_counter()
+    num_folders = list_folders(lambda folder: listdir(archive, folder), archive)
+    results["rescan namelist"] = time.perf_counter() - start
+    archive = id_software.Pak.from_bytes("test.pak", raw)
+    start = time.perf_counter()
+    assert list_folders(archive.listdir, archive) == num_folders
+    results["file_tree"] = time.perf_counter() - start
+    print(f"{num_files:,} files in {num_folders:,} folders")
+    baseline = results["rescan namelist"]
+    for method, duration in results.items():
+        print(f"{method:<16} {duration:>8.3f}s ({baseline / duration:,.0f}x)")
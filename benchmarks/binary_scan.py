@@ -0,0 +1,55 @@
+"""MB / second scanning for archive magics, find_all per magic vs. scan_file"""
+# usage: python -m benchmarks.binary_scan [size_mb] [workers]
+import os
+import random
+import sys
+import tempfile
+import time
+
+from breki import binary
+
+
+magics = [
+    b"PACK", b"SPAK", b"RPak", b"SRPk", b"\x34\x12\xAA\x55", b"PK\x03\x04",
+    b"CD001", b"MComprHD", b"SEGA SEGAKATANA", "0F F5 ?? EE"]
+
+
+def synthetic_file(filepath: str, size: int):
+    """random bytes w/ a magic every ~64KB"""
+    data = bytearray(os.urandom(size))
+    literals = [magic for magic in magics if isinstance(magic, bytes)]
+    for offset in range(0, size - 16, 65536):
+        magic = random.choice(literals)
+        data[offset:offset + len(magic)] = magic
+    with open(filepath, "wb") as file:
+        file.write(data)
+
+
+def find_all_per_magic(filepath: str) -> int:
+    with open(filepath, "rb") as file:
+        data = file.read()
+    # NOTE: find_all can't do wildcards
+    return sum(len(binary.find_all(data, magic)) for magic in magics if isinstance(magic, bytes))
+
+
+def mb_per_second(func, filepath: str) -> float:
+    start = time.perf_counter()
+    num_hits = func(filepath)
+    duration = time.perf_counter() - start
+    return os.path.getsize(filepath) / duration / 2 ** 20, num_hits
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as folder:
+        filepath = os.path.join(folder, "synthetic.bin")
+        synthetic_file(filepath, size_mb * 2 ** 20)
+        results = {
+            "find_all per magic": mb_per_second(find_all_per_magic, filepath),
+            "scan_file": mb_per_second(lambda f: len(list(binary.scan_file(f, magics))), filepath),
+            f"scan_file ({workers} workers)": mb_per_second(
+                lambda f: len(list(binary.scan_file(f, magics, workers=workers))), filepath)}
+    baseline = results["find_all per magic"][0]
+    for method, (result, num_hits) in results.items():
+        print(f"{method:<24} {result:>8,.0f} MB/s ({result / baseline:.1f}x) {num_hits:,} hits")
@@ -0,0 +1,72 @@
+"""Vpk tree parse time, reading strings a byte at a time vs. reading ahead"""
+# usage: python -m benchmarks.binary_strings [num_entries]
+import io
+import struct
+import sys
+import time
+from typing import Tuple
+
+from breki import binary
+from breki.archives import valve
+
+
+def byte_at_a_time(stream: io.BytesIO, encoding="utf-8", errors="strict") -> str:
+    """binary.read_str (as it was before read-ahead)"""
+    out = b""
+    c = stream.read(1)
+    while c != b"\x00":
+        out += c
+        c = stream.read(1)
+    return out.decode(encoding, errors)
+
+
+def synthetic_vpk(num_entries: int) -> bytes:
+    """v1 tree w/ num_entries files spread across extensions & folders"""
+    tree = bytearray()
+    per_folder = 100
+    num_folders = max(num_entries // per_folder, 1)
+    extensions = ["vmt", "vtf", "mdl", "wav"]
+    for i, extension in enumerate(extensions):
+        tree += extension.encode() + b"\0"
+        for j in range(i, num_folders, len(extensions)):
+            tree += f"materials/synthetic/folder_{j:05d}".encode() + b"\0"
+            for k in range(per_folder):
+                tree += f"file_{j:05d}_{k:03d}".encode() + b"\0"
+                tree += struct.pack("I2H2I", j * per_folder + k, 0, 0x7FFF, 0, 0) + b"\xFF\xFF"
+            tree += b"\0"  # end of folder
+        tree += b"\0"  # end of extension
+    tree += b"\0"  # end of tree
+    return struct.pack("I2HI", 0x55AA1234, 1, 0, len(tree)) + tree
+
+
+def parse_time(raw_vpk: bytes) -> Tuple[float, int]:
+    vpk = valve.Vpk.from_bytes("synthetic.vpk", raw_vpk)
+    start = time.perf_counter()
+    vpk.parse()
+    duration = time.perf_counter() - start
+    return duration, len(vpk.entries)
+
+
+if __name__ == "__main__":
+    num_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    raw_vpk = synthetic_vpk(num_entries)
+    read_ahead = binary.read_str
+    binary.read_str = byte_at_a_time
+    before, num_parsed = parse_time(raw_vpk)
+    binary.read_str = read_ahead
+    after, num_parsed = parse_time(raw_vpk)
+    print(f"{num_parsed:,} entries, {len(raw_vpk):,} byte tree")
+    print(f"{'byte at a time':<16} {before:>8.3f}s")
+    print(f"{'read ahead':<16} {after:>8.3f}s ({before / after:.1f}x)")
+    raw_table = b"".join(f"string_{i:06d}".encode() + b"\0" for i in range(num_entries))
+    timings = dict()
+    for method, func in {
+            "read_str": lambda s: [binary.read_str(s) for i in range(num_entries)],
+            "read_strs": lambda s: binary.read_strs(s, num_entries),
+            "split_strings": lambda s: binary.split_strings(s.read())}.items():
+        stream = io.BytesIO(raw_table)
+        start = time.perf_counter()
+        func(stream)
+        timings[method] = time.perf_counter() - start
+    for method, duration in timings.items():
+        print(f"{method:<16} {duration:>8.3f}s ({timings['read_str'] / duration:.1f}x) {num_entries:,} strings")
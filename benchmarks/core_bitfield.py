@@ -0,0 +1,51 @@
+"""packed ints / second for BitField, one at a time vs. a column at a time"""
+# usage: python -m benchmarks.core_bitfield [num_ints]
+import array
+import os
+import sys
+import time
+
+from breki import core
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_fields = {"flags": 10, "index": 22}
+_format = "I"
+
+
+def one_at_a_time(ints):
+    """validated __init__ per BitField (as .from_int was before .array_from_ints)"""
+    offsets = [(32 - 10, 0x3FF), (0, 0x3FFFFF)]
+    return [
+        core.BitField(*[(int_ >> shift) & mask for shift, mask in offsets], _fields=_fields, _format=_format)
+        for int_ in ints]
+
+
+def ints_per_second(func, ints) -> float:
+    start = time.perf_counter()
+    func(ints)
+    return len(ints) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    num_ints = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ints = array.array("I", os.urandom(num_ints * 4))
+    results = {
+        "BitField(...) per int": ints_per_second(one_at_a_time, ints),
+        "BitField.from_int": ints_per_second(
+            lambda x: [core.BitField.from_int(i, _fields, _format) for i in x], ints),
+        "BitField.array_from_ints": ints_per_second(
+            lambda x: core.BitField.array_from_ints(x, _fields, _format), ints),
+        "BitField.decode_array": ints_per_second(
+            lambda x: core.BitField.decode_array(x, _fields, _format), ints)}
+    if np is not None:
+        np_ints = np.frombuffer(ints.tobytes(), dtype=np.uint32)
+        results["BitField.decode_array (numpy)"] = ints_per_second(
+            lambda x: core.BitField.decode_array(x, _fields, _format), np_ints)
+    baseline = results["BitField(...) per int"]
+    for method, result in results.items():
+        print(f"{method:<32} {result:>14,.0f} ints/s ({result / baseline:.1f}x)")
@@ -0,0 +1,71 @@
+"""records / second for Struct & MappedArray, w/ & w/o generated codecs"""
+# usage: python -m benchmarks.core_codec [num_records]
+import contextlib
+import os
+import sys
+import time
+
+from breki import core
+from breki.archives import respawn
+from breki.archives import valve
+
+
+class Example(core.Struct):
+    __slots__ = ["id", "position", "data", "flags", "bitfield"]
+    _format = "i3f3iI"
+    _arrays = {"position": [*"xyz"], "data": 2}
+    _bitfields = {"bitfield": {"foo": 24, "bar": 8}}
+
+
+@contextlib.contextmanager
+def generic(cls):
+    """fall back to the slow path (as it was before codecs)"""
+    # NOTE: MappedArray subclasses w/ __slots__ parse into a generated subclass
+    classes = {cls, cls.specialise()} if issubclass(cls, core.MappedArray) else {cls}
+    codecs = {c: c._codec for c in classes}
+    for c in classes:
+        c._codec = None
+    try:
+        yield
+    finally:
+        for c, codec in codecs.items():
+            c._codec = codec
+
+
+def records_per_second(func, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        func(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def bench(cls, num_records: int):
+    size = cls._codec.struct.size
+    raw_records = [os.urandom(size) for i in range(num_records)]
+    # keep values in range for BitFields etc.
+    raw_records = [cls.from_bytes(raw).as_bytes() for raw in raw_records]
+    parsed = [cls.from_bytes(raw) for raw in raw_records]
+    results = dict()
+    with generic(cls):
+        results["from_bytes"] = [records_per_second(cls.from_bytes, raw_records)]
+        results["as_bytes"] = [records_per_second(cls.as_bytes, parsed)]
+    results["from_bytes"].append(records_per_second(cls.from_bytes, raw_records))
+    results["as_bytes"].append(records_per_second(cls.as_bytes, parsed))
+    # b"".join(.as_bytes()) vs. .pack_many
+    if issubclass(cls, core.Struct):
+        start = time.perf_counter()
+        b"".join(record.as_bytes() for record in parsed)
+        before = len(parsed) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        cls.pack_many(parsed)
+        results["pack_many"] = [before, len(parsed) / (time.perf_counter() - start)]
+    for method, (before, after) in results.items():
+        print(
+            f"{cls.__name__ + '.' + method:<24} {before:>12,.0f} -> {after:>12,.0f} records/s",
+            f"({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for cls in (valve.VpkEntry, Example, respawn.rpak.AssetEntryv6):
+        bench(cls, num_records)
@@ -0,0 +1,67 @@
+"""bytes / record & attribute writes for MappedArray, w/ & w/o generated __slots__"""
+# usage: python -m benchmarks.core_mapped_array [num_records]
+import os
+import sys
+import timeit
+import tracemalloc
+
+from breki import core
+from breki.archives import respawn
+from breki.core import codec
+from breki.core import common
+
+
+class Legacy:
+    """per-instance __dict__ holding the spec (as it was before MappedArray.specialise)"""
+
+    def __init__(self, cls):
+        class DictBacked(cls.__base__ if cls.__slots__ == () else cls):
+            _mapping = cls._mapping
+            _format = cls._format
+
+            def __setattr__(self, attr, value):
+                # every write went through common.school
+                value = common.school(self, attr, value)
+                object.__setattr__(self, attr, value)
+
+        DictBacked.__name__ = cls.__name__
+        self.cls = DictBacked
+
+    def from_bytes(self, raw: bytes) -> core.MappedArray:
+        out = self.cls.from_bytes(raw)
+        out.__dict__.update(
+            _mapping=out._mapping, _format=out._format,
+            _bitfields=out._bitfields, _classes=out._classes,
+            _attr_formats=codec.attr_formats(out._mapping, out._format))
+        return out
+
+
+def bytes_per_record(from_bytes, raw_records) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = [from_bytes(raw) for raw in raw_records]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del records
+    return total / len(raw_records)
+
+
+def bench(cls, num_records: int):
+    compact = cls.specialise()
+    raw_records = [os.urandom(compact._codec.struct.size) for i in range(num_records)]
+    legacy = Legacy(compact)
+    before = bytes_per_record(legacy.from_bytes, raw_records)
+    after = bytes_per_record(cls.from_bytes, raw_records)
+    print(f"{cls.__name__:<16} {before:>8,.0f} -> {after:>8,.0f} bytes / record ({before / after:.1f}x)")
+    attr = list(cls._mapping)[0]
+    writes = [
+        min(timeit.repeat(lambda: setattr(record, attr, 1), number=num_records, repeat=5))
+        for record in (legacy.from_bytes(raw_records[0]), cls.from_bytes(raw_records[0]))]
+    print(f"{'':<16} {writes[0] * 1e9 / num_records:>8,.0f} -> {writes[1] * 1e9 / num_records:>8,.0f} ns / write")
+
+
+if __name__ == "__main__":
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for cls in (respawn.rpak.VirtualSegment, respawn.rpak.Descriptor, respawn.rpak.AssetEntryv6):
+        bench(cls, num_records)
@@ -0,0 +1,64 @@
+"""MB & lookups / second for a {path: entry} table, dict vs. core.PathTable"""
+# usage: python -m benchmarks.core_path_table [num_folders] [files_per_folder]
+import gc
+import sys
+import time
+import tracemalloc
+
+from breki import core
+
+
+def vpk_like_paths(num_folders: int, files_per_folder: int):
+    """(folder, filename) in deep folders, like an Apex _dir.vpk"""
+    for i in range(num_folders):
+        folder = f"materials/models/weapons/attachments/variant_{i // 100:03d}/skin_{i:05d}"
+        for j in range(files_per_folder):
+            yield folder, f"skin_{i:05d}_{j:04d}_col.vtf"  # unique
+
+
+def build_dict(num_folders: int, files_per_folder: int) -> dict:
+    """as valve.Vpk.parse was before core.PathTable"""
+    return {
+        f"{folder}/{filename}": None
+        for folder, filename in vpk_like_paths(num_folders, files_per_folder)}
+
+
+def build_path_table(num_folders: int, files_per_folder: int) -> core.PathTable:
+    out = core.PathTable()
+    for folder, filename in vpk_like_paths(num_folders, files_per_folder):
+        out.insert(folder, filename, None)
+    return out
+
+
+def measure(build, *args) -> (float, float, object):
+    """(MB, seconds to build, table)"""
+    gc.collect()
+    tracemalloc.start()
+    table = build(*args)  # NOTE: tracemalloc slows the build down, so it isn't timed
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del table
+    gc.collect()
+    start = time.perf_counter()
+    table = build(*args)
+    return size / 2 ** 20, time.perf_counter() - start, table
+
+
+if __name__ == "__main__":
+    num_folders = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    files_per_folder = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    lookups = [f"{folder}/{filename}" for folder, filename in vpk_like_paths(num_folders, files_per_folder)][::7]
+    results = dict()
+    for name, build in (("dict", build_dict), ("core.PathTable", build_path_table)):
+        size, duration, table = measure(build, num_folders, files_per_folder)
+        start = time.perf_counter()
+        for path in lookups:
+            table[path]
+        lookup_rate = len(lookups) / (time.perf_counter() - start)
+        results[name] = (size, duration, lookup_rate)
+        if isinstance(table, core.PathTable):
+            print({k: f"{v / 2 ** 20:.1f}MB" for k, v in table.memory_usage().items()})
+        del table
+    print(f"{num_folders * files_per_folder:,} paths")
+    for name, (size, duration, lookup_rate) in results.items():
+        print(f"{name:<16} {size:>8.1f}MB built in {duration:.2f}s {lookup_rate:>12,.0f} lookups/s")
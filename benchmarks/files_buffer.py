@@ -0,0 +1,75 @@
+"""MB / second reading every sector of a .bin track: File.stream seek & read, File.buffer slices & File.read_at"""
+# usage: python -m benchmarks.files_buffer [size_mb]
+import os
+import sys
+import tempfile
+import time
+
+from breki.archives import base
+from breki import files
+
+
+def seek_and_read(disc: base.DiscImage, length: int) -> bytes:
+    """base.DiscImage.sector_read (as it was before File.buffer)"""
+    track_index, sub_lba = disc._cursor
+    track = disc.tracks[track_index]
+    data_slice = track.data_slice()
+    track_stream = disc.friends[track.name].stream
+    track_stream.seek(sub_lba * track.sector_size)
+    sector_data = [
+        track_stream.read(track.sector_size)[data_slice]
+        for i in range(length)]
+    disc._cursor = (track_index, sub_lba + length)
+    return b"".join(sector_data)
+
+
+def buffer_slices(disc: base.DiscImage, length: int) -> bytes:
+    """base.DiscImage.sector_read w/ File.buffer (maps the track, holding an fd outside of files.handle_pool)"""
+    track_index, sub_lba = disc._cursor
+    track = disc.tracks[track_index]
+    data_slice = track.data_slice()
+    track_buffer = disc.friends[track.name].buffer
+    start = sub_lba * track.sector_size
+    sector_data = [
+        track_buffer[offset:offset + track.sector_size][data_slice]
+        for offset in range(start, start + length * track.sector_size, track.sector_size)]
+    disc._cursor = (track_index, sub_lba + length)
+    return b"".join(sector_data)
+
+
+def synthetic_disc(filepath: str, size: int) -> base.DiscImage:
+    """one Mode 1 track of 2352 byte sectors"""
+    num_sectors = size // 2352
+    with open(filepath, "wb") as file:
+        file.write(os.urandom(num_sectors * 2352))
+    disc = base.DiscImage(os.path.join(os.path.dirname(filepath), "synthetic.cue"))
+    disc.tracks = [base.Track(base.TrackMode.BINARY_1, 2352, 0, num_sectors, "synthetic.bin")]
+    disc.friends = {"synthetic.bin": files.File.from_file(filepath, files.DataType.BINARY)}
+    disc.is_parsed = True
+    return disc
+
+
+def mb_per_second(sector_read, disc: base.DiscImage, sectors_per_read: int = 16) -> float:
+    """best of 3"""
+    durations = list()
+    for i in range(3):
+        disc.sector_seek(0)
+        start = time.perf_counter()
+        for lba in range(0, len(disc) - sectors_per_read, sectors_per_read):
+            sector_read(disc, sectors_per_read)
+        durations.append(time.perf_counter() - start)
+    return len(disc) * 2048 / min(durations) / 2 ** 20
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    with tempfile.TemporaryDirectory() as folder:
+        disc = synthetic_disc(os.path.join(folder, "synthetic.bin"), size_mb * 2 ** 20)
+        results = {
+            "File.stream seek & read": mb_per_second(seek_and_read, disc),
+            "File.buffer slices": mb_per_second(buffer_slices, disc),
+            "File.read_at (current)": mb_per_second(base.DiscImage.sector_read, disc)}
+        del disc  # release the mmap before the folder is deleted
+    baseline = results["File.stream seek & read"]
+    for method, result in results.items():
+        print(f"{method:<24} {result:>8,.0f} MB/s ({result / baseline:.1f}x)")
@@ -0,0 +1,53 @@
+"""open OS handles & reads / second for many Files on disk, open() per File vs. files.handle_pool"""
+# usage: python -m benchmarks.files_handle_pool [num_files] [max_handles]
+import os
+import sys
+import tempfile
+import time
+
+from breki import files
+
+
+def open_handles() -> int:
+    if os.path.isdir("/proc/self/fd"):  # linux
+        return len(os.listdir("/proc/self/fd"))
+    return -1  # unknown
+
+
+def read_all(streams, rounds: int = 4):
+    """round robin, the worst case for an LRU"""
+    for i in range(rounds):
+        for stream in streams:
+            stream.seek(i * 64)
+            stream.read(64)
+
+
+if __name__ == "__main__":
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    max_handles = int(sys.argv[2]) if len(sys.argv) > 2 else files.handle_pool.max_handles
+    with tempfile.TemporaryDirectory() as folder:
+        filepaths = list()
+        for i in range(num_files):
+            filepaths.append(os.path.join(folder, f"pak_{i:03d}.vpk"))
+            with open(filepaths[-1], "wb") as file:
+                file.write(os.urandom(4096))
+        results = dict()
+        baseline_handles = open_handles()
+        # open() per File (as File.stream was before the pool)
+        streams = [open(filepath, "rb") for filepath in filepaths]
+        start = time.perf_counter()
+        read_all(streams)
+        results["open() per File"] = (time.perf_counter() - start, open_handles() - baseline_handles)
+        for stream in streams:
+            stream.close()
+        # pooled
+        files.handle_pool.resize(max_handles)
+        streams = [files.File.from_file(filepath, files.DataType.BINARY).stream for filepath in filepaths]
+        start = time.perf_counter()
+        read_all(streams)
+        results["handle_pool"] = (time.perf_counter() - start, open_handles() - baseline_handles)
+        print(files.handle_pool.metrics())
+        files.handle_pool.close()
+    num_reads = num_files * 4
+    for method, (duration, handles) in results.items():
+        print(f"{method:<16} {num_reads / duration:>10,.0f} reads/s {handles:>6,} OS handles")
@@ -0,0 +1,39 @@
+"""valve.Vpk reopen time, parsing the tree vs. loading it from a files.IndexCache"""
+# usage: python -m benchmarks.files_index_cache [num_entries]
+import os
+import sys
+import tempfile
+import time
+
+from breki.archives import valve
+from breki import files
+
+from .binary_strings import synthetic_vpk
+
+
+def reopen_time(filepath: str) -> float:
+    """best of 5"""
+    durations = list()
+    for i in range(5):
+        start = time.perf_counter()
+        vpk = valve.Vpk.from_file(filepath)
+        durations.append(time.perf_counter() - start)
+    assert len(vpk.entries) > 0
+    return min(durations)
+
+
+if __name__ == "__main__":
+    num_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as folder:
+        filepath = os.path.join(folder, "synthetic_dir.vpk")
+        with open(filepath, "wb") as vpk_file:
+            vpk_file.write(synthetic_vpk(num_entries))
+        parse = reopen_time(filepath)
+        valve.Vpk.index_cache = files.IndexCache(os.path.join(folder, "cache"))
+        valve.Vpk.from_file(filepath)  # cold, saves index
+        warm = reopen_time(filepath)
+        index_size = sum(stat.st_size for stat in valve.Vpk.index_cache.index_files().values())
+        files.handle_pool.close()
+    print(f"{num_entries:,} entries, {index_size:,} byte index")
+    print(f"{'parse':<16} {parse:>8.3f}s")
+    print(f"{'IndexCache':<16} {warm:>8.3f}s ({parse / warm:.1f}x)")
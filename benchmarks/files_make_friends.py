@@ -0,0 +1,73 @@
+"""seconds to make friends for every *_dir.vpk in a crowded folder, os.listdir & fnmatch vs. files.listing_cache"""
+# usage: python -m benchmarks.files_make_friends [num_dir_vpks] [archives_per_vpk]
+import fnmatch
+import os
+import sys
+import tempfile
+import time
+
+from breki import files
+
+
+class DirVpk(files.FriendlyBinaryFile):
+    """exact friends, like valve.Vpk"""
+    archives_per_vpk = 9
+
+    @property
+    def friend_patterns(self):
+        return {
+            f"{self.filename[:-8]}_{index:03d}.vpk": files.DataType.BINARY
+            for index in range(self.archives_per_vpk)}
+
+
+class GlobVpk(DirVpk):
+    """a glob friend, like respawn.Vpk"""
+
+    @property
+    def friend_patterns(self):
+        return {f"{self.filename[:-8]}_*.vpk": files.DataType.BINARY}
+
+
+def make_friends(self):
+    """files.FriendlyFile.make_friends (as it was before files.listing_cache)"""
+    candidates = {
+        filename: os.path.join(self.folder, filename)
+        for filename in os.listdir(self.folder)}
+    friends = {
+        filename: (filepath, type_)
+        for filename, filepath in candidates.items()
+        for pattern, type_ in self.friend_patterns.items()
+        if fnmatch.fnmatch(filename, pattern)}
+    for filename, (filepath, type_) in friends.items():
+        self.friends[filename] = files.File.from_file(filepath, type_)
+
+
+def open_all(cls, filepaths) -> float:
+    start = time.perf_counter()
+    for filepath in filepaths:
+        cls.from_file(filepath)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    num_dir_vpks = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    DirVpk.archives_per_vpk = int(sys.argv[2]) if len(sys.argv) > 2 else 9
+    with tempfile.TemporaryDirectory() as folder:
+        filepaths = list()
+        for i in range(num_dir_vpks):
+            filepaths.append(os.path.join(folder, f"pak_{i:03d}_dir.vpk"))
+            for filename in (f"pak_{i:03d}_dir.vpk", *(f"pak_{i:03d}_{j:03d}.vpk" for j in range(DirVpk.archives_per_vpk))):
+                open(os.path.join(folder, filename), "wb").close()
+        num_files = len(os.listdir(folder))
+        results = dict()
+        for cls in (DirVpk, GlobVpk):
+            cls.make_friends = make_friends
+            results[f"{cls.__name__} listdir & fnmatch"] = open_all(cls, filepaths)
+            del cls.make_friends  # back to files.FriendlyFile.make_friends
+            files.listing_cache.invalidate()
+            results[f"{cls.__name__} listing_cache"] = open_all(cls, filepaths)
+        print(files.listing_cache.metrics())
+    print(f"{num_dir_vpks} *_dir.vpk in a folder of {num_files} files")
+    for method, duration in results.items():
+        baseline = results[f"{method.split()[0]} listdir & fnmatch"]
+        print(f"{method:<28} {duration:>8.3f}s ({baseline / duration:.1f}x)")
@@ -0,0 +1,47 @@
+"""peak memory saving a large pkware.Zip, writing .as_bytes() vs. streaming .as_chunks()"""
+# usage: python -m benchmarks.files_save_as [size_mb]
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+from breki.archives import pkware
+
+
+def save_as_bytes(zip_file: pkware.Zip, filepath: str):
+    """files.ParsedFile.save_as & pkware.Zip.as_bytes (as they were before .as_chunks)"""
+    zip_file.stream.seek(0)
+    with open(filepath, "wb") as out_file:
+        out_file.write(zip_file.stream.read())
+
+
+def peak_memory(save, zip_path: str, out_path: str) -> (float, float):
+    """(peak MB, seconds)"""
+    zip_file = pkware.Zip.from_file(zip_path)
+    zip_file.namelist()  # parse
+    tracemalloc.start()
+    start = time.perf_counter()
+    save(zip_file, out_path)
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, duration
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    with tempfile.TemporaryDirectory() as folder:
+        zip_path = os.path.join(folder, "big.zip")
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            for i in range(size_mb):
+                zip_file.writestr(f"chunk_{i:04d}.bin", os.urandom(2 ** 20))
+        out_path = os.path.join(folder, "copy.zip")
+        results = {
+            "as_bytes()": peak_memory(save_as_bytes, zip_path, out_path),
+            "save_as (as_chunks)": peak_memory(pkware.Zip.save_as, zip_path, out_path)}
+        with open(zip_path, "rb") as original, open(out_path, "rb") as copy:
+            assert original.read() == copy.read()
+    for method, (peak, duration) in results.items():
+        print(f"{method:<20} {peak:>8,.1f}MB peak {duration:>6.2f}s")
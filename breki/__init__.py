@@ -1,9 +1,12 @@
 __all__ = [
     "archives", "binary", "core", "files", "libraries", "parse",
     "Archive", "DiscImage", "Track", "TrackMode",
-    "find_all", "read_str", "read_struct", "write_struct", "xxd",
+    "find_all", "read_str", "read_strs", "read_struct", "read_structs",
+    "scan", "scan_file", "split_strings", "write_struct", "xxd",
+    "StructReader",
     "BitField", "Struct", "MappedArray",
-    "CodePage", "DataType", "File", "FriendlyFile",
+    "CodePage", "DataType", "File", "FormatRegistry", "FriendlyFile", "HandlePool", "IndexCache", "ListingCache",
+    "PooledStream", "SubStream",
     "ByteStream", "DataStream", "TextStream",
     "ParsedFile",
     "BinaryFile", "FriendlyBinaryFile",
@@ -24,11 +27,14 @@ from . import parse
 from .archives import (
     Archive, DiscImage, Track, TrackMode)
 from .binary import (
-    find_all, read_str, read_struct, write_struct, xxd)
+    find_all, read_str, read_strs, read_struct, read_structs,
+    scan, scan_file, split_strings, write_struct, xxd,
+    StructReader)
 from .core import (
     BitField, Struct, MappedArray)
 from .files import (
-    CodePage, DataType, File, FriendlyFile,
+    CodePage, DataType, File, FormatRegistry, FriendlyFile, HandlePool, IndexCache, ListingCache, PooledStream,
+    SubStream,
     ByteStream, DataStream, TextStream,  # type hints
     ParsedFile,  # base class
     BinaryFile, FriendlyBinaryFile,
@@ -2,16 +2,18 @@
 __all__ = [
     "alcohol", "base", "bluepoint", "cdrom", "gearbox", "golden_hawk",
     "id_software", "infinity_ward", "ion_storm", "mame", "nexon", "nintendo",
-    "padus", "pi_studios", "pkware", "respawn", "ritual", "runecraft",
+    "padus", "pi_studios", "pkware", "query", "respawn", "ritual", "runecraft",
     "sega", "troika", "utoplanet", "valve",
-    "search_folder", "extract_folder",
+    "detect", "search_folder", "extract_folder",
     "Archive", "DiscImage", "Track", "TrackMode"]
 
 import fnmatch
 import os
 from typing import Dict, List
 
+from .. import files
 from . import base
+from . import query
 
 from . import alcohol  # Mds
 from . import bluepoint  # Bpk
@@ -66,6 +68,39 @@ with_extension = {
     "*.zip": pkware.Zip}
 # NOTE: nexon.PakFile only exists as the PAKFILE lump of NexonBsp
 
+formats = files.FormatRegistry({
+    "*.007": [gearbox.Nightfire007],
+    "*.apk": [utoplanet.Apk],
+    "*.bin": [sega.VMU, cdrom.Iso],
+    "*.bpk": [bluepoint.Bpk, pi_studios.Bpk],
+    "*.cdi": [sega.GDRom, padus.Cdi],
+    "*.chd": [sega.GDRom, mame.Chd],
+    "*.cue": [sega.GDRom, golden_hawk.Cue],
+    "*.dat": [ion_storm.Dat],
+    "*.ff": [infinity_ward.FastFile],
+    "*.gdi": [sega.GDRom, sega.Gdi],
+    "*.hfs": [nexon.Hfs],
+    "*.iso": [cdrom.Iso, sega.GDRom],
+    "*.iwd": [infinity_ward.Iwd],
+    "*.mds": [sega.GDRom, alcohol.Mds],
+    "*.pak": [id_software.Pak, ion_storm.Pak, runecraft.Pak],
+    "*.pk3": [id_software.Pk3],
+    "*.nds": [nintendo.Nds],
+    "*.pkg": [nexon.Pkg],
+    "*.rpak": [respawn.rpak.RPak],
+    "*.sin": [ritual.Sin],
+    "*.vpk": [valve.Vpk, respawn.Vpk, troika.Vpk],
+    "*.zip": [pkware.Zip, nexon.PakFile]})
+# NOTE: classes w/o .probes (e.g. sega.GDRom) rank below classes whose probes pass
+
+
+def detect(filepath: str, archive=None) -> base.Archive:
+    """sniff the head & tail of filepath to pick from ambiguous extensions"""
+    archive_class = formats.detect(filepath, archive)
+    if archive_class is None:
+        raise RuntimeError(f"couldn't identify {filepath!r}")
+    return archive_class
+
 
 # batch operations
 Findings = Dict[str, List[str]]
@@ -69,6 +69,7 @@ class MdsTrack(core.Struct):
 class Mds(base.DiscImage, files.BinaryFile):
     """Media Descriptor Sidecar"""
     exts = ["*.mds"]
+    probes = [(0, b"MEDIA DESCRIPTOR")]
     # NOTE: needs linked .mdf (Media Descriptor File) data files
     header: MdsHeader
     session_header: MdsSessionHeader  # 1x, not per-session?
@@ -96,8 +97,8 @@ class Mds(base.DiscImage, files.BinaryFile):
         assert self.session_header.tracks_offset > self.size
         # self.stream.seek(self.session_header.tracks_offset, 1)
         self.mds_tracks = {
-            MdsTrack.from_stream(self.stream): list()
-            for i in range(self.session_header.num_tracks)}
+            track: list()
+            for track in MdsTrack.from_stream_many(self.stream, self.session_header.num_tracks)}
         # NOTE: skipping a few thousand bytes of mystery data (mostly empty)
         # get external track files
         for track in self.mds_tracks:
@@ -1,11 +1,18 @@
 from __future__ import annotations
+import collections.abc
 import enum
-import fnmatch
 import os
-from typing import List, Tuple
+import time
+from concurrent import futures
+from typing import Callable, Dict, Generator, Iterable, List, Tuple, Union
 
+from .. import core
 from .. import files
 from ..files.parsed import parse_first
+from . import query
+
+
+copy_threshold = 2 ** 20  # stored files this big are extracted w/ files.copy_range, instead of .read()
 
 
 def path_tuple(path: str) -> Tuple[str]:
@@ -16,11 +23,98 @@ def path_tuple(path: str) -> Tuple[str]:
         return out
 
 
+def tree_path(path: str) -> str:
+    """Archive.file_tree key; "./folder\\file.ext" -> "folder/file.ext", root folders ("." etc.) -> ''"""
+    path = "/".join(path_tuple(path))
+    return "" if path == "." else path
+
+
+class Namelist(collections.abc.Sequence):
+    """immutable snapshot of Archive.namelist(), w/ O(1) `in` & .index"""
+    names: Tuple[str]
+    indices: Dict[str, int]
+    # ^ {filename: index}
+
+    def __init__(self, names: Iterable[str] = tuple()):
+        self.names = tuple(names)
+        self.indices = {name: i for i, name in enumerate(self.names)}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.indices
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Namelist):
+            return self.names == other.names
+        return isinstance(other, collections.abc.Sequence) and self.names == tuple(other)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, Tuple[str]]:
+        return self.names[index]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {len(self.names)} files @ 0x{id(self):016X}>"
+
+    def index(self, name: str) -> int:
+        try:
+            return self.indices[name]
+        except KeyError:
+            raise ValueError(f"{name!r} is not in namelist")
+
+
+class EntryInfo:
+    """metadata for a file in an Archive, read w/o touching its data"""
+    filename: str
+    size: int  # as returned by Archive.read
+    offset: int  # into the stream holding the stored data; None if it isn't contiguous
+    # NOTE: offset can be given as a function, called on first access (e.g. if finding it needs a read)
+    stored_size: int  # size before decompression
+    compression: str  # None if stored
+    checksum: int  # CRC32 of the data; None if unknown
+    # properties
+    is_compressed: bool = property(lambda s: s.compression is not None)
+
+    __slots__ = ["filename", "size", "_offset", "stored_size", "compression", "checksum"]
+
+    def __init__(self, filename, size, offset=None, stored_size=None, compression=None, checksum=None):
+        self.filename = filename
+        self.size = size
+        self.offset = offset
+        self.stored_size = size if stored_size is None else stored_size
+        self.compression = compression
+        self.checksum = checksum
+
+    @property
+    def offset(self) -> int:
+        if callable(self._offset):
+            self._offset = self._offset()
+        return self._offset
+
+    @offset.setter
+    def offset(self, offset: Union[int, Callable[[], int], None]):
+        self._offset = offset
+
+    def __repr__(self) -> str:
+        descriptor = f'"{self.filename}" {self.size} bytes'
+        if self.is_compressed:
+            descriptor += f" ({self.compression} {self.stored_size} bytes)"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+
 class Archive(files.ParsedFile):
     archive: Archive
+    file_tree: core.PathTable  # locked_cached_property
+    # ^ {tree_path(filename): filename}
+    names: Namelist  # locked_cached_property
+    # ^ snapshot of .namelist()
+    search_index: query.SearchIndex  # locked_cached_property
 
     def __repr__(self) -> str:
-        descriptor = f"{len(self.namelist())} files"
+        descriptor = f"{len(self.names)} files"
         if self.archive is not None:
             archive_repr = " ".join([
                 self.archive.__class__.__name__,
@@ -28,60 +122,91 @@ class Archive(files.ParsedFile):
             descriptor += f" in {archive_repr}"
         return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
 
+    def entry_range(self, filename: str) -> Union[Tuple[files.ByteStream, int, int], None]:
+        """(stream, offset, length) of a stored file; None if .read() has to decode"""
+        # NOTE: File.from_archive wraps the range in a files.SubStream, instead of copying
+        return None
+
     def extract(self, filename, to_path=None):
-        if filename not in self.namelist():
+        if filename not in self.names:
             raise FileNotFoundError(f"Couldn't find {filename!r} to extract")
         to_path = "./" if to_path is None else to_path
         out_filename = os.path.join(to_path, filename)
         os.makedirs(os.path.dirname(out_filename), exist_ok=True)
-        with open(out_filename, "wb") as out_file:
-            out_file.write(self.read(filename))
-
-    def extract_all(self, to_path=None):
-        for filename in self.namelist():
-            self.extract(filename, to_path)
+        self._extract_to(filename, out_filename)
 
-    def extract_all_matching(self, pattern: str, to_path=None, case_sensitive=False):
-        for filepath in self.search(pattern, case_sensitive):
-            self.extract(filepath, to_path)
+    def _extract_to(self, filename: str, out_filename: str) -> int:
+        """returns the number of bytes written"""
+        entry_range = self.entry_range(filename)
+        with open(out_filename, "wb") as out_file:
+            if entry_range is not None and entry_range[2] >= copy_threshold:
+                return files.copy_range(*entry_range, out_file)
+            data = self.read(filename)
+            out_file.write(data)
+            return len(data)
+
+    def _extract_many(self, filenames: Iterable[str], to_path=None, workers: int = 1) -> Dict[str, float]:
+        start = time.perf_counter()
+        to_path = "./" if to_path is None else to_path
+        plan = {filename: os.path.join(to_path, filename) for filename in filenames}
+        # ^ {filename: out_filename}
+        root = os.path.abspath(to_path)
+        for filename, out_filename in plan.items():
+            if os.path.commonpath([root, os.path.abspath(out_filename)]) != root:
+                raise ValueError(f"{filename!r} would be extracted outside of {to_path!r}")
+        folders = {os.path.dirname(out_filename) for out_filename in plan.values()}
+        for folder in sorted(folders):  # each folder once, instead of once per file
+            os.makedirs(folder, exist_ok=True)
+        filenames = [filename for filename in self.physical_order(plan) if not filename.endswith("/")]
+        # ^ folder entries (.zip) only need os.makedirs
+        if workers <= 1:
+            sizes = [self._extract_to(filename, plan[filename]) for filename in filenames]
+        else:  # zlib, lzma & file I/O release the GIL
+            with futures.ThreadPoolExecutor(workers) as pool:
+                sizes = list(pool.map(lambda filename: self._extract_to(filename, plan[filename]), filenames))
+        duration = max(time.perf_counter() - start, 1e-9)
+        return {
+            "files": len(filenames), "bytes": sum(sizes), "seconds": duration,
+            "mb_per_second": sum(sizes) / 2 ** 20 / duration, "files_per_second": len(filenames) / duration}
+
+    def extract_all(self, to_path=None, workers: int = 1) -> Dict[str, float]:
+        """extract every file, in the order it's stored; returns throughput metrics"""
+        return self._extract_many(self.names, to_path, workers)
+
+    def extract_all_matching(self, pattern: str, to_path=None, case_sensitive=False, workers: int = 1) -> Dict[str, float]:
+        return self._extract_many(self.search(pattern, case_sensitive), to_path, workers)
+
+    def getinfo(self, filename: str) -> EntryInfo:
+        """metadata for a file, w/o reading (or decompressing) its data"""
+        # NOTE: defaults to .entry_range, ArchiveClasses w/ compression should override
+        entry_range = self.entry_range(filename)
+        if entry_range is None:
+            raise NotImplementedError("ArchiveClass has not defined .getinfo()")
+        stream, offset, length = entry_range
+        return EntryInfo(filename, length, offset)
+
+    def infolist(self) -> List[EntryInfo]:
+        return [self.getinfo(filename) for filename in self.names]
+
+    def invalidate(self):
+        """forget indices built from .namelist(); call after adding or removing files"""
+        # NOTE: edit methods (e.g. pkware.Zip.writestr) call this for you
+        # -- editing an ArchiveClass's entries directly (e.g. .entries or .local_files) doesn't
+        with self.lock:
+            for attr in ("file_tree", "names", "search_index"):
+                self.__dict__.pop(attr, None)
 
     def is_dir(self, filepath: str) -> bool:
-        # NOTE: all_dirs could be a cached property
-        all_dirs = {
-            path_tuple(fn)[:-1]
-            for fn in self.namelist()}
-        all_dirs.update({
-            tuple_[:i]
-            for tuple_ in all_dirs
-            for i in range(1, len(tuple_))})
-        all_dirs.update({
-            path_tuple(root)
-            for root in (".", "./", "/")})
-        return path_tuple(filepath) in all_dirs
+        return self.file_tree.is_dir(tree_path(filepath))
 
     def is_file(self, filepath: str) -> bool:
-        return filepath in self.namelist()
+        return tree_path(filepath) in self.file_tree
 
     def listdir(self, folder: str) -> List[str]:
-        if not self.is_dir(folder):
+        folder = tree_path(folder)
+        if not self.file_tree.is_dir(folder):
             raise FileNotFoundError(f"no such directory: {folder}")
-        folder_tuple = path_tuple(folder)
-        if folder_tuple in {path_tuple(root) for root in (".", "./", "/")}:
-            folder_tuple = tuple()  # empty
-        folder_contents = set()
-        for fn in self.namelist():
-            path = path_tuple(fn)
-            if path[:-1] == folder_tuple:
-                base = path[-1]
-                if self.is_dir(fn):
-                    base += "/"
-                folder_contents.add(base)  # file
-            elif self.is_dir(fn):
-                continue
-            elif path[:len(folder_tuple)] == folder_tuple:  # descendant
-                subfolder = path[len(folder_tuple):][0] + "/"
-                folder_contents.add(subfolder)
-        return sorted(folder_contents)
+        return self.file_tree.listdir(folder)
 
     @parse_first
     def namelist(self) -> List[str]:
@@ -91,33 +216,136 @@ class Archive(files.ParsedFile):
     def path_exists(self, filename: str) -> bool:
         return self.is_file(filename) or self.is_dir(filename)
 
+    def _get_file_tree(self) -> core.PathTable:
+        """built once, w/ each folder's files & subfolders"""
+        out = core.PathTable()
+        for filename in self.names:
+            path = tree_path(filename)
+            if filename.endswith("/"):  # folder entry (e.g. in a .zip)
+                out.add_folder(path)
+            else:
+                out[path] = filename
+        return out
+
+    file_tree = files.base.locked_cached_property(_get_file_tree)
+
+    def _get_names(self) -> Namelist:
+        return Namelist(self.namelist())
+
+    names = files.base.locked_cached_property(_get_names)
+
+    def _get_search_index(self) -> query.SearchIndex:
+        return query.SearchIndex(self.names)
+
+    search_index = files.base.locked_cached_property(_get_search_index)
+
+    def _physical_ranges(self, filenames: Iterable[str]) -> List[Tuple[str, Union[Tuple[files.ByteStream, int, int], None]]]:
+        """[(filename, .entry_range(filename))] in .physical_order"""
+        streams = dict()
+        # ^ {id(stream): group}
+        located = list()
+        # ^ [(location, filename, entry_range)]
+        for i, filename in enumerate(filenames):
+            entry_range = self.entry_range(filename)
+            if entry_range is not None:
+                location = (0, streams.setdefault(id(entry_range[0]), len(streams)), entry_range[1], i)
+            else:
+                try:
+                    offset = self.getinfo(filename).offset
+                except NotImplementedError:
+                    offset = None
+                location = (2, 0, 0, i) if offset is None else (1, 0, offset, i)
+            located.append((location, filename, entry_range))
+        located.sort(key=lambda x: x[0])
+        return [(filename, entry_range) for location, filename, entry_range in located]
+
+    def physical_order(self, filenames: Iterable[str]) -> List[str]:
+        """filenames sorted by where their data is stored, so reading them in order seeks forwards"""
+        # NOTE: grouped by .entry_range stream, in order of first appearance
+        # -- then .getinfo offsets (compressed files), then files w/o a known location, in the given order
+        return [filename for filename, entry_range in self._physical_ranges(filenames)]
+
     def read(self, filename: str) -> bytes:
         """read the contents of a file inside archive"""
         raise NotImplementedError("ArchiveClass has not defined .read()")
 
-    def search(self, pattern: str, case_sensitive: bool = False) -> List[str]:
-        # NOTE: fnmatch.fnmatch uses os.path.normcase
-        # -- this means globs use the same case-sensitive rules as the OS
-        # TODO: match_case: bool = False
-        # -- default to case insensitive matches
-        if case_sensitive:
-            return [
-                filepath
-                for filepath in self.namelist()
-                if fnmatch.fnmatchcase(filepath, pattern)]
-        else:
-            return fnmatch.filter(self.namelist(), pattern)
+    def read_many(self, filenames: Iterable[str], max_gap: int = 2 ** 16,
+                  max_read: int = 2 ** 22) -> Generator[Tuple[str, bytes], None, None]:
+        """(filename, data) for each filename, in the order they're stored (see .physical_order)"""
+        # NOTE: neighbouring stored files in the same stream are read w/ 1 files.read_at
+        # -- up to max_gap bytes between them are read & discarded; runs stop growing past max_read bytes
+        # -- files w/o an .entry_range are read w/ .read()
+        filenames = list(filenames)
+        for filename in filenames:
+            if filename not in self.names:
+                raise FileNotFoundError(f"Couldn't find {filename!r} to read")
+        runs = list()
+        # ^ [[stream, start, end, [(filename, offset, length)]]]; stream is None for .read()
+        run = [None, 0, 0, list()]
+        for filename, entry_range in self._physical_ranges(filenames):
+            if entry_range is None:
+                run = [None, 0, 0, [(filename, 0, 0)]]
+                runs.append(run)
+                continue
+            stream, offset, length = entry_range
+            if stream is run[0] and offset <= run[2] + max_gap and offset + length - run[1] <= max_read:
+                run[3].append((filename, offset, length))
+                run[2] = max(run[2], offset + length)
+            else:
+                run = [stream, offset, offset + length, [(filename, offset, length)]]
+                runs.append(run)
+        for stream, start, end, entries in runs:
+            if stream is None:
+                filename = entries[0][0]
+                yield (filename, self.read(filename))
+                continue
+            data = files.read_at(stream, start, end - start)
+            assert len(data) == end - start, "unexpected EOF"  # same as each .read()
+            if len(entries) == 1:
+                yield (entries[0][0], data)
+                continue
+            view = memoryview(data)
+            for filename, offset, length in entries:
+                yield (filename, bytes(view[offset - start:offset - start + length]))
+
+    def search(self, pattern: Union[str, Iterable[str], query.Query] = tuple(),
+               case_sensitive: bool = False, **filters) -> List[str]:
+        """filenames matching any glob in pattern & every filter, in .namelist() order"""
+        # NOTE: filters are query.Query args: regexes, extensions, folder, min_size & max_size
+        # -- case insensitive by default, on every OS (unlike fnmatch.filter)
+        if not isinstance(pattern, query.Query):
+            globs = (pattern,) if isinstance(pattern, str) else tuple(pattern)
+            filters = {
+                key: tuple(value) if isinstance(value, (list, set)) else value
+                for key, value in filters.items()}
+            if isinstance(filters.get("regexes"), str):
+                filters["regexes"] = (filters["regexes"],)
+            if isinstance(filters.get("extensions"), str):
+                filters["extensions"] = (filters["extensions"],)
+            pattern = query.compile_query(globs, case_sensitive=case_sensitive, **filters)
+        return pattern.run(self)
 
     def sizeof(self, filename: str) -> int:
-        return len(self.read(filename))
+        try:
+            return self.getinfo(filename).size
+        except NotImplementedError:  # last resort
+            return len(self.read(filename))
 
     def tree(self, folder: str = ".", depth: int = 0):
         """namelist pretty printer"""
         for filename in self.listdir(folder):
             print(f"{'  ' * depth}{filename}")
-            full_filename = os.path.join(folder, filename)
-            if self.is_dir(full_filename):
-                self.tree(full_filename, depth + 1)
+            if filename.endswith("/"):
+                self.tree(os.path.join(folder, filename), depth + 1)
+
+    def walk(self, folder: str = ".") -> Generator[str, None, None]:
+        """every filename in folder & its subfolders, spelt as in .namelist() (e.g. w/ a leading "./")"""
+        # NOTE: not in .namelist() order; see PathTable.walk
+        folder = tree_path(folder)
+        if not self.file_tree.is_dir(folder):
+            raise FileNotFoundError(f"no such directory: {folder}")
+        for path in self.file_tree.walk(folder):
+            yield self.file_tree[path]
 
 
 class TrackMode(enum.Enum):
@@ -282,17 +510,29 @@ class DiscImage(files.FriendlyFile):
                 length = track.length - sub_lba
             else:
                 raise NotImplementedError("cannot read past end of current track")
+        data = self.sector_read_at(track.start_lba + sub_lba, length)
+        # NOTE: we're assuming that all tracks have gaps between them
+        # -- so we don't need to worry about changing tracks here
+        self._cursor = (track_index, sub_lba + length)
+        return data
+
+    @parse_first
+    def sector_read_at(self, lba: int, length: int) -> bytes:
+        """sector_read w/o moving the cursor (thread-safe)"""
+        for track in self.tracks:
+            if track.start_lba <= lba < track.start_lba + track.length:
+                break
+        else:
+            raise RuntimeError(f"couldn't find a track containing sector: {lba}")
+        sub_lba = lba - track.start_lba
         if sub_lba + length > track.length:
             raise NotImplementedError("cannot read past end of current track")
         data_slice = track.data_slice()
-        track_stream = self.friends[track.name].stream
-        track_stream.seek(sub_lba * track.sector_size)
+        # NOTE: one positional read through files.handle_pool; mapping every track's .buffer would hold an fd each
+        raw_sectors = memoryview(self.friends[track.name].read_at(sub_lba * track.sector_size, length * track.sector_size))
         sector_data = [
-            track_stream.read(track.sector_size)[data_slice]
-            for i in range(length)]
-        # NOTE: we're assuming that all tracks have gaps between them
-        # -- so we don't need to worry about changing tracks here
-        self._cursor = (track_index, sub_lba + length)
+            raw_sectors[offset:offset + track.sector_size][data_slice]
+            for offset in range(0, len(raw_sectors), track.sector_size)]
         return b"".join(sector_data)
 
     @parse_first
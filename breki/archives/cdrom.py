@@ -6,9 +6,10 @@ import datetime
 import enum
 import io
 import os
-from typing import List
+from typing import List, Tuple, Union
 
 from .. import binary
+from .. import core
 from .. import files
 from ..files.parsed import parse_first
 from . import base
@@ -20,8 +21,11 @@ from . import base
 
 def read_both_endian(stream: io.BytesIO, format_: str, must_match=True) -> int:
     """process one field at a time, don't try for multiple!"""
-    little_endian = binary.read_struct(stream, f"<{format_}")
-    big_endian = binary.read_struct(stream, f">{format_}")
+    size = binary.compiled_struct(format_).size
+    raw = stream.read(size * 2)
+    assert len(raw) == size * 2, "unexpected EOF"
+    little_endian = int.from_bytes(raw[:size], "little", signed=format_.islower())
+    big_endian = int.from_bytes(raw[size:], "big", signed=format_.islower())
     if must_match:
         assert little_endian == big_endian, f"{little_endian} != {big_endian}"
     return little_endian
@@ -40,7 +44,8 @@ strA = {
 
 def read_strA(stream: io.BytesIO, length: int) -> str:
     """ASCII A-Z 0-9 & underscore"""
-    raw_str = binary.read_struct(stream, f"{length}s")
+    raw_str = stream.read(length)
+    assert len(raw_str) == length, "unexpected EOF"
     out = raw_str.decode().rstrip(" ")
     assert len(set(out).difference(strA)) == 0, f"{out!r} is not a valid strA"
     return out
@@ -48,7 +53,8 @@ def read_strA(stream: io.BytesIO, length: int) -> str:
 
 def read_strD(stream: io.BytesIO, length: int) -> str:
     """ASCII A-Z 0-9 & common symbols"""
-    raw_str = binary.read_struct(stream, f"{length}s")
+    raw_str = stream.read(length)
+    assert len(raw_str) == length, "unexpected EOF"
     out = raw_str.decode().rstrip(" ")
     assert len(set(out).difference(strD)) == 0, f"{out!r} is not a valid strD"
     return out
@@ -106,25 +112,24 @@ class TimeStamp:
     @classmethod
     def from_stream_ascii(cls, stream: io.BytesIO) -> TimeStamp:
         """mostly ASCII for PVD (17 bytes)"""
-        year = int(read_strD(stream, 4))
-        month = int(read_strD(stream, 2))
-        day = int(read_strD(stream, 2))
-        hour = int(read_strD(stream, 2))
-        minute = int(read_strD(stream, 2))
-        second = int(read_strD(stream, 2))
-        centisecond = int(read_strD(stream, 2))
-        timezone = binary.read_struct(stream, "B")
-        if {year, month, day, hour, minute, second, centisecond, timezone} == {0}:
-            return None  # valid data, but not a timestamp
-        return cls(year, month, day, hour, minute, second, centisecond, timezone)
+        with binary.StructReader.of(stream) as reader:
+            year = int(read_strD(reader, 4))
+            month = int(read_strD(reader, 2))
+            day = int(read_strD(reader, 2))
+            hour = int(read_strD(reader, 2))
+            minute = int(read_strD(reader, 2))
+            second = int(read_strD(reader, 2))
+            centisecond = int(read_strD(reader, 2))
+            timezone = reader.read_struct("B")
+            if {year, month, day, hour, minute, second, centisecond, timezone} == {0}:
+                return None  # valid data, but not a timestamp
+            return cls(year, month, day, hour, minute, second, centisecond, timezone)
 
     @classmethod
     def from_stream_bytes(cls, stream: io.BytesIO) -> TimeStamp:
         """compressed form for Directories & Path Table (7 bytes)"""
-        year, month, day = binary.read_struct(stream, "3B")
-        hour, minute, second = binary.read_struct(stream, "3B")
+        year, month, day, hour, minute, second, timezone = binary.read_struct(stream, "7B")
         centisecond = 0
-        timezone = binary.read_struct(stream, "B")
         if {year, month, day, hour, minute, second, centisecond, timezone} == {0}:
             return None  # valid data, but not a timestamp
         return cls(year, month, day, hour, minute, second, centisecond, timezone)
@@ -159,64 +164,64 @@ class Directory:
 
     @classmethod
     def from_stream(cls, stream: io.BytesIO) -> Directory:
-        out = cls()
-        out.length, out.ear_length = binary.read_struct(stream, "2B")
-        # NOTE: ear is short for "Extended Attribute Record"
-        if out.length == 0:
-            return None  # end of directories for this sector
-        out.le_data_lba = binary.read_struct(stream, "<I")
-        out.be_data_lba = binary.read_struct(stream, ">I")
-        out.le_data_size = binary.read_struct(stream, "<I")
-        out.be_data_size = binary.read_struct(stream, ">I")
-        if out.le_data_lba == out.be_data_lba:
-            out.data_lba = out.le_data_lba
-            out.data_size = out.le_data_size
-        else:
-            out.data_lba = out.be_data_lba
-            out.data_size = out.be_data_size
-        out.timestamp = TimeStamp.from_stream_bytes(stream)
-        out.flags = FileFlag(binary.read_struct(stream, "B"))
-        out.interleaved_unit_size = binary.read_struct(stream, "B")
-        out.interleaved_gap_size = binary.read_struct(stream, "B")
-        out.volume_sequence_index = read_both_endian(stream, "H")
-        # name & file / directory identification
-        filename_length = binary.read_struct(stream, "B")
-        filename = binary.read_struct(stream, f"{filename_length}s")
-        if filename_length == 1:  # special directory
-            out.is_file = False
-            if filename == b"\x00":  # PVD.root_directory / 1st in sequence
-                out.name = "."  # local root
-            elif filename == b"\x01":  # 2nd in sequence
-                out.name = ".."  # parent
-            elif filename.isascii():  # 1 char named directory
+        with binary.StructReader.of(stream) as reader:
+            out = cls()
+            out.length, out.ear_length = reader.read_struct("2B")
+            # NOTE: ear is short for "Extended Attribute Record"
+            if out.length == 0:
+                return None  # end of directories for this sector
+            out.le_data_lba = reader.read_struct("<I")
+            out.be_data_lba = reader.read_struct(">I")
+            out.le_data_size = reader.read_struct("<I")
+            out.be_data_size = reader.read_struct(">I")
+            if out.le_data_lba == out.be_data_lba:
+                out.data_lba = out.le_data_lba
+                out.data_size = out.le_data_size
+            else:
+                out.data_lba = out.be_data_lba
+                out.data_size = out.be_data_size
+            out.timestamp = TimeStamp.from_stream_bytes(reader)
+            flags, out.interleaved_unit_size, out.interleaved_gap_size = reader.read_struct("3B")
+            out.flags = FileFlag(flags)
+            out.volume_sequence_index = read_both_endian(reader, "H")
+            # name & file / directory identification
+            filename_length = reader.read_struct("B")
+            filename = reader.read_struct(f"{filename_length}s")
+            if filename_length == 1:  # special directory
                 out.is_file = False
+                if filename == b"\x00":  # PVD.root_directory / 1st in sequence
+                    out.name = "."  # local root
+                elif filename == b"\x01":  # 2nd in sequence
+                    out.name = ".."  # parent
+                elif filename.isascii():  # 1 char named directory
+                    out.is_file = False
+                    out.name = filename.decode()
+                else:
+                    raise RuntimeError(f"Unexpected File ID: {filename!r}")
+            elif filename.endswith(b";1"):  # named file
+                out.is_file = True
+                out.name = filename.decode()[:-2]
+                # verify name is valid strD ("." is also allowed)
+                # assert len(set(out.name).difference(strD)) == 0, "invalid strD"
+                if len(set(out.name).difference(strD)) != 0:
+                    print(f"{filename=}, {out.name=}")
+                    print(f"{set(out.name).difference(strD)=}")
+                    raise AssertionError("invalid strD")
+            else:  # named directory
+                # NOTE: haven't encountered any of these yet
+                out.is_file = False  # directory
                 out.name = filename.decode()
+            # optional 1 byte pad (next Directory will start on an even address)
+            if filename_length % 2 == 0:
+                assert reader.read(1) == b"\x00"
+            expected_length = 33 + filename_length + ((filename_length + 1) % 2)
+            # TODO: got some ISO extensions, not interested in supporting those rn
+            if out.length != expected_length:
+                out.extras = reader.read(out.length - expected_length)
             else:
-                raise RuntimeError(f"Unexpected File ID: {filename!r}")
-        elif filename.endswith(b";1"):  # named file
-            out.is_file = True
-            out.name = filename.decode()[:-2]
-            # verify name is valid strD ("." is also allowed)
-            # assert len(set(out.name).difference(strD)) == 0, "invalid strD"
-            if len(set(out.name).difference(strD)) != 0:
-                print(f"{filename=}, {out.name=}")
-                print(f"{set(out.name).difference(strD)=}")
-                raise AssertionError("invalid strD")
-        else:  # named directory
-            # NOTE: haven't encountered any of these yet
-            out.is_file = False  # directory
-            out.name = filename.decode()
-        # optional 1 byte pad (next Directory will start on an even address)
-        if filename_length % 2 == 0:
-            assert stream.read(1) == b"\x00"
-        expected_length = 33 + filename_length + ((filename_length + 1) % 2)
-        # TODO: got some ISO extensions, not interested in supporting those rn
-        if out.length != expected_length:
-            out.extras = stream.read(out.length - expected_length)
-        else:
-            out.extras = None
-        assert out.ear_length == 0, "idk where EAR data is stored"
-        return out
+                out.extras = None
+            assert out.ear_length == 0, "idk where EAR data is stored"
+            return out
 
 
 class PathTableEntry:
@@ -234,28 +239,29 @@ class PathTableEntry:
 
     @classmethod
     def from_bytes(cls, raw_entry: bytes) -> PathTableEntry:
-        return cls.from_stream(io.BytesIO(raw_entry))
+        return cls.from_stream(binary.StructReader(raw_entry))
 
     @classmethod
     def from_stream(cls, stream: io.BytesIO) -> PathTableEntry:
-        # NOTE: little-endian only
-        out = cls()
-        out.length, out.ear_length = binary.read_struct(stream, "2B")
-        # NOTE: ear is short for "Extended Attribute Record"
-        out.extent_lba = binary.read_struct(stream, "I")
-        out.parent_index = binary.read_struct(stream, "H")
-        name = binary.read_struct(stream, f"{out.length}s")
-        if name != b"\x00":  # verify strD
-            name = name.decode()
-            assert len(set(name).difference(strD)) == 0, "invalid strD"
-            out.name = name
-        else:
-            out.name = None
-        # optional 1 byte pad (next entry will start on an even address)
-        if out.length % 2 != 0:
-            assert stream.read(1) == b"\x00"
-        assert out.ear_length == 0, "idk where EAR data is stored"
-        return out
+        with binary.StructReader.of(stream) as reader:
+            # NOTE: little-endian only
+            out = cls()
+            out.length, out.ear_length = reader.read_struct("2B")
+            # NOTE: ear is short for "Extended Attribute Record"
+            out.extent_lba = reader.read_struct("I")
+            out.parent_index = reader.read_struct("H")
+            name = reader.read_struct(f"{out.length}s")
+            if name != b"\x00":  # verify strD
+                name = name.decode()
+                assert len(set(name).difference(strD)) == 0, "invalid strD"
+                out.name = name
+            else:
+                out.name = None
+            # optional 1 byte pad (next entry will start on an even address)
+            if out.length % 2 != 0:
+                assert reader.read(1) == b"\x00"
+            assert out.ear_length == 0, "idk where EAR data is stored"
+            return out
 
 
 class PrimaryVolumeDescriptor:
@@ -299,57 +305,59 @@ class PrimaryVolumeDescriptor:
 
     @classmethod
     def from_bytes(cls, raw_pvd: bytes) -> PrimaryVolumeDescriptor:
-        return cls.from_stream(io.BytesIO(raw_pvd))
+        return cls.from_stream(binary.StructReader(raw_pvd))
 
     @classmethod
     def from_stream(cls, stream: io.BytesIO) -> PrimaryVolumeDescriptor:
-        out = cls()
-        type_code = binary.read_struct(stream, "B")
-        # 0x01: Primary, 0x02: Supplementary, 0x03: Partition
-        magic = binary.read_struct(stream, "5s")
-        assert (type_code, magic) == (0x01, b"CD001"), "not a PVD: 0x{type_code:02X} {magic}"
-        version = binary.read_struct(stream, "H")  # technically uint8 + 1 char pad
-        assert version == 0x0001
-        out.system = read_strA(stream, 32)
-        out.name = read_strD(stream, 32)
-        assert stream.read(8) == b"\x00" * 8
-        out.size_in_blocks = read_both_endian(stream, "I")
-        assert stream.read(32) == b"\x00" * 32
-        out.num_discs = read_both_endian(stream, "H")
-        out.disc = read_both_endian(stream, "H")
-        out.block_size = read_both_endian(stream, "H")
-        out.path_table_size = read_both_endian(stream, "I")  # in bytes
-        out.path_table_le_lba = binary.read_struct(stream, "<I")
-        out.opt_path_table_le_lba = binary.read_struct(stream, "<I")
-        out.path_table_be_lba = binary.read_struct(stream, ">I")
-        out.opt_path_table_be_lba = binary.read_struct(stream, ">I")
-        out.root_dir = Directory.from_stream(stream)
-        assert out.root_dir.length == 34
-        assert out.root_dir.name == "."
-        out.set_name = read_strD(stream, 128)
-        out.publisher = read_strA(stream, 128)
-        out.data_preparer = read_strA(stream, 128)
-        out.application = read_strA(stream, 128)
-        # filenames in root dir
-        out.copyright_file = read_strD(stream, 37)
-        out.abstract_file = read_strD(stream, 37)
-        out.bibliography_file = read_strD(stream, 37)
-        # timestamps
-        out.volume_created = TimeStamp.from_stream_ascii(stream)
-        out.volume_modified = TimeStamp.from_stream_ascii(stream)
-        out.volume_expires = TimeStamp.from_stream_ascii(stream)  # when obsolete (can be zeroed?)
-        out.volume_effective = TimeStamp.from_stream_ascii(stream)  # release date (can be zeroed?)
-        file_structure_version = binary.read_struct(stream, "H")  # techically uint8_t + 1 char pad
-        assert file_structure_version == 0x0001
-        out.application_bytes = stream.read(512)  # empty ASCII whitespace
-        reserved = stream.read(653)  # ISO reserved bytes (typically all NULL)
-        assert reserved == b"\x00" * 653, "unexpected data in RESERVED section"
-        # NOTE: caller must check for terminator (b"\xFFCD001") / other Volume Descriptors
-        return out
+        with binary.StructReader.of(stream) as reader:
+            out = cls()
+            type_code = reader.read_struct("B")
+            # 0x01: Primary, 0x02: Supplementary, 0x03: Partition
+            magic = reader.read_struct("5s")
+            assert (type_code, magic) == (0x01, b"CD001"), "not a PVD: 0x{type_code:02X} {magic}"
+            version = reader.read_struct("H")  # technically uint8 + 1 char pad
+            assert version == 0x0001
+            out.system = read_strA(reader, 32)
+            out.name = read_strD(reader, 32)
+            assert reader.read(8) == b"\x00" * 8
+            out.size_in_blocks = read_both_endian(reader, "I")
+            assert reader.read(32) == b"\x00" * 32
+            out.num_discs = read_both_endian(reader, "H")
+            out.disc = read_both_endian(reader, "H")
+            out.block_size = read_both_endian(reader, "H")
+            out.path_table_size = read_both_endian(reader, "I")  # in bytes
+            out.path_table_le_lba = reader.read_struct("<I")
+            out.opt_path_table_le_lba = reader.read_struct("<I")
+            out.path_table_be_lba = reader.read_struct(">I")
+            out.opt_path_table_be_lba = reader.read_struct(">I")
+            out.root_dir = Directory.from_stream(reader)
+            assert out.root_dir.length == 34
+            assert out.root_dir.name == "."
+            out.set_name = read_strD(reader, 128)
+            out.publisher = read_strA(reader, 128)
+            out.data_preparer = read_strA(reader, 128)
+            out.application = read_strA(reader, 128)
+            # filenames in root dir
+            out.copyright_file = read_strD(reader, 37)
+            out.abstract_file = read_strD(reader, 37)
+            out.bibliography_file = read_strD(reader, 37)
+            # timestamps
+            out.volume_created = TimeStamp.from_stream_ascii(reader)
+            out.volume_modified = TimeStamp.from_stream_ascii(reader)
+            out.volume_expires = TimeStamp.from_stream_ascii(reader)  # when obsolete (can be zeroed?)
+            out.volume_effective = TimeStamp.from_stream_ascii(reader)  # release date (can be zeroed?)
+            file_structure_version = reader.read_struct("H")  # techically uint8_t + 1 char pad
+            assert file_structure_version == 0x0001
+            out.application_bytes = reader.read(512)  # empty ASCII whitespace
+            reserved = reader.read(653)  # ISO reserved bytes (typically all NULL)
+            assert reserved == b"\x00" * 653, "unexpected data in RESERVED section"
+            # NOTE: caller must check for terminator (b"\xFFCD001") / other Volume Descriptors
+            return out
 
 
 class Iso(base.Archive, files.BinaryFile):
     exts = ["*.iso", "*.bin"]
+    probes = [(16 * 2048 + 1, b"CD001")]  # PVD
     pvd_sector: int
     lba_offset: int  # added to LBA when seeking disc
     disc: base.DiscImage
@@ -366,7 +374,7 @@ class Iso(base.Archive, files.BinaryFile):
 
     @parse_first
     def __repr__(self) -> str:
-        descriptor = f"{self.pvd.name!r} {len(self.namelist())} files"
+        descriptor = f"{self.pvd.name!r} {len(self.names)} files"
         return f"<Iso {descriptor} @ 0x{id(self):016X}>"
 
     @parse_first
@@ -411,44 +419,80 @@ class Iso(base.Archive, files.BinaryFile):
 
     @parse_first
     def namelist(self) -> List[str]:
-        filenames = set()
-        for i, path in enumerate(self.path_table):
-            path_name = self.full_path(i).lstrip("/")
-            for record in self.path_records(i):
-                if record.is_file:
-                    filenames.add(path_name + record.name)
-        return sorted(filenames)
+        return sorted(self.records)
 
     @parse_first
     def path_records(self, path_index: int) -> List[Directory]:
         path = self.path_table[path_index]
-        self.sector_seek(path.extent_lba)
-        raw = self.disc.sector_read(1)
-        stream = io.BytesIO(raw)
-        directory = Directory.from_stream(stream)
+        lba = path.extent_lba + self.lba_offset
+        raw = self.disc.sector_read_at(lba, 1)
+        reader = binary.StructReader(raw)
+        directory = Directory.from_stream(reader)
         records = list()
         while directory is not None:
             records.append(directory)
-            directory = Directory.from_stream(stream)
-            if directory is None and stream.tell() > 2048 - 64:
+            directory = Directory.from_stream(reader)
+            if directory is None and reader.tell() > 2048 - 64:
                 # roll over into next sector
-                raw = self.disc.sector_read(1)
-                stream = io.BytesIO(raw)
-                directory = Directory.from_stream(stream)
+                lba += 1
+                raw = self.disc.sector_read_at(lba, 1)
+                reader = binary.StructReader(raw)
+                directory = Directory.from_stream(reader)
         return records
 
     @parse_first
-    def read(self, filepath: str) -> bytes:
+    def entry_range(self, filepath: str) -> Union[Tuple[files.ByteStream, int, int], None]:
+        record = self.file_record(filepath)
+        if record.interleaved_unit_size != 0 or record.interleaved_gap_size != 0:
+            return None  # .read() will raise
+        lba = record.data_lba + self.lba_offset
+        track = self.disc.sector_track(lba)
+        num_sectors = -(-record.data_size // 2048)
+        if track is None or track.sector_size != 2048 or lba + num_sectors > track.start_lba + track.length:
+            return None  # not contiguous
+        stream = self.disc.friends[track.name].stream
+        return (stream, (lba - track.start_lba) * 2048, record.data_size)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        record = self.file_record(filepath)
+        entry_range = self.entry_range(filepath)
+        offset = None if entry_range is None else entry_range[1]
+        return base.EntryInfo(filepath, record.data_size, offset)
+
+    @parse_first
+    def file_record(self, filepath: str) -> Directory:
         # NOTE: case sensitive
-        folder, filename = os.path.split(filepath)
-        records = {r.name: r for r in self.folder_records(folder)}
-        assert filename in records, "file not found"
-        record = records[filename]
-        assert record.is_file, "f{filename!r} is not a file"
+        filepath = "/".join(
+            part
+            for part in filepath.replace("\\", "/").split("/")
+            if part not in ("", "."))
+        assert not self.records.is_dir(filepath), f"{filepath!r} is not a file"
+        assert filepath in self.records, "file not found"
+        return self.records[filepath]
+
+    @parse_first
+    def _get_records(self) -> core.PathTable:
+        """walks every folder once"""
+        out = core.PathTable()
+        for i, path in enumerate(self.path_table):
+            folder = self.full_path(i).strip("/")
+            out.add_folder(folder)
+            for record in self.path_records(i):
+                if record.is_file:
+                    out.insert(folder, record.name, record)
+        return out
+
+    records = files.base.locked_cached_property(_get_records)
+    # ^ {"folder/filename.ext": Directory}
+
+    @parse_first
+    def read(self, filepath: str) -> bytes:
+        record = self.file_record(filepath)
         if record.interleaved_unit_size != 0 or record.interleaved_gap_size != 0:
             raise NotImplementedError("cannot read interleaved file")
-        self.sector_seek(record.data_lba)
-        data = self.disc.read(record.data_size)
+        num_sectors = -(-record.data_size // 2048)
+        data = self.disc.sector_read_at(record.data_lba + self.lba_offset, num_sectors)[:record.data_size]
         assert len(data) == record.data_size, "unexpected EOF"
         return data
 
@@ -484,11 +528,11 @@ class Iso(base.Archive, files.BinaryFile):
         # path table
         self.sector_seek(self.pvd.path_table_le_lba)
         raw_path_table = self.disc.read(self.pvd.path_table_size)
-        path_table_stream = io.BytesIO(raw_path_table)
-        while path_table_stream.tell() < self.pvd.path_table_size:
-            entry = PathTableEntry.from_stream(path_table_stream)
+        path_table_reader = binary.StructReader(raw_path_table)
+        while path_table_reader.tell() < self.pvd.path_table_size:
+            entry = PathTableEntry.from_stream(path_table_reader)
             self.path_table.append(entry)
-        assert path_table_stream.tell() == self.pvd.path_table_size
+        assert path_table_reader.tell() == self.pvd.path_table_size
         # NOTE: we're ignoring the optional path table & all the big-endian stuff
 
     @classmethod
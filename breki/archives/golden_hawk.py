@@ -6,6 +6,11 @@ from . import base
 from .. import files
 
 
+cue_keywords = {
+    b"CATALOG", b"CDTEXTFILE", b"FILE", b"FLAGS", b"INDEX",
+    b"PERFORMER", b"REM", b"SONGWRITER", b"TITLE", b"TRACK"}
+# ^ for Cue.probes
+
 track_mode = {
     "AUDIO": (base.TrackMode.AUDIO, 2352),
     "MODE1/2352": (base.TrackMode.BINARY_1, 2352),
@@ -16,6 +21,7 @@ track_mode = {
 class Cue(base.DiscImage, files.FriendlyTextFile):
     """plaintext CUE sheet"""
     exts = ["*.cue"]
+    probes = [lambda head, tail: head.lstrip(b"\xEF\xBB\xBF \t\r\n").split(b" ")[0] in cue_keywords]
 
     def parse(self):
         self.is_parsed = True
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Dict, List
+import struct
+from typing import Dict, List, Tuple
 
 from .. import core
 from .. import binary
@@ -17,9 +18,24 @@ class PakFileEntry(core.Struct):
     _format = "56s2I"
 
 
+def last_entry_probe(sizeof_entry: int, zero_padded: bool = True):
+    """Pak.probes predicate; the file table is at the end of the file"""
+    # NOTE: reading a file table w/ the wrong sizeof_entry puts offsets & lengths in the filename
+    def probe(head: bytes, tail: bytes) -> bool:
+        table_offset, table_length = struct.unpack_from("2I", head, 4)
+        if table_length < sizeof_entry or table_length % sizeof_entry != 0:
+            return False
+        filename, offset, length = struct.unpack_from("56s2I", tail, len(tail) - sizeof_entry)
+        if zero_padded and filename.partition(b"\0")[2].strip(b"\0") != b"":
+            return False
+        return filename[0] != 0 and filename.isascii() and offset + length <= table_offset
+    return probe
+
+
 class Pak(base.Archive, files.BinaryFile):
     # https://quakewiki.org/wiki/.pak
     exts = ["*.pak"]
+    probes = [(0, b"PACK"), last_entry_probe(64)]
     entries: Dict[str, PakFileEntry]
     code_page = files.CodePage("ascii", "strict")
 
@@ -36,12 +52,18 @@ class Pak(base.Archive, files.BinaryFile):
     def read(self, filepath: str) -> bytes:
         assert filepath in self.entries
         entry = self.entries[filepath]
-        self.stream.seek(entry.offset)
-        return self.stream.read(entry.length)
+        return self.read_at(entry.offset, entry.length)
 
     @parse_first
-    def sizeof(self, filepath: str) -> int:
-        return self.entries[filepath].length
+    def entry_range(self, filepath: str) -> Tuple[files.ByteStream, int, int]:
+        assert filepath in self.entries
+        entry = self.entries[filepath]
+        return (self.stream, entry.offset, entry.length)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        entry = self.entries[filepath]
+        return base.EntryInfo(filepath, entry.length, entry.offset)
 
     @parse_first
     def namelist(self) -> List[str]:
@@ -59,9 +81,7 @@ class Pak(base.Archive, files.BinaryFile):
         self.stream.seek(offset)
         self.entries = {
             self.code_page.decode(entry.filename.partition(b"\0")[0]): entry
-            for entry in [
-                PakFileEntry.from_stream(self.stream)
-                for i in range(length // sizeof_entry)]}
+            for entry in PakFileEntry.from_stream_many(self.stream, length // sizeof_entry)}
 
 
 class Pk3(pkware.Zip):
@@ -73,6 +73,7 @@ class AssetType(enum.Enum):
 class FastFile(base.Archive, files.BinaryFile):
     """specifically for IW3 (Call of Duty 4: Modern Warfare)"""
     exts = ["*.ff"]
+    probes = [(0, b"IWffu100")]
     header: Header
     header2: Header2
     pointers: List[int]  # linked to strings? almost always -1; sometimes 0
@@ -105,9 +106,7 @@ class FastFile(base.Archive, files.BinaryFile):
             self.pointers = binary.read_struct(
                 self.stream, f"{self.header2.num_pointers}i")
             num_strings = self.pointers.count(-1)
-            self.strings = [
-                binary.read_str(self.stream, *self.code_page)
-                for i in range(num_strings)]
+            self.strings = binary.read_strs(self.stream, num_strings, *self.code_page)
             assert self.strings[-1] != ""
         else:  # "*_load.ff"?
             assert self.header2.unknown == 0  # observed, but not understood
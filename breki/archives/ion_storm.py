@@ -1,7 +1,8 @@
 """based on Anachronox DAT File Extractor Version 2 by John Rittenhouse"""
 # https://archive.thedatadungeon.com/anachronox_2001/community/datextract2.zip
 from __future__ import annotations
-from typing import Dict, List
+import io
+from typing import Dict, List, Tuple, Union
 import zlib
 
 from .. import core
@@ -34,6 +35,7 @@ class DatFileInfo(core.Struct):
 class Dat(base.Archive, files.BinaryFile):
     """Used by Anachronox"""
     exts = ["*.dat"]
+    probes = [(0, b"ADAT")]
     header: DatHeader
     entries: Dict[str, DatFileInfo]
 
@@ -46,6 +48,20 @@ class Dat(base.Archive, files.BinaryFile):
         descriptor = f'"{self.filename}" {len(self.entries)} files'
         return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
 
+    @parse_first
+    def entry_range(self, filepath: str) -> Union[Tuple[files.ByteStream, int, int], None]:
+        entry = self.entries[filepath]
+        if entry.compressed_length != 0:
+            return None
+        return (self.stream, entry.offset, entry.length)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        entry = self.entries[filepath]
+        if entry.compressed_length == 0:
+            return base.EntryInfo(filepath, entry.length, entry.offset)
+        return base.EntryInfo(filepath, entry.length, entry.offset, entry.compressed_length, "zlib")
+
     @parse_first
     def namelist(self) -> List[str]:
         return sorted(self.entries.keys())
@@ -53,11 +69,10 @@ class Dat(base.Archive, files.BinaryFile):
     @parse_first
     def read(self, filepath: str) -> bytes:
         entry = self.entries[filepath]
-        self.stream.seek(entry.offset)
         if entry.compressed_length == 0:
-            data = self.stream.read(entry.length)
+            data = self.read_at(entry.offset, entry.length)
         else:
-            data = zlib.decompress(self.stream.read(entry.compressed_length))
+            data = zlib.decompress(self.read_at(entry.offset, entry.compressed_length))
             assert len(data) == entry.length
         return data
 
@@ -70,8 +85,7 @@ class Dat(base.Archive, files.BinaryFile):
         assert self.header.unknown == 9
         assert self.header.fileinfo_length % 144 == 0, "invalid fileinfo_size"
         self.stream.seek(self.header.fileinfo_offset)
-        for i in range(self.header.fileinfo_length // 144):
-            file_info = DatFileInfo.from_stream(self.stream)
+        for file_info in DatFileInfo.from_stream_many(self.stream, self.header.fileinfo_length // 144):
             filename = file_info.filename.partition(b"\0")[0].decode()
             self.entries[filename] = file_info
 
@@ -94,6 +108,7 @@ class PakFileEntry(core.Struct):
 class Pak(id_software.Pak):
     # https://github.com/yquake2/pakextract
     exts = ["*.pak"]
+    probes = [(0, b"PACK"), id_software.last_entry_probe(72, zero_padded=False)]
     code_page = files.CodePage("ascii", "strict")
     entries: Dict[str, PakFileEntry]
 
@@ -102,17 +117,17 @@ class Pak(id_software.Pak):
         """average time to decompress is ~1min per MB"""
         # https://github.com/yquake2/pakextract/blob/master/pakextract.c#L254
         out = b""
-        self.stream.seek(entry.offset)
-        while self.stream.tell() < entry.offset + entry.compressed_length:
-            x = int.from_bytes(self.stream.read(1))
+        stream = io.BytesIO(self.read_at(entry.offset, entry.compressed_length))
+        while stream.tell() < entry.compressed_length:
+            x = int.from_bytes(stream.read(1))
             if x < 64:
-                out += self.stream.read(x + 1)
+                out += stream.read(x + 1)
             elif x < 128:
                 out += b"\x00" * (x - 62)
             elif x < 192:
-                out += self.stream.read(1) * (x - 126)
+                out += stream.read(1) * (x - 126)
             elif x < 255:
-                ptr = int.from_bytes(self.stream.read(1)) + 1
+                ptr = int.from_bytes(stream.read(1)) + 1
                 out += out[-ptr].to_bytes(1) * (x - 190)
             else:  # x == 255
                 break  # terminator
@@ -121,14 +136,31 @@ class Pak(id_software.Pak):
         assert len(out) == entry.length
         return out
 
+    @parse_first
+    def entry_range(self, filepath: str) -> Union[Tuple[files.ByteStream, int, int], None]:
+        if filepath not in self.entries:
+            raise FileNotFoundError(f"{filepath!r} is not in this Pak")
+        entry = self.entries[filepath]
+        if entry.is_compressed:
+            return None
+        return (self.stream, entry.offset, entry.length)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        if filepath not in self.entries:
+            raise FileNotFoundError(f"{filepath!r} is not in this Pak")
+        entry = self.entries[filepath]
+        if not entry.is_compressed:
+            return base.EntryInfo(filepath, entry.length, entry.offset)
+        return base.EntryInfo(filepath, entry.length, entry.offset, entry.compressed_length, "rle")
+
     @parse_first
     def read(self, filepath: str) -> bytes:
         if filepath not in self.entries:
             raise FileNotFoundError(f"{filepath!r} is not in this Pak")
         entry = self.entries[filepath]
-        self.stream.seek(entry.offset)
         if not entry.is_compressed:
-            return self.stream.read(entry.length)
+            return self.read_at(entry.offset, entry.length)
         else:
             return self.decompress(entry)
 
@@ -148,6 +180,4 @@ class Pak(id_software.Pak):
         self.stream.seek(offset)
         self.entries = {
             self.code_page.decode(entry.filename.partition(b"\0")[0]): entry
-            for entry in [
-                PakFileEntry.from_stream(self.stream)
-                for i in range(length // sizeof_entry)]}
+            for entry in PakFileEntry.from_stream_many(self.stream, length // sizeof_entry)}
@@ -121,6 +121,7 @@ class CompressedMapEntryv5:
 class Chd(base.DiscImage, files.BinaryFile):
     """Compressed Hunks of Data"""
     exts = ["*.chd"]
+    probes = [(0, b"MComprHD")]
     header: ChdHeaderv5
     metadata: List[Metadata]
 
@@ -5,7 +5,7 @@ import enum
 import io
 import lzma
 import struct
-from typing import Dict, List
+from typing import Dict, Generator, List
 
 from .. import binary
 from .. import core
@@ -53,17 +53,18 @@ class PakLocalFile:
 
     @classmethod
     def from_stream(cls, stream) -> PakLocalFile:
-        out = cls()
-        # header
-        out.unused = binary.read_struct(stream, "H")
-        out.crc32, out.compressed_size, out.uncompressed_size, out.path_size = binary.read_struct(stream, "4I")
-        # data
-        out.path = stream.read(out.path_size).decode("latin_1")
-        if out.compressed_size == 0:
-            out.data = stream.read(out.uncompressed_size)
-        else:  # grab compressed bytes
-            out.data = stream.read(out.compressed_size)  # decompress later
-        return out
+        with binary.StructReader.of(stream) as reader:
+            out = cls()
+            # header
+            out.unused = reader.read_struct("H")
+            out.crc32, out.compressed_size, out.uncompressed_size, out.path_size = reader.read_struct("4I")
+            # data
+            out.path = reader.read(out.path_size).decode("latin_1")
+            if out.compressed_size == 0:
+                out.data = reader.read(out.uncompressed_size)
+            else:  # grab compressed bytes
+                out.data = reader.read(out.compressed_size)  # decompress later
+            return out
 
     def as_bytes(self) -> bytes:
         # TODO: compress data (optional)
@@ -105,15 +106,16 @@ class PakCentralDirectory():  # can't use core.Struct (bad alignment)
 
     @classmethod
     def from_stream(cls, stream: io.BytesIO) -> PakCentralDirectory:
-        out = cls()
-        out.unused = binary.read_struct(stream, "H")
-        out.crc32 = binary.read_struct(stream, "I")
-        out.uncompressed_size = binary.read_struct(stream, "I")
-        out.compressed_size = binary.read_struct(stream, "I")
-        out.path_size = binary.read_struct(stream, "I")
-        out.unknown = binary.read_struct(stream, "H")
-        out.header_offset = binary.read_struct(stream, "I")
-        return out
+        with binary.StructReader.of(stream) as reader:
+            out = cls()
+            out.unused = reader.read_struct("H")
+            out.crc32 = reader.read_struct("I")
+            out.uncompressed_size = reader.read_struct("I")
+            out.compressed_size = reader.read_struct("I")
+            out.path_size = reader.read_struct("I")
+            out.unknown = reader.read_struct("H")
+            out.header_offset = reader.read_struct("I")
+            return out
 
     def as_bytes(self) -> bytes:
         return b"".join([
@@ -148,10 +150,12 @@ class PakEOCD(core.Struct):  # End of Central Directory
 class PakFile(base.Archive, files.BinaryFile):
     """Nexon's cursed custom pkware.Zip implementation"""
     exts = ["*.zip"]
+    probes = [lambda head, tail: head[:4] in (b"CS\x03\x04", b"CS\x05\x06")]
     # NOTE: only exists inside .bsp; but it's based on pkware.Zip
     code_page = files.CodePage("latin_1", "strict")
     # entries
     local_files: Dict[str, PakLocalFile]  # contains data
+    # NOTE: call .invalidate() after editing .local_files, or .names will be stale
     # metadata
     central_directories: Dict[str, PakCentralDirectory]
     eocd: PakEOCD
@@ -168,6 +172,16 @@ class PakFile(base.Archive, files.BinaryFile):
         descriptor = f'"{self.filename}" {len(self.local_files)} files'
         return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
 
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        # NOTE: .local_files hold their data, so there's no offset
+        local_file = self.local_files[filepath]
+        if local_file.compressed_size == 0:
+            return base.EntryInfo(filepath, local_file.uncompressed_size, checksum=local_file.crc32)
+        return base.EntryInfo(
+            filepath, local_file.uncompressed_size, None,
+            local_file.compressed_size, "lzma", local_file.crc32)
+
     @parse_first
     def namelist(self) -> List[str]:
         return sorted(self.local_files.keys())
@@ -184,40 +198,38 @@ class PakFile(base.Archive, files.BinaryFile):
         if self.is_parsed:
             return
         self.is_parsed = True
-        magic = PakMagic(self.stream.read(4))
-        while magic == PakMagic.LocalFile:
-            local_file = PakLocalFile.from_stream(self.stream)
-            self.local_files[local_file.path] = local_file
-            magic = PakMagic(self.stream.read(4))
-        while magic == PakMagic.CentralDirectory:
-            cd = PakCentralDirectory.from_stream(self.stream)
-            filepath = self.stream.read(cd.path_size)
-            filepath = self.code_page.decode(filepath)
-            self.central_directories[filepath] = cd
-            magic = PakMagic(self.stream.read(4))
-        assert magic == PakMagic.EOCD
-        self.eocd = PakEOCD.from_stream(self.stream)
+        with binary.StructReader(self.stream) as reader:
+            magic = PakMagic(reader.read(4))
+            while magic == PakMagic.LocalFile:
+                local_file = PakLocalFile.from_stream(reader)
+                self.local_files[local_file.path] = local_file
+                magic = PakMagic(reader.read(4))
+            while magic == PakMagic.CentralDirectory:
+                cd = PakCentralDirectory.from_stream(reader)
+                filepath = reader.read(cd.path_size)
+                filepath = self.code_page.decode(filepath)
+                self.central_directories[filepath] = cd
+                magic = PakMagic(reader.read(4))
+            assert magic == PakMagic.EOCD
+            self.eocd = PakEOCD.from_stream(reader)
         assert len(self.local_files) == self.eocd.num_local_files
         assert len(self.central_directories) == self.eocd.num_central_directories
 
     @parse_first
-    def as_bytes(self):
+    def as_chunks(self) -> Generator[bytes, None, None]:
         # NOTE: decompresses all data
-        out = list()
         # TODO: preserve local_files order (if unedited)
         for local_file in self.local_files.values():
-            out.append(PakMagic.LocalFile.value)
-            out.append(local_file.as_bytes())
-        # TODO: generate new CentralDirectories
+            yield PakMagic.LocalFile.value
+            yield local_file.as_bytes()
+        # NOTE: .central_directories & .eocd are written as parsed, they don't track edits to .local_files
         for filepath, central_directory in self.central_directories.items():
-            out.append(PakMagic.CentralDirectory.value)
-            out.append(central_directory.as_bytes())
-            out.append(self.code_page.encode(filepath))
-        # TODO: generate new EOCD
-        out.append(PakMagic.EOCD.value)
-        out.append(self.eocd.as_bytes())
+            yield PakMagic.CentralDirectory.value
+            yield central_directory.as_bytes()
+            yield self.code_page.encode(filepath)
+        yield PakMagic.EOCD.value
+        yield self.eocd.as_bytes()
         # NOTE: no comment, unlike pkware.Zip
-        return b"".join(out)
 
 
 class Pkg(base.Archive, files.BinaryFile):
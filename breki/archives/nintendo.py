@@ -49,9 +49,7 @@ class FileNameTable:
         # folder table
         assert (names_offset - 8) % 8 == 0
         num_folders = (names_offset - 8) // 8
-        out.folder_table = [
-            binary.read_struct(stream, "I2H")
-            for i in range(num_folders)]
+        out.folder_table = binary.read_structs(stream, "I2H", num_folders)
         assert stream.tell() == offset + names_offset, f"{stream.tell():06X}"
         # filenames & folders
         parent = -1  # top-level
@@ -77,7 +75,6 @@ class FileNameTable:
         return out
 
 
-# NOTE: doing a really lazy reverse lookup for filepath -> index
 class Nds(base.Archive, files.BinaryFile):
     """Nintendo DS Cartdridge Image"""
     exts = ["*.nds"]
@@ -88,7 +85,7 @@ class Nds(base.Archive, files.BinaryFile):
     # file tables
     fnt: FileNameTable
     fat: List[Tuple[int, int]]
-    # ^ [(start, end)]
+    # ^ [(start, end)], in .namelist() order
     full_fat: List[Tuple[int, int]]
     # for when the FAT is oversized
 
@@ -147,9 +144,7 @@ class Nds(base.Archive, files.BinaryFile):
         # File Allocation Table
         fat_offset, fat_length = self.fat_header
         self.stream.seek(fat_offset)
-        self.fat = [
-            binary.read_struct(self.stream, "2I")  # start, end
-            for i in range(fat_length // 8)]
+        self.fat = binary.read_structs(self.stream, "2I", fat_length // 8)  # start, end
         assert self.stream.tell() == fat_offset + fat_length
 
         # trim FAT if larger than FNT namelist
@@ -166,17 +161,23 @@ class Nds(base.Archive, files.BinaryFile):
     def read(self, filepath: str) -> bytes:
         if filepath.startswith("./"):
             filepath = filepath[2:]
-        index = self.namelist().index(filepath)
+        index = self.names.index(filepath)
         start, end = self.fat[index]
-        self.stream.seek(start)
-        out = self.stream.read(end - start)
+        out = self.read_at(start, end - start)
         assert len(out) == end - start
         return out
 
     @parse_first
-    def sizeof(self, filepath: str) -> int:
+    def entry_range(self, filepath: str) -> Tuple[files.ByteStream, int, int]:
         if filepath.startswith("./"):
             filepath = filepath[2:]
-        index = self.namelist().index(filepath)
+        index = self.names.index(filepath)
         start, end = self.fat[index]
-        return end - start
+        return (self.stream, start, end - start)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        if filepath.startswith("./"):
+            filepath = filepath[2:]
+        start, end = self.fat[self.names.index(filepath)]
+        return base.EntryInfo(filepath, end - start, start)
@@ -13,6 +13,7 @@ from . import base
 
 class Bpk(base.Archive, files.BinaryFile):
     exts = ["*.bpk"]
+    probes = [(0, b"\x00\x00\x00\x01")]  # big-endian 1
     headers: List[CentralHeader]
     files: List[(LocalHeader, bytes)]
 
@@ -41,9 +42,7 @@ class Bpk(base.Archive, files.BinaryFile):
             return
         self.is_parsed = True
         one, num_headers = binary.read_struct(self.stream, ">2I")
-        self.headers = [
-            CentralHeader.from_stream(self.stream)
-            for i in range(num_headers)]
+        self.headers = CentralHeader.from_stream_many(self.stream, num_headers)
         assert all(header.one == 1 for header in self.headers)
         for header in self.headers:
             assert header.size >= 0x48
@@ -1,7 +1,8 @@
 from __future__ import annotations
 import functools
 import io
-from typing import List
+import struct
+from typing import Dict, Generator, List, Union
 import zipfile
 
 from .. import files
@@ -11,9 +12,12 @@ from . import base
 
 class Zip(base.Archive, files.BinaryFile):
     exts = ["*.zip"]
+    probes = [lambda head, tail: head[:4] in (b"PK\x03\x04", b"PK\x05\x06")]
+    data_offsets: Dict[int, int]
+    # ^ {header_offset: data_offset}, filled in by .data_offset
 
     def __repr__(self) -> str:
-        descriptor = f"{len(self.namelist())} files mode='{self._zip.mode}'"
+        descriptor = f"{len(self.names)} files mode='{self._zip.mode}'"
         if self.archive is not None:
             archive_repr = " ".join([
                 self.archive.__class__.__name__,
@@ -30,7 +34,7 @@ class Zip(base.Archive, files.BinaryFile):
                 b"PK\x05\x06", b"\x00" * 16,
                 b"\x20\x00XZP1 0", b"\x00" * 26]))
 
-    stream = functools.cached_property(_get_stream)
+    stream = files.base.locked_cached_property(_get_stream)
 
     @parse_first
     def extract(self, filepath: str, to_path=None):
@@ -53,15 +57,37 @@ class Zip(base.Archive, files.BinaryFile):
             return
         self.is_parsed = True
         self._zip = zipfile.ZipFile(self.stream, mode=mode, **kwargs)
+        self.data_offsets = dict()
 
     @parse_first
-    def sizeof(self, filepath: str) -> int:
+    def getinfo(self, filepath: str) -> base.EntryInfo:
         if filepath.startswith("./"):
             filepath = filepath[2:]
-        return self._zip.getinfo(filepath).file_size
+        info = self._zip.getinfo(filepath)
+        # NOTE: size, stored_size & checksum come from the central directory; offset is read on first access
+        offset = functools.partial(self.data_offset, info.header_offset)
+        compression = None
+        if info.compress_type != zipfile.ZIP_STORED:
+            compression = zipfile.compressor_names.get(info.compress_type, str(info.compress_type))
+        return base.EntryInfo(filepath, info.file_size, offset, info.compress_size, compression, info.CRC)
+
+    def data_offset(self, header_offset: int) -> int:
+        """offset of a file's data, which follows its local header (cached)"""
+        # NOTE: the local header has its own filename & extra field lengths
+        if header_offset not in self.data_offsets:
+            local_header = self.read_at(header_offset, zipfile.sizeFileHeader)
+            filename_length, extra_length = struct.unpack_from("<2H", local_header, 26)
+            self.data_offsets[header_offset] = header_offset + zipfile.sizeFileHeader + filename_length + extra_length
+        return self.data_offsets[header_offset]
+
+    @parse_first
+    def writestr(self, filepath: str, data: Union[str, bytes], **kwargs):
+        """zipfile.ZipFile.writestr, which also invalidates cached indices"""
+        self._zip.writestr(filepath, data, **kwargs)
+        self.invalidate()
 
     @parse_first
-    def as_bytes(self) -> bytes:
+    def as_chunks(self) -> Generator[bytes, None, None]:
         # write ending records if edits were made (adapted from ZipFile.close)
         if self._zip.mode in "wxa" and self._zip._didModify and self._zip.fp is not None:
             with self._zip._lock:
@@ -70,5 +96,9 @@ class Zip(base.Archive, files.BinaryFile):
                 self._zip._write_end_record()
         self._zip._didModify = False  # don't double up when .close() is called
         # NOTE: _zip.close() can get funky but it's OK because .stream isn't a real file
-        self.stream.seek(0)
-        return self.stream.read()
+        offset = 0
+        chunk = self.read_at(offset, files.parsed.chunk_size)
+        while len(chunk) != 0:
+            yield chunk
+            offset += len(chunk)
+            chunk = self.read_at(offset, files.parsed.chunk_size)
@@ -0,0 +1,163 @@
+"""Compiled Archive.search queries"""
+from __future__ import annotations
+import bisect
+import fnmatch
+import functools
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+
+def extension(filename: str) -> str:
+    """"folder/filename.EXT" -> ".EXT"; like the "*.ext" glob, "folder/.ext" -> ".ext" """
+    dot = filename.rfind(".")
+    if dot == -1 or "/" in filename[dot:]:
+        return ""
+    return filename[dot:]
+
+
+def literal_prefix(glob: str) -> str:
+    """literal start of a glob, up to the first wildcard; "materials/*/wall*" -> "materials/" """
+    for i, char in enumerate(glob):
+        if char in "*?[":
+            return glob[:i]
+    return glob
+
+
+class SearchIndex:
+    """lowercase keys, an extension index & a prefix index for one Archive.names snapshot"""
+    names: Tuple[str]
+    lower: Tuple[str]
+    extensions: Dict[str, List[int]]
+    # ^ {".ext": [index into names]}, lowercase
+    sorted_lower: List[str]
+    order: List[int]
+    # ^ sorted_lower[i] == lower[order[i]]
+
+    def __init__(self, names: Iterable[str]):
+        self.names = tuple(names)
+        self.lower = tuple(name.lower() for name in self.names)
+        self.extensions = dict()
+        for i, key in enumerate(self.lower):
+            self.extensions.setdefault(extension(key), list()).append(i)
+        self.order = sorted(range(len(self.lower)), key=self.lower.__getitem__)
+        self.sorted_lower = [self.lower[i] for i in self.order]
+
+    def with_prefix(self, prefix: str) -> Sequence[int]:
+        """indices of names starting w/ prefix (case insensitive), via bisect"""
+        prefix = prefix.lower()
+        if prefix == "":
+            return range(len(self.names))
+        start = bisect.bisect_left(self.sorted_lower, prefix)
+        end = bisect.bisect_left(self.sorted_lower, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        return self.order[start:end]
+
+    def __repr__(self) -> str:
+        descriptor = f"{len(self.names)} names {len(self.extensions)} extensions"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+
+class Query:
+    """Archive.search filter, compiled once & reusable across archives"""
+    # NOTE: a name matches if any glob or regex matches (or there are none) & it passes every prefilter
+    # -- "*.ext" globs & extensions are looked up in SearchIndex.extensions, w/o a scan
+    # -- "folder/*" globs & folder only scan names in SearchIndex.with_prefix
+    # -- case insensitive queries run against SearchIndex.lower
+    globs: Tuple[str]  # fnmatch patterns, matched against the whole name
+    regexes: Tuple[str]  # re patterns, re.search-ed
+    case_sensitive: bool
+    extensions: Tuple[str]  # prefilter, e.g. (".vmt", ".vtf")
+    folder: str  # prefilter, includes subfolders
+    min_size: int  # via Archive.sizeof (Archive.getinfo)
+    max_size: int
+    # compiled
+    glob_extensions: Tuple[str]
+    prefixed: Tuple[Tuple[str, re.Pattern]]
+    # ^ (literal prefix, pattern) for globs not starting w/ a wildcard
+    pattern: Union[re.Pattern, None]
+    # ^ every other glob & regex in one pattern; None if there are none
+
+    def __init__(self, globs=tuple(), regexes=tuple(), case_sensitive=False, extensions=tuple(),
+                 folder=None, min_size=None, max_size=None):
+        self.globs = tuple(globs)
+        self.regexes = tuple(regexes)
+        self.case_sensitive = case_sensitive
+        extensions = (ext if ext.startswith(".") else f".{ext}" for ext in extensions)
+        self.extensions = tuple(extensions if case_sensitive else (ext.lower() for ext in extensions))
+        if folder is not None:
+            folder = folder.replace("\\", "/").strip("/")
+            folder = folder[2:] if folder.startswith("./") else folder
+            folder = "" if folder == "." else folder
+        self.folder = folder
+        self.min_size = min_size
+        self.max_size = max_size
+        # compile
+        flags = 0 if case_sensitive else re.IGNORECASE
+        glob_extensions, prefixed, patterns = list(), list(), list()
+        for glob in self.globs:
+            glob = glob if case_sensitive else glob.lower()
+            if glob.startswith("*.") and not any(c in glob[1:] for c in "*?[/") and glob.count(".") == 1:
+                glob_extensions.append(glob[1:])
+            elif literal_prefix(glob) != "":
+                prefixed.append((literal_prefix(glob), re.compile(fnmatch.translate(glob), flags)))
+            else:
+                patterns.append(fnmatch.translate(glob))
+        patterns.extend(f".*?(?:{regex})" for regex in self.regexes)
+        self.glob_extensions = tuple(glob_extensions)
+        self.prefixed = tuple(prefixed)
+        self.pattern = re.compile("|".join(f"(?:{p})" for p in patterns), flags) if len(patterns) > 0 else None
+
+    def __repr__(self) -> str:
+        descriptor = " ".join([*map(repr, self.globs), *(f"re:{regex!r}" for regex in self.regexes)])
+        return f"<{self.__class__.__name__} {descriptor or '*'} @ 0x{id(self):016X}>"
+
+    def scope(self, index: SearchIndex) -> Sequence[int]:
+        """indices into index.names which could pass the folder prefilter"""
+        if self.folder is None or self.folder == "":
+            return range(len(index.names))
+        return [*index.with_prefix(f"{self.folder}/"), *index.with_prefix(f"./{self.folder}/")]
+
+    def candidates(self, index: SearchIndex) -> List[int]:
+        """indices into index.names matching a glob or regex, sorted"""
+        keys = index.names if self.case_sensitive else index.lower
+        if len(self.globs) + len(self.regexes) == 0:  # match all
+            if len(self.extensions) == 0:
+                return sorted(self.scope(index))
+            extensions = {ext.lower() for ext in self.extensions}
+            return sorted(i for ext in extensions for i in index.extensions.get(ext, ()))
+        out = {i for ext in self.glob_extensions for i in index.extensions.get(ext.lower(), ())}
+        if self.case_sensitive:  # extension index is lowercase
+            out = {i for i in out if extension(keys[i]) in self.glob_extensions}
+        for prefix, pattern in self.prefixed:
+            match = pattern.match
+            out.update(i for i in index.with_prefix(prefix) if match(keys[i]))
+        if self.pattern is not None:
+            match = self.pattern.match
+            out.update(i for i in self.scope(index) if match(keys[i]))
+        return sorted(out)
+
+    def run(self, archive) -> List[str]:
+        """matching filenames, in .namelist() order"""
+        index = archive.search_index
+        keys = index.names if self.case_sensitive else index.lower
+        out = self.candidates(index)
+        if len(self.extensions) != 0:
+            out = [i for i in out if extension(keys[i]) in self.extensions]
+        if self.folder is not None and self.folder != "":
+            prefixes = (f"{self.folder}/", f"./{self.folder}/")
+            if not self.case_sensitive:
+                prefixes = tuple(prefix.lower() for prefix in prefixes)
+            out = [i for i in out if keys[i].startswith(prefixes)]
+        names = [index.names[i] for i in out]
+        if self.min_size is not None or self.max_size is not None:
+            min_size = 0 if self.min_size is None else self.min_size
+            max_size = float("inf") if self.max_size is None else self.max_size
+            names = [name for name in names if min_size <= archive.sizeof(name) <= max_size]
+        return names
+
+
+@functools.lru_cache(maxsize=256)
+def compile_query(globs: Tuple[str, ...] = tuple(), regexes: Tuple[str, ...] = tuple(), case_sensitive: bool = False,
+                  extensions: Tuple[str, ...] = tuple(), folder: str = None, min_size: int = None,
+                  max_size: int = None) -> Query:
+    """cached Query constructor (all arguments must be hashable)"""
+    return Query(globs, regexes, case_sensitive, extensions, folder, min_size, max_size)
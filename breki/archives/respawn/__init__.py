@@ -1,11 +1,12 @@
 from __future__ import annotations
 import io
-from typing import Dict, List
+from typing import Dict, List, Tuple, Union
 
 from ... import core
 from ... import binary
 from ... import files
 from ...files.parsed import parse_first
+from .. import base
 from .. import valve
 from .rpak import RPak
 
@@ -87,9 +88,11 @@ class VpkFilePart:
 class Vpk(valve.Vpk):
     """*_dir.vpk only!"""
     exts = ["*_dir.vpk"]
+    probes = [(0, b"\x34\x12\xAA\x55\x02\x00\x03\x00")]  # v2.3
     code_page = files.CodePage("latin_1", "strict")
     header: VpkHeader
-    entries: Dict[str, VpkEntry]
+    entries: core.PathTable
+    # ^ {"folder/filename.ext": VpkEntry}
     # NOTE: 'versions' is unused; only v2.3 is supported
 
     @property
@@ -101,6 +104,17 @@ class Vpk(valve.Vpk):
         base_filename = self.filename[language_length:-8]
         return {f"{base_filename}_*.vpk": files.DataType.BINARY}
 
+    @parse_first
+    def entry_range(self, filepath: str) -> Union[Tuple[files.ByteStream, int, int], None]:
+        assert filepath in self.names
+        entry = self.entries[filepath]
+        # NOTE: multi-part entries span several ranges (maybe in different _NNN.vpk), so they're read w/ .read()
+        if entry.is_compressed or len(entry.file_parts) != 1:
+            return None
+        file_part = entry.file_parts[0]
+        stream = self.archive_vpk(file_part.archive_index).stream
+        return (stream, file_part.offset, file_part.length)
+
     def archive_vpk(self, index: int) -> files.File:
         # "<language>client_*_dir.vpk" -> "client_*"
         assert self.filename.endswith("_dir.vpk")
@@ -130,34 +144,37 @@ class Vpk(valve.Vpk):
                 folder = binary.read_str(self.stream, *self.code_page)
                 if folder == "":
                     break  # end of extension
+                elif folder == " ":
+                    folder = ""  # root folder
                 while True:
                     filename = binary.read_str(self.stream, *self.code_page)
                     if filename == "":
                         break  # end of folder
-                    if folder != " ":  # not in root folder
-                        entry_path = f"{folder}/{filename}.{extension}"
-                    else:
-                        entry_path = f"{filename}.{extension}"
-                    self.entries[entry_path] = VpkEntry.from_stream(self.stream)
+                    filename = f"{filename}.{extension}"
+                    self.entries.insert(folder, filename, VpkEntry.from_stream(self.stream))
                     # NOTE: we don't save preload, unlike valve.Vpk
         assert self.stream.tell() == 16 + self.header.tree_length, "overshot tree"
 
     @parse_first
     def read(self, filepath: str) -> bytes:
-        assert filepath in self.namelist()
+        assert filepath in self.names
         entry = self.entries[filepath]
         if entry.is_compressed:
             raise NotImplementedError("cannot decompress, yet.")
             # TODO: lzham decompress the compressed file_parts
         parts = list()
         for file_part in entry.file_parts:
-            stream = self.archive_vpk(file_part.archive_index).stream
-            stream.seek(file_part.offset)
-            data = stream.read(file_part.length)
+            data = self.archive_vpk(file_part.archive_index).read_at(file_part.offset, file_part.length)
             assert len(data) == file_part.length, "unexpected EOF"
             parts.append(data)
         return b"".join(parts)
 
     @parse_first
-    def sizeof(self, filepath: str) -> int:
-        return sum(fp.length for fp in self.entries[filepath].file_parts)
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        entry = self.entries[filepath]
+        size = sum(fp.length for fp in entry.file_parts)
+        offset = entry.file_parts[0].offset if len(entry.file_parts) == 1 else None
+        if not entry.is_compressed:
+            return base.EntryInfo(filepath, size, offset, checksum=entry.crc)
+        stored_size = sum(fp.compressed_length for fp in entry.file_parts)
+        return base.EntryInfo(filepath, size, offset, stored_size, "lzham", entry.crc)
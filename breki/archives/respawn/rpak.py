@@ -1,6 +1,7 @@
 # https://github.com/r-ex/LegionPlus/
 import datetime
 import enum
+import struct
 from typing import Dict, List, Tuple, Union
 
 from ... import binary
@@ -96,38 +97,45 @@ class FileTime:
 
 
 # other header data
+# NOTE: __slots__ = () -> MappedArray.specialise generates compact subclasses for big tables
 class PatchHeader(core.MappedArray):
     data_size: int  # "total size of the patch edit stream data"
     virtual_segment: int  # index into VirtualSegments
+    __slots__ = ()
     _mapping = ["data_size", "virtual_segment"]
     _format = "2I"
 
 
 class CompressPair(core.MappedArray):
+    __slots__ = ()
     _mapping = ["compressed_size", "decompressed_size"]
     _format = "2Q"
 
 
 class VirtualSegment(core.MappedArray):
     flags: int  # if 64 is set, this virtual segment is in another file
+    __slots__ = ()
     _mapping = ["flags", "type", "size"]
     _format = "2IQ"
     # TODO: flags & type enums
 
 
 class MemoryPage(core.MappedArray):
+    __slots__ = ()
     _mapping = ["virtual_segment", "flags", "size"]
     _format = "3I"
     # TODO: flags enum
 
 
 class Descriptor(core.MappedArray):
+    __slots__ = ()
     _mapping = ["index", "offset"]
     _format = "2I"
 
 
 # versioned headers
 class AssetEntryv6(core.MappedArray):  # also v7
+    __slots__ = ()
     _mapping = [
         "name_hash", "unknown_1", "head_index", "head_offset", "cpu_index", "cpu_offset",
         "starpak_offset", "last_page", "unknown_2",
@@ -137,6 +145,7 @@ class AssetEntryv6(core.MappedArray):  # also v7
 
 
 class AssetEntryv8(core.MappedArray):
+    __slots__ = ()
     _mapping = [
         "name_hash", "unknown", "head_index", "head_offset", "cpu_index", "cpu_offset",
         "starpak_offset", "optimal_starpak_offset", "last_page", "unknown",
@@ -212,6 +221,7 @@ class RPakHeaderv8(core.MappedArray):
 
 class RPak(base.Archive, files.BinaryFile):
     exts = ["*.rpak"]
+    probes = [(0, b"RPak")]
     code_page = files.CodePage("utf-8", "strict")
     header: Union[RPakHeaderv6, RPakHeaderv7, RPakHeaderv8]
     starpaks: List[str]
@@ -260,8 +270,7 @@ class RPak(base.Archive, files.BinaryFile):
             for virtual_segment in self.virtual_segments[:index]
             if not virtual_segment.flags & 64)
         length = self.virtual_segments[index].size
-        self.stream.seek(start)
-        return self.stream.read(length)
+        return self.read_at(start, length)
 
     # TODO: memory_page_data(self, index: int) -> bytes:
     # -- should be inside a virtual_segment, need relative offset
@@ -279,18 +288,14 @@ class RPak(base.Archive, files.BinaryFile):
                 if vs.flags == 1 and vs.type == 1][0]
             raw_names = self.virtual_segment_data(names_segment_index)
             try:
-                names = [
-                    self.code_page.decode(filepath)
-                    for filepath in raw_names.split(b"\0")[:-1]]
+                names = binary.split_strings(raw_names, *self.code_page)
             except UnicodeDecodeError:
                 assert names_segment_index + 1 < len(self.virtual_segments)
                 start = self.virtual_segment_data(names_segment_index).find(b"r2")
                 raw_names = b"".join([
                     self.virtual_segment_data(names_segment_index + 0)[start:],
                     self.virtual_segment_data(names_segment_index + 1)[:start]])
-                names = [
-                    filepath.decode()
-                    for filepath in raw_names.split(b"\0")[:-1]]
+                names = binary.split_strings(raw_names)
             assert len(names) == len(self.asset_entries)
             return sorted(names)
         else:
@@ -300,7 +305,7 @@ class RPak(base.Archive, files.BinaryFile):
 
     @parse_first
     def read(self, filepath: str) -> bytes:
-        assert filepath in self.namelist()
+        assert filepath in self.names
         raise NotImplementedError("cannot parse StaRPak")
 
     def parse(self):
@@ -317,12 +322,8 @@ class RPak(base.Archive, files.BinaryFile):
         if self.header.patch_index > 0:
             self.patch = (
                 PatchHeader.from_stream(self.stream),
-                [
-                    CompressPair.from_stream(self.stream)
-                    for i in range(self.header.patch_index)],
-                [
-                    binary.read_struct(self.stream, "H")
-                    for i in range(self.header.patch_index)])  # "IndicesToFile"
+                CompressPair.from_stream_many(self.stream, self.header.patch_index),
+                binary.read_structs(self.stream, "H", self.header.patch_index))  # "IndicesToFile"
         if self.header.compression is not Compression.NONE:
             return
             # TODO: decompress everything after the main header
@@ -333,31 +334,22 @@ class RPak(base.Archive, files.BinaryFile):
             # self.stream.seek(len(self.header.as_bytes()))
         # StaRPak references
         raw_starpak_refs = self.stream.read(self.header.len_starpak_ref)
-        self.starpaks = [
-            self.code_page.decode(filepath)
-            for filepath in raw_starpak_refs.split(b"\0")][:-1]
+        self.starpaks = binary.split_strings(raw_starpak_refs, *self.code_page)
         if self.version == 8:
             raw_opt_starpak_refs = self.stream.read(self.header.len_opt_starpak_ref)
-            self.optimal_starpaks = [
-                self.code_page.decode(filepath)
-                for filepath in raw_opt_starpak_refs.split(b"\0")][:-1]
+            self.optimal_starpaks = binary.split_strings(raw_opt_starpak_refs, *self.code_page)
         # TODO: files.lumps
-        self.virtual_segments = [
-            VirtualSegment.from_stream(self.stream)
-            for i in range(self.header.num_virtual_segments)]
-        self.memory_pages = [
-            MemoryPage.from_stream(self.stream)
-            for i in range(self.header.num_memory_pages)]
-        self.descriptors = [
-            Descriptor.from_stream(self.stream)
-            for i in range(self.header.num_descriptors)]
+        self.virtual_segments = VirtualSegment.from_stream_many(
+            self.stream, self.header.num_virtual_segments)
+        self.memory_pages = MemoryPage.from_stream_many(
+            self.stream, self.header.num_memory_pages)
+        self.descriptors = Descriptor.from_stream_many(
+            self.stream, self.header.num_descriptors)
         AssetEntryClass = self.AssetEntryClasses[self.version]
-        self.asset_entries = [
-            AssetEntryClass.from_stream(self.stream)
-            for i in range(self.header.num_asset_entries)]
-        self.guid_descriptors = [
-            Descriptor.from_stream(self.stream)
-            for i in range(self.header.num_guid_descriptors)]
+        self.asset_entries = AssetEntryClass.from_stream_many(
+            self.stream, self.header.num_asset_entries)
+        self.guid_descriptors = Descriptor.from_stream_many(
+            self.stream, self.header.num_guid_descriptors)
         self.relations = binary.read_struct(
             self.stream, f"{self.header.num_relations}I")
         # TODO: parse the rest of the file
@@ -367,6 +359,7 @@ class RPak(base.Archive, files.BinaryFile):
 
 # StaRPak
 class StreamEntry(core.MappedArray):
+    __slots__ = ()
     _mapping = ["offset", "size"]
     _format = "2Q"
 
@@ -386,11 +379,9 @@ class StaRPak(files.BinaryFile):
         if self.is_parsed:
             return
         self.is_parsed = True
-        assert binary.read_struct(self.stream, "4s") == b"SRPk"
-        assert binary.read_struct(self.stream, "I") == 1  # version?
-        self.stream.seek(-8, 2)
-        num_entries = binary.read_struct(self.stream, "Q")
-        self.stream.seek(-(8 + num_entries * 16), 2)
-        self.entries = [
-            StreamEntry.from_stream(self.stream)
-            for i in range(num_entries)]
+        magic, version = struct.unpack_from("4sI", self.buffer, 0)
+        assert magic == b"SRPk"
+        assert version == 1  # version?
+        num_entries = struct.unpack_from("Q", self.buffer, len(self.buffer) - 8)[0]
+        entries_offset = len(self.buffer) - (8 + num_entries * 16)
+        self.entries = StreamEntry.array_from_bytes(self.buffer[entries_offset:-8])
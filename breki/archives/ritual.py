@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from .. import core
 from .. import binary
@@ -17,6 +17,7 @@ class SPakEntry(core.Struct):
 
 class Sin(base.Archive, files.BinaryFile):
     exts = ["*.sin"]
+    probes = [(0, b"SPAK")]
     code_page = files.CodePage("ascii", "strict")
     entries: Dict[str, SPakEntry]
 
@@ -28,8 +29,18 @@ class Sin(base.Archive, files.BinaryFile):
     def read(self, filepath: str) -> bytes:
         assert filepath in self.entries
         entry = self.entries[filepath]
-        self.stream.seek(entry.offset)
-        return self.stream.read(entry.length)
+        return self.read_at(entry.offset, entry.length)
+
+    @parse_first
+    def entry_range(self, filepath: str) -> Tuple[files.ByteStream, int, int]:
+        assert filepath in self.entries
+        entry = self.entries[filepath]
+        return (self.stream, entry.offset, entry.length)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        entry = self.entries[filepath]
+        return base.EntryInfo(filepath, entry.length, entry.offset)
 
     @parse_first
     def namelist(self) -> List[str]:
@@ -47,6 +58,4 @@ class Sin(base.Archive, files.BinaryFile):
         self.stream.seek(offset)
         self.entries = {
             self.code_page.decode(entry.filepath.partition(b"\0")[0]): entry
-            for entry in [
-                SPakEntry.from_stream(self.stream)
-                for i in range(length // sizeof_entry)]}
+            for entry in SPakEntry.from_stream_many(self.stream, length // sizeof_entry)}
@@ -2,7 +2,7 @@
 # http://forum.xentax.com/viewtopic.php?f=10&t=4688&view=previous
 # -- Echelon & Isozone variants exist w/ other .pak files
 # -- partial winrar support?
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from .. import binary
 from .. import core
@@ -26,6 +26,7 @@ class Entry(core.Struct):
 
 class Pak(base.Archive, files.BinaryFile):
     exts = ["*.pak"]
+    probes = [(0, b"NPCK")]
     entries: Dict[str, Entry]
     # NOTE: names are currently placeholders
 
@@ -55,9 +56,7 @@ class Pak(base.Archive, files.BinaryFile):
         num_entries = binary.read_struct(self.stream, "I")
         self.entries = {
             f"{entry.unknown:08X}": entry
-            for entry in [
-                Entry.from_stream(self.stream)
-                for i in range(num_entries)]}
+            for entry in Entry.from_stream_many(self.stream, num_entries)}
         # NOTE: entries are listed in ascending `unknown` order
         # -- not in offset order
         # NOTE: some entries are 0 bytes in length
@@ -67,9 +66,15 @@ class Pak(base.Archive, files.BinaryFile):
     def read(self, filepath: str) -> bytes:
         assert filepath in self.entries
         entry = self.entries[filepath]
-        self.stream.seek(entry.offset + 8)
-        return self.stream.read(entry.length)
+        return self.read_at(entry.offset + 8, entry.length)
 
     @parse_first
-    def sizeof(self, filepath: str) -> int:
-        return self.entries[filepath].length
+    def entry_range(self, filepath: str) -> Tuple[files.ByteStream, int, int]:
+        assert filepath in self.entries
+        entry = self.entries[filepath]
+        return (self.stream, entry.offset + 8, entry.length)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        entry = self.entries[filepath]
+        return base.EntryInfo(filepath, entry.length, entry.offset + 8)
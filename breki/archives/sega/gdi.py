@@ -5,6 +5,7 @@ from .. import base
 
 class Gdi(base.DiscImage, files.TextFile):
     exts = ["*.gdi"]
+    probes = [lambda head, tail: head.partition(b"\n")[0].strip().isdigit()]  # num_tracks
 
     def parse(self):
         if self.is_parsed:
@@ -117,6 +117,10 @@ class GDRom(base.Archive, files.HybridFile):
             for attr in ("product_number", "game", "version"))
         return f"<GDRom {descriptor} @ 0x{id(self):016X}>"
 
+    @parse_first
+    def getinfo(self, filename: str) -> base.EntryInfo:
+        return self.gd_rom.getinfo(filename)
+
     @parse_first
     def listdir(self, search_folder: str) -> List[str]:
         return self.gd_rom.listdir(search_folder)
@@ -88,16 +88,17 @@ class Directory:
 
     @classmethod
     def from_stream(cls, stream: io.BytesIO) -> Directory:
-        out = cls()
-        out.filetype = Filetype(binary.read_struct(stream, "B"))
-        out.copy_protected = CopyMode(binary.read_struct(stream, "B"))
-        out.first_block = binary.read_struct(stream, "H")
-        out.filename = stream.read(12).decode("ascii")
-        out.created = BCDTimestamp.from_stream(stream)
-        out.num_blocks = binary.read_struct(stream, "H")
-        out.header_offset = binary.read_struct(stream, "H")
-        assert stream.read(4) == b"\x00" * 4
-        return out
+        with binary.StructReader.of(stream) as reader:
+            out = cls()
+            out.filetype = Filetype(reader.read_struct("B"))
+            out.copy_protected = CopyMode(reader.read_struct("B"))
+            out.first_block = reader.read_struct("H")
+            out.filename = reader.read(12).decode("ascii")
+            out.created = BCDTimestamp.from_stream(reader)
+            out.num_blocks = reader.read_struct("H")
+            out.header_offset = reader.read_struct("H")
+            assert reader.read(4) == b"\x00" * 4
+            return out
 
 
 class Filetype(enum.Enum):
@@ -113,28 +114,29 @@ class Root:
 
     @classmethod
     def from_stream(cls, stream: io.BytesIO) -> Root:
-        out = cls()
-        assert stream.read(16) == b"U" * 16, "unformatted VMU"
-        colour_flag = binary.read_struct(stream, "B")
-        assert colour_flag in (0x00, 0x01), "invalid colour flag"
-        out.use_colour = bool(colour_flag)
-        out.colour = binary.read_struct(stream, "4s")
-        assert stream.read(27) == b"\x00" * 27  # 0x15..2F
-        out.format_date = BCDTimestamp.from_stream(stream)
-        assert stream.read(8) == b"\x00" * 8  # 0x38..3F
-        out.unknown_1 = stream.read(6)  # 3H?
-        out.fat_index, out.fat_size = binary.read_struct(stream, "2H")
-        assert out.fat_index == 254
-        assert out.fat_size == 1
-        out.dir_index, out.dir_size = binary.read_struct(stream, "2H")
-        assert out.dir_index == 253
-        assert out.dir_size == 13
-        out.icon_index = binary.read_struct(stream, "H")
-        assert 0 <= out.icon_index <= 123
-        out.num_user_blocks = binary.read_struct(stream, "H")
-        assert out.num_user_blocks == 200
-        out.unknown_2 = stream.read(430)
-        return out
+        with binary.StructReader.of(stream) as reader:
+            out = cls()
+            assert reader.read(16) == b"U" * 16, "unformatted VMU"
+            colour_flag = reader.read_struct("B")
+            assert colour_flag in (0x00, 0x01), "invalid colour flag"
+            out.use_colour = bool(colour_flag)
+            out.colour = reader.read_struct("4s")
+            assert reader.read(27) == b"\x00" * 27  # 0x15..2F
+            out.format_date = BCDTimestamp.from_stream(reader)
+            assert reader.read(8) == b"\x00" * 8  # 0x38..3F
+            out.unknown_1 = reader.read(6)  # 3H?
+            out.fat_index, out.fat_size = reader.read_struct("2H")
+            assert out.fat_index == 254
+            assert out.fat_size == 1
+            out.dir_index, out.dir_size = reader.read_struct("2H")
+            assert out.dir_index == 253
+            assert out.dir_size == 13
+            out.icon_index = reader.read_struct("H")
+            assert 0 <= out.icon_index <= 123
+            out.num_user_blocks = reader.read_struct("H")
+            assert out.num_user_blocks == 200
+            out.unknown_2 = reader.read(430)
+            return out
 
 
 class VMI(core.Struct):
@@ -191,6 +193,7 @@ class VMI(core.Struct):
 class VMU(base.Archive, files.BinaryFile):
     """256 blocks of 512 bytes (128KB)"""
     exts = ["*.bin"]  # not "*.vmu"?
+    probes = [(-512, b"U" * 16)]  # formatted root block
     directories: Dict[int, Directory]
     fat: List[int]  # File Allocation Table
     # 0xFFFC unallocated
@@ -206,7 +209,7 @@ class VMU(base.Archive, files.BinaryFile):
 
     @parse_first
     def __repr__(self) -> str:
-        descriptor = f"{self.pvd.name!r} {len(self.namelist())} files"
+        descriptor = f"{self.pvd.name!r} {len(self.names)} files"
         return f"<VMU {descriptor} @ 0x{id(self):016X}>"
 
     @property
@@ -215,6 +218,12 @@ class VMU(base.Archive, files.BinaryFile):
             directory.filename: directory
             for i, directory in self.directories.items()}
 
+    @parse_first
+    def getinfo(self, filename: str) -> base.EntryInfo:
+        # NOTE: blocks are chained in the FAT, so there's no single offset
+        directory = self.directories_by_name[filename]
+        return base.EntryInfo(filename, directory.num_blocks * 512)
+
     @parse_first
     def namelist(self) -> List[str]:
         return sorted(self.directories_by_name.keys())
@@ -226,9 +235,9 @@ class VMU(base.Archive, files.BinaryFile):
         self.stream.seek(254 * 512)
         self.fat = binary.read_struct(self.stream, "256H")
         # directories
-        dir_stream = io.BytesIO(self.read_from_block(253, 13))
+        dir_reader = binary.StructReader(self.read_from_block(253, 13))
         for i in range(200):
-            directory = Directory.from_stream(dir_stream)
+            directory = Directory.from_stream(dir_reader)
             if directory.filetype == Filetype.NONE:
                 continue
             self.directories[i] = directory
@@ -237,8 +246,7 @@ class VMU(base.Archive, files.BinaryFile):
     def read_from_block(self, block_index: int, num_blocks: int) -> bytes:
         out = list()
         while 0x00 <= block_index <= 0xFF:
-            self.stream.seek(block_index * 512)
-            out.append(self.stream.read(512))
+            out.append(self.read_at(block_index * 512, 512))
             block_index = self.fat[block_index]
         if block_index == 0xFFFA:  # last block of file
             assert len(out) == num_blocks, f"unexpected length: {num_blocks}"
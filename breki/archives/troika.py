@@ -36,6 +36,8 @@ class VpkEntry:
 
 class Vpk(base.Archive, files.BinaryFile):
     exts = ["pack*.vpk"]
+    # NOTE: no .probes; the trailer can't be validated w/o the file size
+    # -- archives.formats lists troika.Vpk after the *.vpk classes w/ magic, so it's the fallback
     entries: Dict[str, VpkEntry]
 
     def __init__(self, filepath: str, archive=None, code_page=None):
@@ -64,11 +66,11 @@ class Vpk(base.Archive, files.BinaryFile):
     @parse_first
     def read(self, filepath: str) -> bytes:
         entry = self.entries[filepath]
-        self.stream.seek(entry.offset)
-        data = self.stream.read(entry.length)
+        data = self.read_at(entry.offset, entry.length)
         assert len(data) == entry.length, "unexpected EOF"
         return data
 
     @parse_first
-    def sizeof(self, filepath: str) -> int:
-        return self.entries[filepath].length
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        entry = self.entries[filepath]
+        return base.EntryInfo(filepath, entry.length, entry.offset)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import io
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from .. import binary
 from .. import core
@@ -11,6 +11,7 @@ from . import base
 
 class Apk(base.Archive, files.BinaryFile):
     exts = ["*.apk"]
+    probes = [(0, b"\x57\x23\x00\x00")]
     header: ApkHeader
     entries: Dict[str, ApkEntry]
 
@@ -23,19 +24,35 @@ class Apk(base.Archive, files.BinaryFile):
         descriptor = f'"{self.filename}" {len(self.entries)} files'
         return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
 
+    @parse_first
+    def entry_range(self, filepath: str) -> Tuple[files.ByteStream, int, int]:
+        if filepath not in self.entries:
+            raise FileNotFoundError()
+        entry = self.entries[filepath]
+        return (self.stream, entry.offset, entry.length)
+
+    @parse_first
+    def getinfo(self, filepath: str) -> base.EntryInfo:
+        if filepath not in self.entries:
+            raise FileNotFoundError()
+        entry = self.entries[filepath]
+        return base.EntryInfo(filepath, entry.length, entry.offset)
+
     @parse_first
     def namelist(self) -> List[str]:
         return sorted(self.entries.keys())
 
     @parse_first
     def read(self, filepath: str) -> bytes:
-        if filepath not in self.namelist():
+        if filepath not in self.entries:
             raise FileNotFoundError()
         entry = self.entries[filepath]
-        self.stream.seek(entry.offset)
-        return self.stream.read(entry.length)
+        return self.read_at(entry.offset, entry.length)
 
     def parse(self):
+        if self.is_parsed:
+            return
+        self.is_parsed = True
         self.header = ApkHeader.from_stream(self.stream)
         assert self.header.magic == b"\x57\x23\x00\x00", "not a valid .apk file"
         self.stream.seek(self.header.dir_offset)
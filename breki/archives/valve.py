@@ -1,6 +1,7 @@
 # https://github.com/ValvePython/vpk
 from __future__ import annotations
-from typing import Dict, List, Union
+import struct
+from typing import Dict, List, Set, Tuple, Union
 
 from .. import binary
 from .. import core
@@ -52,10 +53,16 @@ class VpkEntry(core.Struct):
 
 class Vpk(base.Archive, files.FriendlyBinaryFile):
     exts = ["*.vpk", "*_dir.vpk"]
+    probes = [
+        (0, b"\x34\x12\xAA\x55"),
+        lambda head, tail: struct.unpack_from("2H", head, 4) in Vpk.versions]
     header: Union[VpkHeader, VpkHeaderv2]
-    entries: Dict[str, VpkEntry]
+    entries: core.PathTable
+    # ^ {"folder/filename.ext": VpkEntry}
+    archive_indices: Set[int]  # for each friend _NNN.vpk
     friends: Dict[str, files.File]
-    preload_offset: Dict[str, int]
+    preload_offset: core.PathTable
+    # ^ {"folder/filename.ext": offset}
     versions = {
         (1, 0): VpkHeader,
         (2, 0): VpkHeaderv2}
@@ -63,9 +70,10 @@ class Vpk(base.Archive, files.FriendlyBinaryFile):
 
     def __init__(self, filepath: str, archive=None, code_page=None):
         super().__init__(filepath, archive, code_page)
-        self.entries = dict()
+        self.entries = core.PathTable()
+        self.archive_indices = set()
         self.extras = dict()
-        self.preload_offset = dict()
+        self.preload_offset = core.PathTable()
 
     @parse_first
     def __repr__(self) -> str:
@@ -79,10 +87,7 @@ class Vpk(base.Archive, files.FriendlyBinaryFile):
         if self.filename.endswith("_dir.vpk"):
             return {
                 f"{self.filename[:-8]}_{index:03d}.vpk": files.DataType.BINARY
-                for index in {
-                    entry.archive_index
-                    for entry in self.entries.values()
-                    if entry.archive_index != 0x7FFF}}
+                for index in self.archive_indices}
         return dict()
 
     @parse_first
@@ -91,26 +96,63 @@ class Vpk(base.Archive, files.FriendlyBinaryFile):
 
     @parse_first
     def read(self, filename: str) -> bytes:
-        assert filename in self.namelist()
+        assert filename in self.names
         entry = self.entries[filename]
         if entry.archive_index != 0x7FFF:
             assert self.filename.endswith("_dir.vpk")
-            stream = self.archive_vpk(entry.archive_index).stream
+            # NOTE: friends are read through files.handle_pool, w/o mapping (& holding an fd for) each _NNN.vpk
+            data = self.archive_vpk(entry.archive_index).read_at(entry.archive_offset, entry.file_length)
         else:
-            stream = self.stream
-        stream.seek(entry.archive_offset)
-        data = stream.read(entry.file_length)
+            data = bytes(self.buffer[entry.archive_offset:entry.archive_offset + entry.file_length])
         assert len(data) == entry.file_length, "unexpected EOF"
         return data
 
+    @parse_first
+    def entry_range(self, filename: str) -> Tuple[files.ByteStream, int, int]:
+        assert filename in self.entries
+        entry = self.entries[filename]
+        if entry.archive_index != 0x7FFF:
+            assert self.filename.endswith("_dir.vpk")
+            stream = self.archive_vpk(entry.archive_index).stream
+        else:
+            stream = self.stream
+        return (stream, entry.archive_offset, entry.file_length)
+
+    @parse_first
+    def getinfo(self, filename: str) -> base.EntryInfo:
+        # NOTE: preload data isn't included, same as .read()
+        entry = self.entries[filename]
+        return base.EntryInfo(filename, entry.file_length, entry.archive_offset, checksum=entry.crc)
+
     def archive_vpk(self, index: int) -> files.File:
         assert self.filename.endswith("_dir.vpk"), "not a _dir.vpk"
         return self.friends[f"{self.filename[:-8]}_{index:03d}.vpk"]
 
+    def index_as_sections(self) -> Dict[str, bytes]:
+        names = list(self.entries)
+        return {
+            "header": self.header.as_bytes(),
+            "names": b"".join(self.code_page.encode(name) + b"\x00" for name in names),
+            "entries": VpkEntry.pack_many(self.entries.values()),
+            "archive_indices": struct.pack(f"<{len(self.archive_indices)}H", *sorted(self.archive_indices)),
+            "preload_offset": struct.pack(f"<{len(names)}Q", *(self.preload_offset[name] for name in names))}
+
+    def index_from_sections(self, sections: Dict[str, memoryview]):
+        HeaderClass = self.versions[struct.unpack_from("2H", sections["header"], 4)]
+        self.header = HeaderClass.from_bytes(sections["header"])
+        names = binary.split_strings(sections["names"], *self.code_page)
+        # NOTE: entries are decoded on first access; still PathTables, same as after .parse()
+        records = VpkEntry.array_from_bytes(bytes(sections["entries"]), lazy=True)
+        self.entries = core.codec.LazyPathTable(names, records)
+        self.archive_indices = set(struct.unpack(f"<{len(sections['archive_indices']) // 2}H", sections["archive_indices"]))
+        self.preload_offset = self.entries.parallel_table(struct.unpack(f"<{len(names)}Q", sections["preload_offset"]))
+
     def parse(self):
         if self.is_parsed:
             return
         self.is_parsed = True
+        if self.load_index():
+            return
         # verify magic
         magic = binary.read_struct(self.stream, "I")
         assert magic == 0x55AA1234
@@ -126,6 +168,13 @@ class Vpk(base.Archive, files.FriendlyBinaryFile):
         end_of_tree = len(self.header.as_bytes()) + self.header.tree_length
         # tree
         assert self.header.tree_length != 0, "no files?"
+        self.parse_tree(end_of_tree)
+        assert self.stream.tell() == end_of_tree, "overshot tree"
+        self.archive_indices = {entry.archive_index for entry in self.entries.values()} - {0x7FFF}
+        self.save_index()
+
+    def parse_tree(self, end_of_tree: int):
+        """read .entries & .preload_offset from the tree; extension -> folder -> filename"""
         while True:
             extension = binary.read_str(self.stream, *self.code_page)
             if extension == "":
@@ -134,20 +183,18 @@ class Vpk(base.Archive, files.FriendlyBinaryFile):
                 folder = binary.read_str(self.stream, *self.code_page)
                 if folder == "":
                     break  # end of extension
+                elif folder == " ":
+                    folder = ""  # root folder
                 while True:
                     filename = binary.read_str(self.stream, *self.code_page)
                     if filename == "":
                         break  # end of folder
                     # entry
-                    if folder != " ":  # not in root folder
-                        entry_path = f"{folder}/{filename}.{extension}"
-                    else:
-                        entry_path = f"{filename}.{extension}"
+                    filename = f"{filename}.{extension}"
                     entry = VpkEntry.from_stream(self.stream)
                     assert binary.read_struct(self.stream, "H") == 0xFFFF
                     if entry.archive_index == 0x7FFF:
                         entry.archive_offset += end_of_tree
-                    self.entries[entry_path] = entry
-                    self.preload_offset[entry_path] = self.stream.tell()
+                    self.entries.insert(folder, filename, entry)
+                    self.preload_offset.insert(folder, filename, self.stream.tell())
                     self.stream.seek(entry.preload_length, 1)
-        assert self.stream.tell() == end_of_tree, "overshot tree"
@@ -1,37 +1,324 @@
+from __future__ import annotations
+from concurrent import futures
+import functools
 import io
 import itertools
+import mmap
+import os
+import re
 import struct
-from typing import Any, Generator, List, Union
+from typing import Any, Callable, Dict, Generator, List, Sequence, Tuple, Union
+
+
+Pattern = Union[bytes, str]
+# ^ b"PK\x03\x04" or "0F F5 ?? EE"
+# NOTE: str patterns are IDA-style hex bytes; "?" or "??" matches any byte
+
+Hit = Tuple[int, Pattern]
+# ^ (offset, pattern)
 
 
 def find_all(data: bytes, substring: bytes) -> List[int]:
     """extending bytes.find to be useful"""
     out = list()
-    start = 0
-    while data.find(substring, start) != -1:
-        out.append(data.find(substring, start))
-        start = out[-1] + len(substring)
+    start = data.find(substring)
+    while start != -1:
+        out.append(start)
+        start = data.find(substring, start + len(substring))
     return out
 
 
-def read_str(stream: io.BytesIO, encoding="utf-8", errors="strict") -> str:
-    out = b""
-    c = stream.read(1)
-    while c != b"\x00":
-        out += c
+# "0F F5 ?? EE" -> [b"\x0f\xf5", None, b"\xee"]
+@functools.lru_cache(maxsize=None)
+def pattern_bytes(pattern: Pattern) -> List[Union[bytes, None]]:
+    """bytes of pattern; None for wildcards"""
+    if isinstance(pattern, str):
+        tokens = pattern.split()
+        return [None if token in ("?", "??") else bytes.fromhex(token) for token in tokens]
+    return [bytes([byte]) for byte in pattern]
+
+
+# "0F F5 ?? EE" -> ("0F F5 ?? EE", b"\x0f\xf5", 0, 4, re.compile(b"\x0f\xf5.\xee"))
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern: Pattern) -> Tuple[Pattern, bytes, int, int, Union[re.Pattern, None]]:
+    """pattern, longest literal run (anchor), offset of anchor, length & regex (None if literal)"""
+    pattern_bytes_ = pattern_bytes(pattern)
+    assert len(pattern_bytes_) > 0, "empty pattern"
+    runs = list()  # [(offset, literal bytes)]
+    for i, byte in enumerate(pattern_bytes_):
+        if byte is None:
+            continue
+        elif len(runs) > 0 and runs[-1][0] + len(runs[-1][1]) == i:
+            runs[-1] = (runs[-1][0], runs[-1][1] + byte)
+        else:
+            runs.append((i, byte))
+    anchor_offset, anchor = max(runs, key=lambda run: len(run[1]), default=(0, b""))
+    if None not in pattern_bytes_:
+        return (pattern, anchor, anchor_offset, len(pattern_bytes_), None)
+    source = b"".join(b"." if byte is None else re.escape(byte) for byte in pattern_bytes_)
+    return (pattern, anchor, anchor_offset, len(pattern_bytes_), re.compile(source, re.DOTALL))
+
+
+def scan(data: bytes, patterns: Sequence[Pattern], start: int = 0, stop: int = None) -> Generator[Hit, None, None]:
+    """yields (offset, pattern) for each pattern starting in data[start:stop], in order of offset"""
+    # NOTE: data can be anything w/ .find (bytes, bytearray, mmap etc.)
+    # -- .find on each pattern's anchor is far faster than a combined regex
+    stop = len(data) if stop is None else min(stop, len(data))
+    hits = list()
+    for index, pattern in enumerate(patterns):
+        pattern, anchor, anchor_offset, length, regex = compile_pattern(pattern)
+        end = min(stop + length - 1, len(data))  # overlap w/ the next chunk
+        if anchor == b"":  # all wildcards
+            hits.extend((offset, index) for offset in range(start, min(stop, end - length + 1)))
+            continue
+        offset = data.find(anchor, start + anchor_offset, end)
+        while offset != -1 and offset - anchor_offset < stop:
+            hit = offset - anchor_offset
+            if regex is None or regex.match(data, hit, end) is not None:
+                hits.append((hit, index))
+            offset = data.find(anchor, offset + 1, end)
+    for offset, index in sorted(hits):
+        yield (offset, patterns[index])
+
+
+def scan_chunk(filepath: str, patterns: Sequence[Pattern], start: int, stop: int) -> List[Hit]:
+    """scan, but for process pool workers"""
+    with open(filepath, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return list(scan(data, patterns, start, stop))
+
+
+def scan_file(filepath: str, patterns: Sequence[Pattern], chunk_size: int = 2 ** 22,
+              workers: int = None) -> Generator[Hit, None, None]:
+    """scan a memory-mapped file in overlapping chunks; workers > 0 spreads chunks across processes"""
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return  # can't mmap an empty file
+    patterns = list(patterns)
+    starts = range(0, size, chunk_size)
+    stops = [min(start + chunk_size, size) for start in starts]
+    if workers is None:
+        with open(filepath, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, stop in zip(starts, stops):
+                yield from scan(data, patterns, start, stop)
+        return
+    # NOTE: each worker maps the file itself; only hits are sent back
+    with futures.ProcessPoolExecutor(workers) as pool:
+        chunks = pool.map(scan_chunk, itertools.repeat(filepath), itertools.repeat(patterns), starts, stops)
+        for hits in chunks:  # in order of offset
+            yield from hits
+
+
+def read_str(stream: io.BytesIO, encoding="utf-8", errors="strict", chunk_size=64) -> str:
+    """read until null byte; reads ahead & seeks back past the terminator"""
+    if not stream.seekable():
+        out = bytearray()
         c = stream.read(1)
-    return out.decode(encoding, errors)
+        while c != b"\x00":
+            assert c != b"", "unexpected EOF; no null terminator"
+            out += c
+            c = stream.read(1)
+        return out.decode(encoding, errors)
+    chunks = list()
+    while True:
+        chunk = stream.read(chunk_size)
+        assert chunk != b"", "unexpected EOF; no null terminator"
+        end = chunk.find(b"\x00")
+        if end != -1:
+            chunks.append(chunk[:end])
+            stream.seek(end + 1 - len(chunk), 1)  # rewind to after the terminator
+            return b"".join(chunks).decode(encoding, errors)
+        chunks.append(chunk)
+        chunk_size *= 2  # long string, read further ahead
+
+
+def read_strs(stream: io.BytesIO, count: int, encoding="utf-8", errors="strict", chunk_size=4096) -> List[str]:
+    """read_str, but for a table of count null-terminated strings"""
+    out = list()
+    tail = b""  # incomplete string at the end of the last chunk
+    while len(out) < count:
+        chunk = stream.read(chunk_size)
+        assert chunk != b"", f"unexpected EOF; got {len(out)} of {count} strings"
+        *strings, tail = (tail + chunk).split(b"\x00", count - len(out))
+        out.extend(string.decode(encoding, errors) for string in strings)
+    # NOTE: tail holds the unread remainder once we have count strings
+    stream.seek(-len(tail), 1)
+    return out
+
+
+def split_strings(buffer: bytes, encoding="utf-8", errors="strict") -> List[str]:
+    """bytes of null-terminated strings -> list of str"""
+    strings = bytes(buffer).split(b"\x00")
+    if strings[-1] == b"":  # trailing null terminator
+        strings.pop(-1)
+    return [string.decode(encoding, errors) for string in strings]
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_struct(format_: str) -> struct.Struct:
+    """cached struct.Struct; skips parsing format_ on every read"""
+    return struct.Struct(format_)
 
 
 def read_struct(stream: io.BytesIO, format_: str) -> Union[Any, List[Any]]:
-    out = struct.unpack(format_, stream.read(struct.calcsize(format_)))
+    record = compiled_struct(format_)
+    out = record.unpack(stream.read(record.size))
     return out[0] if len(out) == 1 else out
 
 
+def read_structs(stream: io.BytesIO, format_: str, count: int) -> List[Union[Any, List[Any]]]:
+    """read_struct, but for a table of count records"""
+    record = compiled_struct(format_)
+    raw_table = stream.read(record.size * count)
+    assert len(raw_table) == record.size * count, "unexpected EOF"
+    out = list(record.iter_unpack(raw_table))
+    if len(record.unpack(bytes(record.size))) == 1:
+        out = [x[0] for x in out]
+    return out
+
+
 def write_struct(stream: io.BytesIO, format_: str, *args):
     stream.write(struct.pack(format_, *args))
 
 
+readers: Dict[str, Tuple[Callable, int, bool]] = dict()
+# ^ {"format_": (struct.Struct.unpack_from, size, is_single)}
+# NOTE: filled by StructReader.read_struct
+
+
+class StructReader:
+    """buffered stream (or bytes) reader for parsers that read one field at a time"""
+    # NOTE: reads ahead; stream is only seeked to match .tell() when the outermost `with` exits
+    # -- don't touch stream while a StructReader is reading from it
+    buffer: bytes  # read ahead
+    offset: int  # position in buffer
+    start: int  # position of buffer[0] in stream
+    stream: io.BytesIO  # None if reading from bytes
+    chunk_size: int  # minimum read ahead
+    depth: int  # nested `with` blocks
+
+    def __init__(self, stream_or_bytes: Union[io.BytesIO, bytes], chunk_size: int = 1024):
+        if isinstance(stream_or_bytes, (bytes, bytearray, memoryview)):
+            self.stream = None
+            self.buffer = bytes(stream_or_bytes)
+            self.start = 0
+        else:
+            self.stream = stream_or_bytes
+            self.buffer = b""
+            self.start = self.stream.tell()
+        self.offset = 0
+        self.chunk_size = chunk_size
+        self.depth = 0
+
+    def __enter__(self) -> StructReader:
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            self.sync()
+
+    def __repr__(self) -> str:
+        source = "bytes" if self.stream is None else self.stream.__class__.__name__
+        descriptor = f"{source} @ {self.tell()} ({len(self.buffer) - self.offset} bytes buffered)"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    @classmethod
+    def of(cls, stream: Union[io.BytesIO, StructReader]) -> StructReader:
+        """parsers can share the caller's StructReader"""
+        return stream if isinstance(stream, cls) else cls(stream)
+
+    def fill(self, size: int) -> int:
+        """read ahead until size bytes are buffered; returns bytes available (less at EOF)"""
+        available = len(self.buffer) - self.offset
+        if available < size and self.stream is not None:
+            more = self.stream.read(max(size - available, self.chunk_size))
+            self.buffer = self.buffer[self.offset:] + more
+            self.start += self.offset
+            self.offset = 0
+            available = len(self.buffer)
+        return available
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:  # read everything
+            if self.stream is not None:
+                self.start += self.offset
+                self.buffer, self.offset = self.buffer[self.offset:] + self.stream.read(), 0
+            out = self.buffer[self.offset:]
+        elif self.stream is not None and size - (len(self.buffer) - self.offset) > self.chunk_size:
+            # large read, don't copy it into the read ahead
+            out = self.buffer[self.offset:] + self.stream.read(size - (len(self.buffer) - self.offset))
+            self.buffer, self.start, self.offset = b"", self.tell() + len(out), 0
+            return out
+        else:
+            self.fill(size)
+            out = self.buffer[self.offset:self.offset + size]
+        self.offset += len(out)
+        return out
+
+    def read_str(self, encoding="utf-8", errors="strict") -> str:
+        """binary.read_str; read until null byte"""
+        end = self.buffer.find(b"\x00", self.offset)
+        while end == -1:
+            searched = len(self.buffer) - self.offset
+            assert self.fill(searched + 1) > searched, "unexpected EOF; no null terminator"
+            end = self.buffer.find(b"\x00", self.offset + searched)
+        out = self.buffer[self.offset:end]
+        self.offset = end + 1
+        return out.decode(encoding, errors)
+
+    def read_struct(self, format_: str) -> Union[Any, List[Any]]:
+        """binary.read_struct; raises struct.error at EOF"""
+        if format_ not in readers:
+            record = compiled_struct(format_)
+            readers[format_] = (record.unpack_from, record.size, len(record.unpack(bytes(record.size))) == 1)
+        unpack_from, size, is_single = readers[format_]
+        offset = self.offset
+        if offset + size > len(self.buffer):
+            self.fill(size)
+            offset = self.offset
+        out = unpack_from(self.buffer, offset)
+        self.offset = offset + size
+        return out[0] if is_single else out
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 0:
+            position = offset
+        elif whence == 1:
+            position = self.tell() + offset
+        elif whence == 2:
+            if self.stream is None:
+                position = len(self.buffer) + offset
+            else:
+                self.stream.seek(offset, 2)
+                position = self.stream.tell()
+                self.buffer, self.start, self.offset = b"", position, 0
+        else:
+            raise ValueError(f"invalid whence ({whence}, should be 0, 1 or 2)")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        if self.stream is None or self.start <= position <= self.start + len(self.buffer):
+            self.offset = position - self.start
+        else:  # outside read ahead
+            self.stream.seek(position)
+            self.buffer, self.start, self.offset = b"", position, 0
+        return self.tell()
+
+    def skip(self, size: int):
+        """stream.seek(size, 1)"""
+        self.seek(size, 1)
+
+    def sync(self):
+        """seek stream to .tell() & drop read ahead"""
+        if self.stream is not None:
+            position = self.tell()
+            self.stream.seek(position)
+            self.buffer, self.start, self.offset = b"", position, 0
+
+    def tell(self) -> int:
+        return self.start + self.offset
+
+
 def xxd_stream(stream: io.BytesIO, start=0, limit=None, row=32, group=4) -> Generator[str, None, None]:
     """inline hex view"""
     # NOTE: start is just to make offset nice and readable; NO SEEKING!
@@ -1,14 +1,21 @@
 __all__ = [
-    "bitfield", "common", "mapped_array", "struct",
-    "BitField", "MappedArray", "Struct"]
+    "bitfield", "codec", "common", "mapped_array", "path_table", "struct", "struct_array", "struct_view",
+    "BitField", "MappedArray", "PathTable", "Struct", "StructArray", "StructView"]
 
 # modules
 from . import bitfield
+from . import codec
 from . import common
 from . import mapped_array
+from . import path_table
 from . import struct
+from . import struct_array
+from . import struct_view
 
 # classes
 from .bitfield import BitField
 from .mapped_array import MappedArray
+from .path_table import PathTable
 from .struct import Struct
+from .struct_array import StructArray
+from .struct_view import StructView
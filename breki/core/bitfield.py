@@ -1,14 +1,21 @@
 """Base classes for defining .bsp lump structs"""
 from __future__ import annotations
+import array
 import collections
 import enum
+import functools
 import itertools
 import io
 import struct
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 from . import common
 
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
 
 BitFieldMapping = Dict[str, int]
 # ^ {"a": 3, "b": 5}
@@ -16,6 +23,41 @@ BitFieldsDict = Dict[str, BitFieldMapping]
 # ^ {"a": {"flags": 10, "index": 6}}  # uint16_t
 # NOTE: BitFields must fill their provided format
 
+FieldLayout = Tuple[Tuple[str, int, int], ...]
+# ^ (("attr", shift, mask), ...)
+
+
+# (("a", 4), ("b", 12)), "H" -> (("a", 12, 0xF), ("b", 0, 0xFFF))
+@functools.lru_cache(maxsize=None)
+def field_layout(fields: Tuple[Tuple[str, int], ...], _format: str) -> FieldLayout:
+    """precomputed shifts & masks; highest bits first"""
+    if not (_format in [*"BHIQ"] and len(_format) == 1):  # pls no
+        raise NotImplementedError("Only unsigned single integer BitFields are supported")
+    offset = struct.calcsize(_format) * 8
+    if sum(size for attr, size in fields) != offset:
+        raise RuntimeError("fields do not fill format! add an 'unused' field!")
+    out = list()
+    for attr, size in fields:
+        offset -= size
+        out.append((attr, offset, (1 << size) - 1))
+    return tuple(out)
+
+
+# "H" -> "H"; "Q" -> "Q" (or "L")
+def typecode_of(_format: str) -> str:
+    """array.array typecode w/ the same size as _format"""
+    size = struct.calcsize(_format)
+    return [t for t in "BHILQ" if array.array(t).itemsize == size][0]
+
+
+def is_int_column(column: Sequence[int]) -> bool:
+    """numpy arrays by dtype, array.arrays by typecode, anything else by item"""
+    if np is not None and isinstance(column, np.ndarray):
+        return np.issubdtype(column.dtype, np.integer)
+    if isinstance(column, array.array):
+        return column.typecode in "bBhHiIlLqQ"
+    return all(isinstance(value, int) for value in column)
+
 
 class BitField:
     """Maps sub-integer data"""
@@ -91,17 +133,87 @@ class BitField:
         int_ = struct.unpack(cls._format, raw_bitfield)[0]
         return cls.from_int(int_)
 
+    @classmethod
+    def _from_values(cls, values: Iterable[int], _fields: collections.OrderedDict, _format: str,
+                     _classes: common.ClassesDict) -> BitField:
+        """skips validation; values must already be masked"""
+        # NOTE: only called when __init__ & __setattr__ aren't overridden
+        out = object.__new__(cls)
+        _set = object.__setattr__
+        _set(out, "_format", _format)
+        _set(out, "_fields", _fields)
+        _set(out, "_classes", _classes)
+        for attr, value in zip(_fields, values):
+            if attr in _classes:
+                value = _classes[attr](value)
+            _set(out, attr, value)
+        return out
+
+    @classmethod
+    def array_from_ints(cls, ints: Sequence[int], _fields=None, _format=None, _classes=None) -> List[BitField]:
+        """bulk .from_int; decodes one field at a time w/ .decode_array"""
+        out_fields = collections.OrderedDict(cls._fields if _fields is None else _fields)
+        out_format = cls._format if _format is None else _format
+        out_classes = cls._classes if _classes is None else _classes
+        columns = cls.decode_array(ints, out_fields, out_format)
+        rows = zip(*[column.tolist() for column in columns.values()])
+        if cls.__init__ is BitField.__init__ and cls.__setattr__ is BitField.__setattr__:
+            return [cls._from_values(row, out_fields, out_format, out_classes) for row in rows]
+        return [cls(*row, _fields=out_fields, _format=out_format, _classes=out_classes) for row in rows]
+
+    @classmethod
+    def decode_array(cls, ints: Sequence[int], _fields=None, _format=None) -> Dict[str, Sequence[int]]:
+        """packed ints -> {"field": column}; numpy arrays in, numpy arrays out"""
+        # NOTE: _classes are not applied, columns are always ints
+        _fields = cls._fields if _fields is None else _fields
+        _format = cls._format if _format is None else _format
+        layout = field_layout(tuple(_fields.items()), _format)
+        if np is not None and isinstance(ints, np.ndarray):
+            return {attr: (ints >> shift) & mask for attr, shift, mask in layout}
+        typecode = typecode_of(_format)
+        return {
+            attr: array.array(typecode, [(int_ >> shift) & mask for int_ in ints])
+            for attr, shift, mask in layout}
+
+    @classmethod
+    def encode_array(cls, columns: Dict[str, Sequence[int]], _fields=None, _format=None) -> Sequence[int]:
+        """{"field": column} -> packed ints; inverse of .decode_array"""
+        _fields = cls._fields if _fields is None else _fields
+        _format = cls._format if _format is None else _format
+        layout = field_layout(tuple(_fields.items()), _format)
+        assert set(columns) == set(_fields), "columns must match fields"
+        lengths = {len(column) for column in columns.values()}
+        assert len(lengths) == 1, "columns must be the same length"
+        for attr, shift, mask in layout:
+            column = columns[attr]
+            if not is_int_column(column):  # floats would be silently truncated
+                raise TypeError(f"{attr} must be a column of ints")
+            if len(column) == 0:
+                continue
+            if min(column) < 0:
+                raise NotImplementedError("Negative values in bitfields not yet supported")
+            if max(column) > mask:
+                raise OverflowError(f"{attr} is out of range! (max allowed value = {mask})")
+        if np is not None and any(isinstance(column, np.ndarray) for column in columns.values()):
+            out = np.zeros(lengths.pop(), dtype=f"u{struct.calcsize(_format)}")
+            for attr, shift, mask in layout:
+                out |= np.asarray(columns[attr]).astype(out.dtype) << out.dtype.type(shift)
+            return out
+        out = [0] * lengths.pop()
+        for attr, shift, mask in layout:
+            out = [int_ | (int(value) << shift) for int_, value in zip(out, columns[attr])]
+        return array.array(typecode_of(_format), out)
+
     @classmethod
     def from_int(cls, value: int, _fields=None, _format=None, _classes=None) -> BitField:
         out_fields = cls._fields if _fields is None else _fields
         out_format = cls._format if _format is None else _format
         out_classes = cls._classes if _classes is None else _classes
-        out_args = list()
-        offset = struct.calcsize(out_format) * 8
-        for size in out_fields.values():
-            offset -= size
-            mask = (2 ** size - 1) << offset
-            out_args.append((value & mask) >> offset)
+        layout = field_layout(tuple(out_fields.items()), out_format)
+        out_args = [(value >> shift) & mask for attr, shift, mask in layout]
+        if cls.__init__ is BitField.__init__ and cls.__setattr__ is BitField.__setattr__:
+            out_fields = collections.OrderedDict(out_fields)
+            return cls._from_values(out_args, out_fields, out_format, out_classes)
         return cls(*out_args, _format=out_format, _fields=out_fields, _classes=out_classes)
 
     @classmethod
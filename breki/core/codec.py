@@ -0,0 +1,300 @@
+"""Per-class convertors, generated once when a Struct / MappedArray is defined"""
+from __future__ import annotations
+import array
+import collections.abc
+import enum
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+from . import bitfield
+from . import common
+from . import mapped_array
+from . import path_table
+
+
+Field = Tuple[str, Any, int, int]
+# ^ ("attr", child_mapping, start, stop)
+# -- child_mapping: None (single value), int (list), list / dict (MappedArray)
+
+int_formats = "bBhHiI"
+# ^ Struct.as_tuple casts these back to int
+plain_types = (bool, bytes, float, int)
+# ^ types as_tuple can pass through untouched
+
+
+def fields_of(mapping: mapped_array.AttrMap) -> List[Field]:
+    """top-level attrs & the slice of the flat tuple each one covers"""
+    if isinstance(mapping, list):
+        return [(attr, None, i, i + 1) for i, attr in enumerate(mapping)]
+    out = list()
+    start = 0
+    for attr, child_mapping in mapping.items():
+        stop = start + mapped_array.mapping_length({None: child_mapping})
+        out.append((attr, child_mapping, start, stop))
+        start = stop
+    return out
+
+
+def attr_formats(mapping: mapped_array.AttrMap, _format: str) -> Dict[str, str]:
+    """{"attr": "sub_format"}"""
+    types = common.split_format(_format)
+    return {
+        attr: "".join(types[start:stop])
+        for attr, child_mapping, start, stop in fields_of(mapping)}
+
+
+def flatten(_tuple: List[Any], value: Any, types: Tuple[str] = None):
+    """extend _tuple w/ value, as it would be packed"""
+    flat = list()
+    if isinstance(value, mapped_array.MappedArray):
+        flat.extend(value.as_tuple())
+    elif isinstance(value, bitfield.BitField):
+        flat.append(value.as_int())
+    elif isinstance(value, str):
+        flat.append(value.encode("ascii", errors="ignore"))
+    elif isinstance(value, bytes):
+        flat.append(value)
+    elif isinstance(value, (enum.Enum, enum.IntFlag)):  # enum _classes -> int
+        flat.append(value.value)
+    elif isinstance(value, Iterable):  # includes _classes
+        flat.extend(value)
+    else:
+        flat.append(value)
+    if types is None:  # MappedArray
+        _tuple.extend(flat)
+    else:  # Struct
+        _tuple.extend(
+            int(x) if format_ in int_formats else x
+            for x, format_ in zip(flat, types))
+
+
+class Codec:
+    """precompiled struct.Struct & generated from_tuple / as_tuple"""
+    attr_formats: Dict[str, str]
+    bitfields: List[Tuple[int, Dict[str, Any]]]
+    # ^ [(index, BitField.array_from_ints kwargs)]
+    cache_tuples: bool  # Struct w/ only immutable attrs; keeps unpacked _tuple until modified
+    children: Dict[str, Dict[str, Any]]
+    # ^ {"attr": MappedArray.from_tuple kwargs}
+    defaults: List[Any]  # default _tuple
+    fields: List[Field]
+    struct: struct.Struct
+    types: Tuple[str]
+    # generated
+    from_tuple: Callable[[type, Iterable], Any]
+    as_tuple: Callable[[Any], Iterable]
+
+    def __init__(self, cls: type, base: type, mapping: mapped_array.AttrMap, is_struct: bool):
+        self.struct = struct.Struct(cls._format)
+        self.types = common.split_format(cls._format)
+        self.fields = fields_of(mapping)
+        length = self.fields[-1][3] if len(self.fields) > 0 else 0
+        if length != len(self.types) or length != len(self.struct.unpack(bytes(self.struct.size))):
+            raise ValueError(f"{cls.__name__} mappings do not match _format")
+        self.attr_formats = attr_formats(mapping, cls._format)
+        self.children = {
+            attr: dict(
+                _mapping=child_mapping,
+                _format=self.attr_formats[attr],
+                _classes=common.subgroup(cls._classes, attr),
+                _bitfields=common.subgroup(cls._bitfields, attr))
+            for attr, child_mapping, start, stop in self.fields
+            if isinstance(child_mapping, (list, dict))}
+        self.bitfields = [
+            (start, dict(
+                _fields=cls._bitfields[attr],
+                _format=self.attr_formats[attr],
+                _classes=common.subgroup(cls._classes, attr)))
+            for attr, child_mapping, start, stop in self.fields
+            if attr in cls._bitfields and child_mapping is None]
+        self.cache_tuples = is_struct and len(cls._bitfields) == 0 and all(
+            child_mapping is None or isinstance(child_mapping, int)
+            for attr, child_mapping, start, stop in self.fields) and all(
+            isinstance(class_, type) and issubclass(class_, enum.Enum)
+            for class_ in cls._classes.values())
+        self.defaults = [
+            common.type_defaults[t] if not t.endswith("s") else ""
+            for t in self.types]
+        self.from_tuple = self.generate_from_tuple(cls, base, is_struct)
+        self.as_tuple = self.generate_as_tuple(is_struct)
+
+    def __repr__(self) -> str:
+        descriptor = f'"{self.struct.format}" ({len(self.fields)} attrs)'
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def from_tuples(self, cls: type, _tuples: Iterable[Tuple]) -> List[Any]:
+        """bulk from_tuple; top-level BitFields are decoded a column at a time"""
+        if len(self.bitfields) == 0:
+            from_tuple = self.from_tuple
+            return [from_tuple(cls, _tuple) for _tuple in _tuples]
+        _tuples = [list(_tuple) for _tuple in _tuples]
+        for index, kwargs in self.bitfields:
+            column = bitfield.BitField.array_from_ints(
+                array.array("Q", [_tuple[index] for _tuple in _tuples]), **kwargs)
+            for _tuple, value in zip(_tuples, column):
+                _tuple[index] = value
+        from_tuple = self.from_tuple
+        return [from_tuple(cls, tuple(_tuple)) for _tuple in _tuples]
+
+    def generate_from_tuple(self, cls: type, base: type, is_struct: bool) -> Callable:
+        # NOTE: bypasses __init__, unless the subclass overrides __init__ or __setattr__
+        use_init = cls.__init__ is not base.__init__ or cls.__setattr__ not in (base.__setattr__, object.__setattr__)
+        namespace = {"_new": object.__new__, "_set": object.__setattr__, "_setattr": setattr, "_tuple_type": tuple}
+        lines = ["def from_tuple(cls, _tuple):"]
+        if not is_struct:
+            lines.append(f"    assert len(_tuple) == {len(self.types)}, f'{{cls.__name__}}({{_tuple}})'")
+        args = list()
+        for i, (attr, child_mapping, start, stop) in enumerate(self.fields):
+            if child_mapping is None:
+                value = f"_tuple[{start}]"
+            elif isinstance(child_mapping, int):
+                value = f"_tuple[{start}:{stop}]" if is_struct else f"list(_tuple[{start}:{stop}])"
+            else:  # list / dict
+                child_class = mapped_array.MappedArray.specialise(**self.children[attr])
+                namespace[f"_child_{i}"] = child_class.from_tuple
+                value = f"_child_{i}(_tuple[{start}:{stop}])"
+            args.append(value)
+        if use_init:
+            lines.append(f"    return cls({', '.join(args)})")
+        else:
+            lines.append("    out = _new(cls)")
+            for (attr, child_mapping, start, stop), value in zip(self.fields, args):
+                if attr in cls._classes or attr in cls._bitfields:
+                    lines.append(f"    _setattr(out, {attr!r}, {value})")
+                else:
+                    lines.append(f"    _set(out, {attr!r}, {value})")
+            if self.cache_tuples:  # NOTE: Struct.__setattr__ clears this
+                lines.append("    if _tuple.__class__ is _tuple_type:")
+                lines.append("        _set(out, '_unpacked', _tuple)")
+            lines.append("    return out")
+        exec("\n".join(lines), namespace)
+        return namespace["from_tuple"]
+
+    def generate_as_tuple(self, is_struct: bool) -> Callable:
+        namespace = {"_flatten": flatten, "_plain": frozenset(plain_types), "_int": int}
+        lines = [
+            "def as_tuple(self):",
+            "    _tuple = list()",
+            "    _append = _tuple.append"]
+        for attr, child_mapping, start, stop in self.fields:
+            types = self.types[start:stop] if is_struct else None
+            if attr.isidentifier():
+                lines.append(f"    value = self.{attr}")
+            else:
+                lines.append(f"    value = getattr(self, {attr!r})")
+            if child_mapping is None:
+                plain = "_int" if is_struct and self.types[start] in int_formats else "_plain"
+                check = "is" if plain == "_int" else "in"
+                lines.append(f"    if value.__class__ {check} {plain}:")
+                lines.append("        _append(value)")
+                lines.append("    else:")
+                lines.append(f"        _flatten(_tuple, value, {types!r})")
+            else:
+                lines.append(f"    _flatten(_tuple, value, {types!r})")
+        lines.append("    return _tuple" if is_struct else "    return tuple(_tuple)")
+        exec("\n".join(lines), namespace)
+        return namespace["as_tuple"]
+
+
+class LazyArray(collections.abc.Sequence):
+    """tightly packed table of records, decoded on access"""
+    raw: bytes
+    record_size: int
+    _from_tuple: Callable[[Iterable], Any]
+    _struct: struct.Struct
+
+    def __init__(self, raw: bytes, _struct: struct.Struct, from_tuple: Callable[[Iterable], Any]):
+        assert len(raw) % _struct.size == 0, f"{len(raw)} bytes is not a whole number of records"
+        self.raw = raw
+        self.record_size = _struct.size
+        self._from_tuple = from_tuple
+        self._struct = _struct
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("LazyArray index out of range")
+        return self._from_tuple(self._struct.unpack_from(self.raw, index * self.record_size))
+
+    def __len__(self) -> int:
+        return len(self.raw) // self.record_size
+
+    def __repr__(self) -> str:
+        descriptor = f"{len(self)} records ({self.record_size} bytes each)"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+
+class LazyMapping(collections.abc.Mapping):
+    """{key: record} over a LazyArray, each record is decoded on first access"""
+    records: LazyArray
+    indices: Dict[Any, int]  # or any other mapping
+    decoded: Dict[Any, Any]
+    # ^ {key: record}, so records are only decoded once (& edits stick)
+
+    def __init__(self, keys: Union[Iterable[Any], Dict[Any, int]], records: LazyArray):
+        self.records = records
+        if isinstance(keys, collections.abc.Mapping):  # {key: index}, can be shared w/ another LazyMapping
+            self.indices = keys
+        else:
+            self.indices = dict(zip(keys, range(len(records))))
+        self.decoded = dict()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.indices
+
+    def __getitem__(self, key: Any) -> Any:
+        if key not in self.decoded:
+            self.decoded[key] = self.records[self.indices[key]]
+        return self.decoded[key]
+
+    def __iter__(self):
+        return iter(self.indices)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __repr__(self) -> str:
+        descriptor = f"{len(self.decoded)}/{len(self)} records decoded"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+
+class RecordIndex(int):
+    """index into LazyPathTable.records, for a record that hasn't been decoded yet"""
+    __slots__ = ()
+
+
+class LazyPathTable(path_table.PathTable):
+    """PathTable over a LazyArray, each record is decoded on first access"""
+    # NOTE: a full PathTable; decoded records (& any edits) replace their RecordIndex
+    records: LazyArray  # or any other sequence
+
+    def __init__(self, paths: Iterable[str], records: LazyArray):
+        self.records = records
+        super().__init__(zip(paths, map(RecordIndex, range(len(records)))))
+
+    def __getitem__(self, path: str) -> Any:
+        value = super().__getitem__(path)
+        if value.__class__ is RecordIndex:
+            value = self.records[value]
+            folder, name = path_table.split(path)
+            self.folders[folder][name] = value
+        return value
+
+    def parallel_table(self, values: Sequence[Any]) -> path_table.PathTable:
+        """PathTable w/ the same paths, mapped to values[record index]; w/o splitting every path again"""
+        # NOTE: only for freshly loaded tables, decoded & new paths no longer have a record index
+        out = path_table.PathTable()
+        out.folders = {
+            folder: {name: values[index] for name, index in files.items()}
+            for folder, files in self.folders.items()}
+        out.subfolders = {folder: set(subfolders) for folder, subfolders in self.subfolders.items()}
+        out.num_entries = self.num_entries
+        return out
+
+    def __repr__(self) -> str:
+        descriptor = f"{self.num_entries} paths in {len(self.folders)} folders, {len(self.records)} records"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
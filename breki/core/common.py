@@ -1,4 +1,6 @@
+import functools
 import re
+import struct
 from typing import Any, Dict, Iterable, Tuple
 
 
@@ -35,6 +37,7 @@ def school(parent: Any, child_name: str, child_value: Any) -> Any:
 
 
 # "hI3f16s" -> ("h", "I", "f", "f", "f", "16s")
+@functools.lru_cache(maxsize=None)
 def split_format(_format: str) -> Tuple[str]:
     """split a struct format string to zip with tuple"""
     # NOTE: strings returned as f"{count}s" (untouched)
@@ -55,6 +58,21 @@ def split_format(_format: str) -> Tuple[str]:
     return tuple(out)
 
 
+# "<BQ" -> (0, 1); "BQ" -> (0, 8); "<B3xI" -> (0, 4)
+@functools.lru_cache(maxsize=None)
+def leaf_offsets(_format: str) -> Tuple[int]:
+    """offset of each value struct.unpack(_format) returns, w/ native alignment"""
+    # NOTE: pad bytes ("x") are skipped, they don't unpack to a value
+    _format = _format.replace(" ", "")
+    prefix = _format[0] if _format != "" and _format[0] in "@=<>!" else "@"
+    types = split_format(_format)
+    # NOTE: native alignment depends on the preceding fields
+    return tuple(
+        struct.calcsize(prefix + "".join(types[:i + 1])) - struct.calcsize(prefix + format_)
+        for i, format_ in enumerate(types)
+        if format_ != "x")
+
+
 # ({'attr.sub': ...}, 'attr') -> {'sub': ...}
 def subgroup(mapping: Dict[str, Any], group_name: str) -> Dict[str, Any]:
     """get subset of mapping under group_name"""
@@ -1,10 +1,14 @@
 """Base classes for defining .bsp lump structs"""
 from __future__ import annotations
+import collections
 import enum
+import io
 import struct
-from typing import Any, Dict, Iterable, List, Union
+import weakref
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Sequence, Tuple, Union
 
 from . import bitfield
+from . import codec
 from . import common
 
 
@@ -39,19 +43,69 @@ def mapping_length(mapping: AttrMap) -> int:  # MappedArray._mapping focused
     return length
 
 
+Spec = Tuple[type, Hashable, str, Hashable, Hashable]
+# ^ (origin, _mapping, _format, _bitfields, _classes)
+specialised_classes: Dict[Spec, type] = weakref.WeakValueDictionary()
+# ^ {spec: GeneratedClass}, for as long as anything (instances, codecs, recent_classes) uses GeneratedClass
+# NOTE: a spec always maps to the same class while it's alive, so isinstance checks hold
+recent_classes: Dict[Spec, type] = collections.OrderedDict()
+# ^ {spec: GeneratedClass}, least recently used first; keeps classes alive between uses
+max_specialised = 1024  # least recently used specs past this are only kept alive by their users
+compact_classes: Dict[type, weakref.ref] = weakref.WeakKeyDictionary()
+# ^ {SubclassWithEmptySlots: weakref.ref(GeneratedClass)}
+# NOTE: all filled in by MappedArray.specialise
+
+
+def remember(spec: Spec, specialised_class: type):
+    """mark spec as the most recently used; forgets the least recently used past max_specialised"""
+    try:
+        recent_classes.move_to_end(spec)
+    except KeyError:
+        recent_classes[spec] = specialised_class
+        while len(recent_classes) > max_specialised:
+            recent_classes.popitem(last=False)
+
+
+# {"a": [*"xy"]} -> ("dict", (("a", ("list", ("x", "y"))),))
+def freeze(spec: Any) -> Hashable:
+    """nested dicts & lists -> hashable key"""
+    if isinstance(spec, dict):
+        return ("dict", tuple((key, freeze(value)) for key, value in spec.items()))
+    elif isinstance(spec, list):
+        return ("list", tuple(freeze(value) for value in spec))
+    return spec
+
+
 class MappedArray:
     """Maps a given iterable to a series of names, can even be a nested mapping"""
+    __slots__ = ()  # filled in by MappedArray.specialise
+    # NOTE: subclasses w/o __slots__ still get a __dict__ (& keep working as before)
     _mapping: AttrMap = list()
     _format: str = ""  # struct format string
-    _attr_formats: Dict[str, str] = dict()  # generated by __init__
+    _attr_formats: Dict[str, str] = dict()  # generated by __init_subclass__
     _bitfields: bitfield.BitFieldsDict = dict()
     _classes: common.ClassesDict = dict()
+    _codec: codec.Codec = None  # generated by __init_subclass__
+    # NOTE: None if _format doesn't match the mapping; falls back to the slow path
+    _converted: FrozenSet[str] = frozenset()  # attrs __setattr__ passes to _classes / _bitfields
+    _origin: type = None  # class MappedArray.specialise generated this subclass from
+
+    def __init_subclass__(cls, **kwargs):
+        """compile a Codec for this subclass"""
+        super().__init_subclass__(**kwargs)
+        cls._attr_formats = codec.attr_formats(cls._mapping, cls._format)
+        cls._converted = frozenset({*cls._classes, *cls._bitfields})
+        try:
+            cls._codec = codec.Codec(cls, MappedArray, cls._mapping, is_struct=False)
+        except (ValueError, struct.error):
+            cls._codec = None
+
+    def __new__(cls, *args, _mapping=None, _format=None, _bitfields=None, _classes=None, **kwargs):
+        # NOTE: __init__ still gets called, since the specialised class is a subclass of cls
+        return super().__new__(cls.specialise(_mapping, _format, _bitfields, _classes))
 
     def __init__(self, *args, _mapping=None, _format=None, _bitfields=None, _classes=None, **kwargs):
-        self._mapping = self._mapping if _mapping is None else _mapping
-        self._format = self._format if _format is None else _format
-        self._bitfields = self._bitfields if _bitfields is None else _bitfields
-        self._classes = self._classes if _classes is None else _classes
+        # NOTE: __new__ has already baked _mapping, _format, _bitfields & _classes into self.__class__
         assert len(args) <= len(self._mapping), "Too many arguments! Should match top level attributes!"
         invalid_kwargs = set(kwargs).difference(set(self._mapping))
         # TODO: could branch here and check for subattr kwargs
@@ -64,42 +118,34 @@ class MappedArray:
         # NOTE: could also skip generating defaults if arg + kwargs defines the whole struct
         # -- however that's probably more work to detect than could be saved so \_(0.0)_/
         else:
-            # NOTE: _defaults is a classmethod, so we MUST override
-            default_values = self._defaults(_mapping=self._mapping, _format=self._format)
+            default_values = self._defaults()
         default_values.update(dict(zip(self._mapping, args)))
         default_values.update(kwargs)
         # TODO: set subattr_values
-        types = common.split_format(self._format)
-        types_index = 0
-        if isinstance(_mapping, list):
-            self._attr_formats = dict(zip(_mapping, types))
+        if isinstance(self._mapping, list):
             for attr, value in default_values.items():
                 setattr(self, attr, value)
             return
-        self._attr_formats = dict()  # must be unique
         for attr, value in default_values.items():
             # child contructor metadata
-            if isinstance(self._mapping, dict):
-                sub_mapping = self._mapping[attr]
-            else:
-                sub_mapping = None
-            length = mapping_length({None: sub_mapping})
-            self._attr_formats[attr] = "".join(types[types_index:types_index + length])
-            types_index += length
+            sub_mapping = self._mapping[attr]
+            sub_format = self._attr_formats[attr]
             sub_classes = common.subgroup(self._classes, attr)
             sub_bitfields = common.subgroup(self._bitfields, attr)
             if isinstance(value, MappedArray):
                 assert isinstance(sub_mapping, (list, dict)), f"Invalid sub_mapping for {attr}: {sub_mapping}"
                 assert value._mapping == sub_mapping
-                value._classes = sub_classes
-                value._bitfields = sub_bitfields
+                if value._classes != sub_classes or value._bitfields != sub_bitfields:
+                    # NOTE: spec is class-level, so we have to rebuild w/ the parent's spec
+                    value = MappedArray.from_tuple(
+                        value.as_tuple(), _mapping=sub_mapping, _format=value._format,
+                        _classes=sub_classes, _bitfields=sub_bitfields)
                 setattr(self, attr, value)
             # TODO: List[MappedArray]
             elif isinstance(sub_mapping, int):
                 assert len(value) == sub_mapping
                 setattr(self, attr, value)
             elif isinstance(sub_mapping, (list, dict)):  # create MappedArray
-                sub_format = self._attr_formats[attr]
                 sub_kwargs = dict(_mapping=sub_mapping, _format=sub_format, _classes=sub_classes, _bitfields=sub_bitfields)
                 setattr(self, attr, MappedArray.from_tuple(value, **sub_kwargs))
             elif sub_mapping is None:
@@ -124,6 +170,15 @@ class MappedArray:
     def __len__(self) -> int:
         return len(self._mapping)
 
+    def __reduce_ex__(self, protocol):
+        # NOTE: generated classes share their origin's __qualname__, so pickle can't find them by name
+        # -- rebuild from the origin & the spec instead
+        cls = self.__class__
+        if cls._origin is None:
+            return super().__reduce_ex__(protocol)
+        args = (tuple(self.as_tuple()), cls._mapping, cls._format, cls._bitfields, cls._classes)
+        return (cls._origin.from_tuple, args, getattr(self, "__dict__", None) or None)
+
     def __repr__(self) -> str:
         attrs = [f"{attr}: {value!r}" for attr, value in zip(self._mapping, self)]
         return f"<{self.__class__.__name__} ({', '.join(attrs)})>"
@@ -131,90 +186,165 @@ class MappedArray:
     def __setattr__(self, attr, value):
         # NOTE: private variables must pass through untouched!
         # NOTE: bitfield & class should be mutually exclusive, so order doesn't matter
-        value = common.school(self, attr, value)
-        # TODO: enforce BitField spec (_fields, _format, _classes)
-        if attr in self._bitfields and not isinstance(value, bitfield.BitField):
-            child_format = self._attr_formats[attr]
-            value = bitfield.BitField.from_int(
-                value,
-                _fields=self._bitfields[attr],
-                _format=child_format,
-                _classes=common.subgroup(self._classes, attr))
+        if attr in self._converted:
+            value = common.school(self, attr, value)
+            # TODO: enforce BitField spec (_fields, _format, _classes)
+            if attr in self._bitfields and not isinstance(value, bitfield.BitField):
+                child_format = self._attr_formats[attr]
+                value = bitfield.BitField.from_int(
+                    value,
+                    _fields=self._bitfields[attr],
+                    _format=child_format,
+                    _classes=common.subgroup(self._classes, attr))
         # TODO: enforce child MappedArray spec
         super().__setattr__(attr, value)
 
     @classmethod
     def _defaults(cls, _mapping: AttrMap = None, _format: str = None) -> Dict[str, Any]:
-        _format = cls._format if _format is None else _format
-        _mapping = cls._mapping if _mapping is None else _mapping
-        types = common.split_format(_format)
-        assert mapping_length(_mapping) == len(types), "Invalid mapping for format!"
+        cls = cls.specialise(_mapping, _format)
+        types = common.split_format(cls._format)
+        assert mapping_length(cls._mapping) == len(types), "Invalid mapping for format!"
         # TODO: allow default strings (requires a type_defaults function (see below))
         # -- pass down type_defaults _string_mode (warn / trim / fail) ?
-        defaults = cls.from_tuple([
-            common.type_defaults[t] if not t.endswith("s") else ""
-            for t in types],
-            _mapping=_mapping, _format=_format)
-        return dict(zip(list(_mapping), defaults))
+        if cls._codec is not None:
+            defaults = cls.from_tuple(cls._codec.defaults)
+        else:
+            defaults = cls.from_tuple([
+                common.type_defaults[t] if not t.endswith("s") else ""
+                for t in types])
+        return dict(zip(list(cls._mapping), defaults))
+
+    @classmethod
+    def specialise(cls, _mapping=None, _format=None, _bitfields=None, _classes=None) -> type:
+        """cached subclass w/ __slots__ & the given spec as class-level metadata"""
+        global compact_classes, recent_classes, specialised_classes  # noqa: F824
+        if _mapping is None and _format is None and _bitfields is None and _classes is None:
+            # NOTE: a __dictoffset__ of 0 means instances have no __dict__
+            if cls._origin is not None or cls.__dictoffset__ != 0:
+                return cls  # already specialised
+            compact_class = compact_classes.get(cls, lambda: None)()
+            if compact_class is not None:
+                return compact_class
+        origin = cls if cls._origin is None else cls._origin
+        _mapping = cls._mapping if _mapping is None else _mapping
+        _format = cls._format if _format is None else _format
+        _bitfields = cls._bitfields if _bitfields is None else _bitfields
+        _classes = cls._classes if _classes is None else _classes
+        spec = (origin, freeze(_mapping), _format, freeze(_bitfields), freeze(_classes))
+        out = specialised_classes.get(spec, None)
+        if out is not None:
+            remember(spec, out)
+            return out
+        origin_spec = (origin, freeze(origin._mapping), origin._format, freeze(origin._bitfields), freeze(origin._classes))
+        if spec == origin_spec and origin.__dictoffset__ != 0:
+            specialised_classes[spec] = origin  # subclass w/o __slots__
+            return origin
+        inherited = {slot for base in origin.__mro__ for slot in getattr(base, "__slots__", ())}
+        __slots__ = [attr for attr in dict.fromkeys(_mapping) if attr.isidentifier() and attr not in inherited]
+        if origin is MappedArray or not all(attr.isidentifier() for attr in _mapping) and origin.__dictoffset__ == 0:
+            __slots__.append("__dict__")  # ad-hoc instances can hold extra attrs (& setattr fallback)
+        namespace = dict(
+            __slots__=__slots__,
+            __module__=origin.__module__,
+            __qualname__=origin.__qualname__,
+            __doc__=origin.__doc__,
+            _mapping=_mapping, _format=_format, _bitfields=_bitfields, _classes=_classes,
+            _origin=origin)
+        if len(_classes) == 0 and len(_bitfields) == 0 and origin.__setattr__ is MappedArray.__setattr__:
+            namespace["__setattr__"] = object.__setattr__  # nothing to convert
+        out = type(origin.__name__, (origin,), namespace)
+        specialised_classes[spec] = out
+        remember(spec, out)
+        if spec == origin_spec:
+            compact_classes[origin] = weakref.ref(out)
+        return out
 
     # convertors
+    @classmethod
+    def array_from_bytes(cls, raw_array: bytes, lazy: bool = False, _mapping=None, _format=None,
+                         _bitfields=None, _classes=None) -> Sequence[MappedArray]:
+        """bulk .from_bytes for a tightly packed table"""
+        cls = cls.specialise(_mapping, _format, _bitfields, _classes)
+        _struct = cls._codec.struct if cls._codec is not None else struct.Struct(cls._format)
+        assert len(raw_array) % _struct.size == 0, f"{len(raw_array)} bytes is not a whole number of {cls.__name__}"
+        if lazy:
+            return codec.LazyArray(raw_array, _struct, cls.from_tuple)
+        if cls._codec is not None:
+            return cls._codec.from_tuples(cls, _struct.iter_unpack(raw_array))
+        from_tuple = cls.from_tuple
+        return [from_tuple(_tuple) for _tuple in _struct.iter_unpack(raw_array)]
+
     @classmethod
     def from_bytes(cls, _bytes: bytes, _mapping=None, _format=None,
                    _bitfields=None, _classes=None) -> MappedArray:
-        _format = cls._format if _format is None else _format
-        _mapping = cls._mapping if _mapping is None else _mapping
-        _classes = cls._classes if _classes is None else _classes
-        _bitfields = cls._bitfields if _bitfields is None else _bitfields
-        assert len(_bytes) == struct.calcsize(_format)
-        _tuple = struct.unpack(_format, _bytes)
-        assert len(_tuple) == mapping_length(_mapping), f"{_tuple}"
-        return cls.from_tuple(_tuple, _mapping=_mapping, _format=_format, _bitfields=_bitfields, _classes=_classes)
+        cls = cls.specialise(_mapping, _format, _bitfields, _classes)
+        if cls._codec is not None:
+            assert len(_bytes) == cls._codec.struct.size
+            return cls._codec.from_tuple(cls, cls._codec.struct.unpack(_bytes))
+        assert len(_bytes) == struct.calcsize(cls._format)
+        _tuple = struct.unpack(cls._format, _bytes)
+        assert len(_tuple) == mapping_length(cls._mapping), f"{_tuple}"
+        return cls.from_tuple(_tuple)
 
     @classmethod
     def from_stream(cls, stream, _mapping=None, _format=None, _bitfields=None, _classes=None) -> MappedArray:
-        kwargs = dict(_mapping=_mapping, _format=_format, _bitfields=_bitfields, _classes=_classes)
-        return cls.from_bytes(stream.read(struct.calcsize(cls._format)), **kwargs)
+        cls = cls.specialise(_mapping, _format, _bitfields, _classes)
+        if cls._codec is not None:
+            return cls.from_bytes(stream.read(cls._codec.struct.size))
+        return cls.from_bytes(stream.read(struct.calcsize(cls._format)))
+
+    @classmethod
+    def from_stream_many(cls, stream: io.BytesIO, count: int, lazy: bool = False, _mapping=None, _format=None,
+                         _bitfields=None, _classes=None) -> Sequence[MappedArray]:
+        """read count records w/ a single .read()"""
+        cls = cls.specialise(_mapping, _format, _bitfields, _classes)
+        length = count * struct.calcsize(cls._format)
+        raw_array = stream.read(length)
+        assert len(raw_array) == length, f"unexpected EOF; expected {length} bytes, got {len(raw_array)}"
+        return cls.array_from_bytes(raw_array, lazy)
 
     @classmethod
     def from_tuple(cls, array, _mapping=None, _format=None, _bitfields=None, _classes=None) -> MappedArray:
-        _format = cls._format if _format is None else _format
-        _mapping = cls._mapping if _mapping is None else _mapping
-        _classes = cls._classes if _classes is None else _classes
-        _bitfields = cls._bitfields if _bitfields is None else _bitfields
-        assert len(array) == mapping_length({None: _mapping}), f"{cls.__name__}({array}, _mapping={_mapping})"
-        out_args = list()
-        if not isinstance(_mapping, (dict, list, int)):
+        if isinstance(_mapping, int):
+            # TODO: List[MappedArray]
+            return list(array)  # LAZY HACK?
+        elif _mapping is not None and not isinstance(_mapping, (dict, list)):
             raise RuntimeError(f"Unexpected mapping: {type(_mapping)}")
-        elif isinstance(_mapping, dict):
-            types = common.split_format(_format)
+        cls = cls.specialise(_mapping, _format, _bitfields, _classes)
+        if cls._codec is not None:
+            return cls._codec.from_tuple(cls, array)
+        assert len(array) == mapping_length({None: cls._mapping}), f"{cls.__name__}({array}, _mapping={cls._mapping})"
+        out_args = list()
+        if isinstance(cls._mapping, dict):
+            types = common.split_format(cls._format)
             array_index = 0
-            for child_mapping in _mapping.values():
+            for attr, child_mapping in cls._mapping.items():
                 if child_mapping is not None:  # __init__ might make this redundant
                     length = mapping_length({None: child_mapping})
                     segment = array[array_index:array_index + length]
                     child_format = "".join(types[array_index:array_index + length])
-                    array_index += mapping_length({None: child_mapping})
-                    child = MappedArray.from_tuple(segment, _mapping=child_mapping, _format=child_format)
-                    # NOTE: _classes & _bitfields will be passed down in __init__
+                    array_index += length
+                    child = MappedArray.from_tuple(
+                        segment, _mapping=child_mapping, _format=child_format,
+                        _classes=common.subgroup(cls._classes, attr),
+                        _bitfields=common.subgroup(cls._bitfields, attr))
                 else:  # if {"attr": None}
                     child = array[array_index]  # take a single item, not a slice
                     array_index += 1
                 out_args.append(child)
-        elif isinstance(_mapping, list):  # List[str]
+        else:  # List[str]
             out_args = array
-        # create MappedArray / List
-        if not isinstance(_mapping, int):
-            out = cls(*out_args, _mapping=_mapping, _format=_format, _bitfields=_bitfields, _classes=_classes)
-        # TODO: List[MappedArray]
-        else:
-            out = list(array)  # LAZY HACK?
-        return out
+        return cls(*out_args)
 
     def as_bytes(self) -> bytes:
+        if self._codec is not None:
+            return self._codec.struct.pack(*self._codec.as_tuple(self))
         return struct.pack(self._format, *self.as_tuple())
 
     def as_tuple(self) -> tuple:
         """recreates the array this instance was generated from"""
+        if self._codec is not None:
+            return self._codec.as_tuple(self)
         _tuple = list()
         for attr in self._mapping:
             value = getattr(self, attr)
@@ -0,0 +1,148 @@
+"""Compact {path: value} mapping; each folder is stored once, not once per file"""
+from __future__ import annotations
+import collections.abc
+import itertools
+import sys
+from typing import Any, Dict, Generator, Iterable, List, Set, Tuple
+
+
+def split(path: str) -> Tuple[str, str]:
+    """"folder/subfolder/filename.ext" -> ("folder/subfolder", "filename.ext")"""
+    folder, slash, name = path.rpartition("/")
+    return folder, name
+
+
+class PathTable(collections.abc.MutableMapping):
+    """{"folder/filename.ext": value}, w/ each folder stored once"""
+    # NOTE: folders are interned (sys.intern), so tables share them
+    # -- filenames aren't, they're mostly unique & interning has a per-string cost
+    # -- full paths are only built while iterating
+    folders: Dict[str, Dict[str, Any]]
+    # ^ {"folder": {"filename.ext": value}}, "" is the root folder
+    subfolders: Dict[str, Set[str]]
+    # ^ {"folder": {"folder/subfolder"}}
+    num_entries: int
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]] = tuple()):
+        self.folders = {"": dict()}
+        self.subfolders = {"": set()}
+        self.num_entries = 0
+        self.update(entries)
+
+    def __contains__(self, path: str) -> bool:
+        folder, name = split(path)
+        return name in self.folders.get(folder, ())
+
+    def __delitem__(self, path: str):
+        folder, name = split(path)
+        try:
+            del self.folders[folder][name]
+        except KeyError:
+            raise KeyError(path)
+        self.num_entries -= 1
+        self.prune(folder)
+
+    def __getitem__(self, path: str) -> Any:
+        folder, name = split(path)
+        try:
+            return self.folders[folder][name]
+        except KeyError:
+            raise KeyError(path)
+
+    def __iter__(self) -> Generator[str, None, None]:
+        for folder, files in self.folders.items():
+            prefix = f"{folder}/" if folder != "" else ""
+            for name in files:
+                yield f"{prefix}{name}"
+
+    def __len__(self) -> int:
+        return self.num_entries
+
+    def __repr__(self) -> str:
+        descriptor = f"{self.num_entries} paths in {len(self.folders)} folders"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def __setitem__(self, path: str, value: Any):
+        self.insert(*split(path), value)
+
+    def add_folder(self, folder: str) -> Dict[str, Any]:
+        """{"filename.ext": value} for folder, & any missing parents"""
+        files = self.folders.get(folder)
+        if files is None:
+            folder = sys.intern(folder)
+            files = self.folders[folder] = dict()
+            self.subfolders[folder] = set()
+            parent, name = split(folder)
+            self.add_folder(parent)
+            self.subfolders[parent].add(folder)
+        return files
+
+    def insert(self, folder: str, name: str, value: Any):
+        """set w/o joining & splitting the path (for parsers)"""
+        files = self.add_folder(folder)
+        if name not in files:
+            self.num_entries += 1
+        files[name] = value
+
+    def is_dir(self, folder: str) -> bool:
+        return folder.strip("/") in self.folders
+
+    def listdir(self, folder: str = "") -> List[str]:
+        """like Archive.listdir, subfolders end in '/'"""
+        folder = folder.strip("/")
+        if folder not in self.folders:
+            raise FileNotFoundError(f"no such directory: {folder}")
+        return sorted([
+            *self.folders[folder],
+            *(f"{split(subfolder)[1]}/" for subfolder in self.subfolders[folder])])
+
+    def memory_usage(self) -> Dict[str, int]:
+        """approximate bytes used, & the bytes a {path: value} dict would use"""
+        # NOTE: values aren't counted, they're the same in both
+        names = {id(name): name for files in self.folders.values() for name in files}
+        out = {
+            "folders": sum(map(sys.getsizeof, self.folders)),
+            "names": sum(map(sys.getsizeof, names.values())),
+            "tables": sum(
+                sys.getsizeof(table)
+                for tables in (self.folders, self.subfolders)
+                for table in (tables, *tables.values()))}
+        out["total"] = sum(out.values())
+        out["dict"] = sys.getsizeof(dict.fromkeys(range(len(self)))) + sum(map(sys.getsizeof, self))
+        return out
+
+    def prune(self, folder: str):
+        """remove folder & its parents if they're empty (the root folder is never removed)"""
+        # NOTE: also removes empty folders made w/ .add_folder once their last file is deleted
+        while folder != "" and len(self.folders[folder]) == 0 and len(self.subfolders[folder]) == 0:
+            del self.folders[folder]
+            del self.subfolders[folder]
+            parent = split(folder)[0]
+            self.subfolders[parent].discard(folder)
+            folder = parent
+
+    def update(self, entries: Iterable[Tuple[str, Any]] = tuple(), **kwargs):
+        """MutableMapping.update, w/o a method call per path"""
+        if isinstance(entries, collections.abc.Mapping):
+            entries = entries.items()
+        folders = self.folders
+        for path, value in itertools.chain(entries, kwargs.items()):
+            folder, slash, name = path.rpartition("/")
+            files = folders.get(folder)
+            if files is None:
+                files = self.add_folder(folder)
+            if name not in files:
+                self.num_entries += 1
+            files[name] = value
+
+    def walk(self, folder: str = "") -> Generator[str, None, None]:
+        """every path in folder & its subfolders"""
+        # NOTE: depth first; each folder's files in insertion order, then its subfolders sorted by name
+        folder = folder.strip("/")
+        if folder not in self.folders:
+            return
+        prefix = f"{folder}/" if folder != "" else ""
+        for name in self.folders[folder]:
+            yield f"{prefix}{name}"
+        for subfolder in sorted(self.subfolders[folder]):
+            yield from self.walk(subfolder)
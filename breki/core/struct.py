@@ -3,9 +3,10 @@ from __future__ import annotations
 import enum
 import io
 import struct
-from typing import Any, Dict, Iterable, List, Union
+from typing import Any, Dict, Iterable, List, Sequence, Union
 
 from . import bitfield
+from . import codec
 from . import common
 from . import mapped_array
 
@@ -19,6 +20,7 @@ ArraysDict = Dict[str, Union[int, List[str], Dict[str, Any]]]  # recursive
 
 struct_attr_formats: Dict[Struct, Dict[str, str]] = dict()
 # ^ {LumpClass: {"attr": "sub_format"}}
+# NOTE: filled in once per class by Struct.__init_subclass__
 
 
 def mapping_length(mapping: mapped_array.AttrMap) -> int:
@@ -44,7 +46,14 @@ def mapping_length(mapping: mapped_array.AttrMap) -> int:
     return length
 
 
-class Struct:
+class TupleCache:
+    """slot for the _tuple a Struct was unpacked from"""
+    __slots__ = ["_unpacked"]
+    # NOTE: only set by Codec.from_tuple if every attr is immutable
+    # -- cleared by Struct.__setattr__, so .as_bytes & .pack_into can skip .as_tuple
+
+
+class Struct(TupleCache):
     """base class for tuple <-> class conversion
     bytes <-> tuple conversion is handled by the struct module"""
     __slots__: List[str] = list()  # names of atributes, in order
@@ -57,6 +66,18 @@ class Struct:
     _bitfields: bitfield.BitFieldsDict = dict()
     _classes: common.ClassesDict = dict()
     # NOTE: an attr should only go into either _classes or _bitfields, never both!
+    _codec: codec.Codec = None  # generated by __init_subclass__
+    # NOTE: None if _format doesn't match the mapping; falls back to the slow path
+
+    def __init_subclass__(cls, **kwargs):
+        """compile a Codec for this subclass"""
+        super().__init_subclass__(**kwargs)
+        mapping = {slot: cls._arrays.get(slot, None) for slot in cls.__slots__}
+        struct_attr_formats[cls] = codec.attr_formats(mapping, cls._format)
+        try:
+            cls._codec = codec.Codec(cls, Struct, mapping, is_struct=True)
+        except (ValueError, struct.error):
+            cls._codec = None
 
     def __init__(self, *args, **kwargs):
         # LumpClass(attr1, [attr2_1, attr2_2]) or LumpClass(attr1, attr2=[attr2_1, attr2_2])
@@ -78,20 +99,16 @@ class Struct:
         default_values.update(kwargs)
         # TODO: set subattr_values
         global struct_attr_formats  # noqa: F824
-        _attr_formats = struct_attr_formats[self.__class__] = dict()
-        types = common.split_format(self._format)
-        types_index = 0
+        if self.__class__ not in struct_attr_formats:  # Struct w/o a subclass
+            mapping = {slot: self._arrays.get(slot, None) for slot in self.__slots__}
+            struct_attr_formats[self.__class__] = codec.attr_formats(mapping, self._format)
+        _attr_formats = struct_attr_formats[self.__class__]
         for attr, value in default_values.items():
             if attr not in self._arrays:  # Union[int, float, str]
-                _attr_formats[attr] = types[types_index]
-                types_index += 1
                 setattr(self, attr, value)  # handles _classes & _bitfields
                 continue  # next attr
             # child contructor metadata
             mapping = self._arrays[attr]
-            length = mapping_length({None: mapping})
-            _attr_formats[attr] = "".join(types[types_index:types_index + length])
-            types_index += length
             _bitfields = common.subgroup(self._bitfields, attr)
             _classes = common.subgroup(self._classes, attr)
             # value is MappedArray / _classes[attr]
@@ -100,8 +117,11 @@ class Struct:
             elif isinstance(value, mapped_array.MappedArray):
                 assert value._mapping == mapping
                 # NOTE: DON'T need to verify MappedArray._format
-                value._classes = _classes
-                value._bitfields = _bitfields
+                if value._classes != _classes or value._bitfields != _bitfields:
+                    # NOTE: spec is class-level, so we have to rebuild w/ our spec
+                    value = mapped_array.MappedArray.from_tuple(
+                        value.as_tuple(), _mapping=mapping, _format=value._format,
+                        _classes=_classes, _bitfields=_bitfields)
                 setattr(self, attr, value)
             # TODO: List[MappedArray]
             # value -> MappedArray
@@ -148,17 +168,37 @@ class Struct:
                 _classes=common.subgroup(self._classes, attr))
         # TODO: enforce MappedArray spec
         super().__setattr__(attr, value)
+        super().__setattr__("_unpacked", None)  # modified
 
     @classmethod
     def _defaults(cls) -> Dict[str, Any]:
-        types = common.split_format(cls._format)
-        defaults = cls.from_tuple([
-            common.type_defaults[t] if not t.endswith("s") else ""
-            for t in types])
+        if cls._codec is not None:
+            defaults = cls.from_tuple(cls._codec.defaults)
+        else:
+            types = common.split_format(cls._format)
+            defaults = cls.from_tuple([
+                common.type_defaults[t] if not t.endswith("s") else ""
+                for t in types])
         return dict(zip(cls.__slots__, defaults))
 
+    @classmethod
+    def array_from_bytes(cls, raw_array: bytes, lazy: bool = False) -> Sequence[Struct]:
+        """bulk .from_bytes for a tightly packed table"""
+        _struct = cls._codec.struct if cls._codec is not None else struct.Struct(cls._format)
+        assert len(raw_array) % _struct.size == 0, f"{len(raw_array)} bytes is not a whole number of {cls.__name__}"
+        if lazy:
+            return codec.LazyArray(raw_array, _struct, cls.from_tuple)
+        if cls._codec is not None:
+            return cls._codec.from_tuples(cls, _struct.iter_unpack(raw_array))
+        from_tuple = cls.from_tuple
+        return [from_tuple(_tuple) for _tuple in _struct.iter_unpack(raw_array)]
+
     @classmethod
     def from_bytes(cls, _bytes: bytes) -> Struct:
+        if cls._codec is not None:
+            expected_length = cls._codec.struct.size
+            assert len(_bytes) == expected_length, f"Not enough bytes! Expected {expected_length} got {len(_bytes)}"
+            return cls.from_tuple(cls._codec.struct.unpack(_bytes))
         expected_length = struct.calcsize(cls._format)
         assert len(_bytes) == expected_length, f"Not enough bytes! Expected {expected_length} got {len(_bytes)}"
         _tuple = struct.unpack(cls._format, _bytes)
@@ -168,11 +208,23 @@ class Struct:
 
     @classmethod
     def from_stream(cls, stream: io.BytesIO) -> Struct:
+        if cls._codec is not None:
+            return cls.from_bytes(stream.read(cls._codec.struct.size))
         return cls.from_bytes(stream.read(struct.calcsize(cls._format)))
 
+    @classmethod
+    def from_stream_many(cls, stream: io.BytesIO, count: int, lazy: bool = False) -> Sequence[Struct]:
+        """read count records w/ a single .read()"""
+        length = count * struct.calcsize(cls._format)
+        raw_array = stream.read(length)
+        assert len(raw_array) == length, f"unexpected EOF; expected {length} bytes, got {len(raw_array)}"
+        return cls.array_from_bytes(raw_array, lazy)
+
     @classmethod
     def from_tuple(cls, _tuple: Iterable) -> Struct:
         """_tuple comes from: struct.unpack(self._format, bytes)"""
+        if cls._codec is not None:
+            return cls._codec.from_tuple(cls, _tuple)
         # NOTE: _classes & _bitfields are handled by cls.__init__
         out_args = list()
         types = common.split_format(cls._format)
@@ -202,11 +254,37 @@ class Struct:
             _tuple_index += length
         return cls(*out_args)
 
+    @classmethod
+    def pack_many(cls, records: Sequence[Struct]) -> bytearray:
+        """bulk .as_bytes, packed straight into a preallocated bytearray"""
+        buffer = bytearray(struct.calcsize(cls._format) * len(records))
+        cls.pack_into(buffer, 0, records)
+        return buffer
+
+    @classmethod
+    def pack_into(cls, buffer: bytearray, offset: int, records: Iterable[Struct]) -> int:
+        """returns offset of the end of the last record"""
+        _struct = cls._codec.struct if cls._codec is not None else struct.Struct(cls._format)
+        pack_into = _struct.pack_into
+        size = _struct.size
+        for record in records:
+            _tuple = getattr(record, "_unpacked", None)
+            if _tuple is None:  # modified / never unpacked
+                _tuple = record.as_tuple()
+            pack_into(buffer, offset, *_tuple)
+            offset += size
+        return offset
+
     def as_bytes(self) -> bytes:
+        if self._codec is not None:
+            _tuple = getattr(self, "_unpacked", None)
+            return self._codec.struct.pack(*(self.as_tuple() if _tuple is None else _tuple))
         return struct.pack(self._format, *self.as_tuple())
 
     def as_tuple(self) -> list:
         """recreates the _tuple this instance was initialised from"""
+        if self._codec is not None:
+            return self._codec.as_tuple(self)
         _tuple = list()
         for slot in self.__slots__:
             value = getattr(self, slot)
@@ -0,0 +1,165 @@
+"""NumPy-backed columnar tables of Structs"""
+from __future__ import annotations
+import functools
+import io
+import struct
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from . import codec
+from . import common
+from . import mapped_array
+from . import struct as core_struct
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+byte_orders = {"<": "<", ">": ">", "!": ">", "=": "=", "@": "="}
+# ^ {"struct byte order": "numpy byte order"}
+float_kinds = {"e": "f2", "f": "f4", "d": "f8"}
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("StructArray requires numpy (pip install numpy)")
+
+
+def mapping_of(cls: type) -> mapped_array.AttrMap:
+    """Struct / MappedArray subclass -> MappedArray style mapping"""
+    if issubclass(cls, core_struct.Struct):
+        return {slot: cls._arrays.get(slot, None) for slot in cls.__slots__}
+    return cls._mapping
+
+
+def leaf_dtype(format_: str, byte_order: str) -> str:
+    """single struct format char (or "16s") -> numpy dtype string"""
+    char = format_[-1]
+    if char == "s":
+        return f"S{format_[:-1] or 1}"
+    elif char == "c":
+        return "S1"
+    elif char == "?":
+        return "?"
+    elif char in float_kinds:
+        return byte_order + float_kinds[char]
+    elif char in "bhilqn":
+        return f"{byte_order}i{struct.calcsize(byte_order + char)}"
+    elif char in "BHILQN":
+        return f"{byte_order}u{struct.calcsize(byte_order + char)}"
+    raise NotImplementedError(f"no numpy equivalent for {format_!r}")
+
+
+def group_dtype(mapping: mapped_array.AttrMap, leaves: List[Tuple[str, int]], base: int) -> Tuple[Any, int]:
+    """-> (dtype, size); leaves are (dtype, absolute offset) pairs"""
+    names, formats, offsets = list(), list(), list()
+    for attr, child_mapping, start, stop in codec.fields_of(mapping):
+        offset = leaves[start][1]
+        if child_mapping is None:
+            dtype = np.dtype(leaves[start][0])
+        elif isinstance(child_mapping, int):
+            child_leaves = leaves[start:stop]
+            if len({d for d, o in child_leaves}) == 1:  # homogeneous
+                dtype = np.dtype((child_leaves[0][0], (child_mapping,)))
+            else:  # fall back to a struct w/ numbered fields
+                dtype, size = group_dtype([f"f{i}" for i in range(child_mapping)], child_leaves, offset)
+        else:  # list / dict -> nested structured dtype
+            dtype, size = group_dtype(child_mapping, leaves[start:stop], offset)
+        names.append(attr)
+        formats.append(dtype)
+        offsets.append(offset - base)
+    size = max(
+        (offset + np.dtype(dtype).itemsize for offset, dtype in zip(offsets, formats)),
+        default=0)
+    dtype = np.dtype(dict(names=names, formats=formats, offsets=offsets, itemsize=size))
+    return dtype, size
+
+
+@functools.lru_cache(maxsize=None)
+def dtype_of(cls: type) -> "np.dtype":
+    """numpy structured dtype w/ the same layout as cls._format"""
+    require_numpy()
+    _format = cls._format.replace(" ", "")
+    byte_order = byte_orders.get(_format[:1], "=")
+    types = common.split_format(_format)
+    if any(format_.endswith("x") for format_ in types):
+        raise NotImplementedError("padding bytes are not supported")
+    leaves = [
+        (leaf_dtype(format_, byte_order), offset)
+        for format_, offset in zip(types, common.leaf_offsets(_format))]
+    dtype, size = group_dtype(mapping_of(cls), leaves, 0)
+    itemsize = struct.calcsize(_format)
+    return np.dtype(dict(
+        names=dtype.names,
+        formats=[dtype.fields[name][0] for name in dtype.names],
+        offsets=[dtype.fields[name][1] for name in dtype.names],
+        itemsize=itemsize))
+
+
+class StructArray:
+    """columnar table of Structs; zero-copy over the raw bytes"""
+    struct_class: type  # Struct / MappedArray subclass
+    array: "np.ndarray"  # structured array w/ dtype_of(struct_class)
+
+    def __init__(self, struct_class: type, array: "np.ndarray"):
+        require_numpy()
+        assert array.dtype == dtype_of(struct_class), "array dtype does not match struct_class"
+        self.struct_class = struct_class
+        self.array = array
+
+    def __getattr__(self, attr: str) -> "np.ndarray":
+        # NOTE: only called when normal attribute lookup fails
+        if attr in ("struct_class", "array"):  # not set yet
+            raise AttributeError(attr)
+        if attr in self.array.dtype.names:
+            return self.array[attr]
+        raise AttributeError(f"{self.struct_class.__name__} has no attribute {attr!r}")
+
+    def __getitem__(self, index: Union[int, str, slice, Any]) -> Any:
+        if isinstance(index, str):  # column
+            return self.array[index]
+        elif isinstance(index, (int, np.integer)):  # single row
+            return self.struct_class.from_bytes(self.array[index].tobytes())
+        else:  # slice / boolean mask / array of indices
+            return StructArray(self.struct_class, self.array[index])
+
+    def __iter__(self) -> Iterable:
+        return (self[i] for i in range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __repr__(self) -> str:
+        descriptor = f"{len(self)} {self.struct_class.__name__}"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def __setitem__(self, index: int, value: Any):
+        """write a single Struct back into the array"""
+        raw_value = value.as_bytes()
+        self.array[index] = np.frombuffer(raw_value, dtype=self.array.dtype)[0]
+
+    @property
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        return {name: self.array[name] for name in self.array.dtype.names}
+
+    def as_bytes(self) -> bytes:
+        return self.array.tobytes()
+
+    # initialisers
+    @classmethod
+    def from_bytes(cls, struct_class: type, raw_array: bytes) -> StructArray:
+        """zero-copy; writable if raw_array is (bytearray, memoryview, mmap etc.)"""
+        require_numpy()
+        return cls(struct_class, np.frombuffer(raw_array, dtype=dtype_of(struct_class)))
+
+    @classmethod
+    def from_stream(cls, struct_class: type, stream: io.BytesIO, count: int) -> StructArray:
+        length = count * struct.calcsize(struct_class._format)
+        raw_array = stream.read(length)
+        assert len(raw_array) == length, f"unexpected EOF; expected {length} bytes, got {len(raw_array)}"
+        return cls.from_bytes(struct_class, raw_array)
+
+    @classmethod
+    def from_structs(cls, struct_class: type, structs: Iterable[Any]) -> StructArray:
+        return cls.from_bytes(struct_class, bytearray(b"".join(s.as_bytes() for s in structs)))
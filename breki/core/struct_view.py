@@ -0,0 +1,239 @@
+"""Lazy Structs; fields are decoded from a shared buffer on access"""
+from __future__ import annotations
+import collections.abc
+import functools
+import struct
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from . import bitfield
+from . import codec
+from . import common
+from . import mapped_array
+from . import struct as core_struct
+
+
+Buffer = Union[bytes, bytearray, memoryview]  # or anything w/ the buffer protocol
+Leaf = Tuple[struct.Struct, int]
+# ^ (struct.Struct(prefix + leaf_format), offset)
+
+
+def detached(value: Any) -> Union[mapped_array.MappedArray, bitfield.BitField]:
+    """copy of a write through child that doesn't write through"""
+    if isinstance(value, bitfield.BitField):
+        return bitfield.BitField.from_int(value.as_int(), value._fields, value._format, value._classes)
+    cls = value.__class__
+    return cls._origin.from_tuple(value.as_tuple(), cls._mapping, cls._format, cls._bitfields, cls._classes)
+
+
+@functools.lru_cache(maxsize=None)
+def write_through_class(cls: type) -> type:
+    """subclass of cls which calls ._commit after every edit; same layout, so instances can swap __class__"""
+    # NOTE: a single base w/ empty __slots__ keeps the layout identical (a mixin base wouldn't)
+    base_setattr = cls.__setattr__
+
+    def __setattr__(self, attr, value):
+        base_setattr(self, attr, value)
+        commit = self.__dict__.get("_commit", None)
+        if commit is not None and not attr.startswith("_"):
+            commit()
+
+    def __reduce_ex__(self, protocol):
+        return detached(self).__reduce_ex__(protocol)
+
+    namespace = dict(
+        __slots__=(), __module__=cls.__module__, __qualname__=cls.__qualname__,
+        __setattr__=__setattr__, __reduce_ex__=__reduce_ex__, _write_through=True)
+    return type(cls.__name__, (cls,), namespace)
+
+
+def write_through(value: Any, commit: Union[Callable[[], None], None]):
+    """make value (& its children) call commit after every edit; commit=None detaches"""
+    if not isinstance(value, (mapped_array.MappedArray, bitfield.BitField)) or not hasattr(value, "__dict__"):
+        return  # NOTE: _classes w/o a __dict__ can't write through; assign the whole field instead
+    if not getattr(value, "_write_through", False):
+        value.__class__ = write_through_class(value.__class__)
+    value.__dict__["_commit"] = commit
+    if isinstance(value, mapped_array.MappedArray):
+        for attr in value._mapping:
+            write_through(getattr(value, attr), commit)
+
+
+class LazyField:
+    """descriptor for a single top-level attr of a StructView"""
+    attr: str
+    child_mapping: Any  # None, int, list or dict
+    unpacker: struct.Struct  # skips straight to the attr's first value
+    leaves: List[Leaf]  # for writing (padding would overwrite neighbours)
+    span: Tuple[int, int]  # (start, stop) bytes of the attr, relative to the record
+    types: Tuple[str]
+    # decode
+    bitfield: Dict[str, Any]  # BitField.from_int kwargs
+    child_class: type  # specialised MappedArray
+
+    def __init__(self, struct_class: type, attr: str, child_mapping: Any, start: int, stop: int):
+        _format = struct_class._format.replace(" ", "")
+        prefix = _format[0] if _format != "" and _format[0] in "@=<>!" else "@"
+        types = common.split_format(_format)
+        offsets = common.leaf_offsets(_format)
+        value_indices = [i for i, format_ in enumerate(types) if format_ != "x"]
+        # ^ index in types of each unpacked value; start & stop count values, not pad bytes
+        first, last = value_indices[start], value_indices[stop - 1]
+        self.attr = attr
+        self.child_mapping = child_mapping
+        self.types = tuple(types[i] for i in value_indices[start:stop])
+        # NOTE: padding from the start of the record keeps native alignment intact
+        self.unpacker = struct.Struct(f"{prefix}{offsets[start]}x{''.join(types[first:last + 1])}")
+        self.leaves = [
+            (struct.Struct(prefix + format_), offset)
+            for format_, offset in zip(self.types, offsets[start:stop])]
+        self.span = (offsets[start], self.unpacker.size)
+        attr_format = "".join(self.types)
+        self.bitfield = dict(
+            _fields=struct_class._bitfields.get(attr, None),
+            _format=attr_format,
+            _classes=common.subgroup(struct_class._classes, attr))
+        if isinstance(child_mapping, (list, dict)):
+            self.child_class = mapped_array.MappedArray.specialise(
+                _mapping=child_mapping,
+                _format=attr_format,
+                _classes=common.subgroup(struct_class._classes, attr),
+                _bitfields=common.subgroup(struct_class._bitfields, attr))
+        else:
+            self.child_class = None
+
+    def __get__(self, instance: StructView, owner: type) -> Any:
+        if instance is None:
+            return self
+        _tuple = self.unpacker.unpack_from(instance._buffer, instance._offset)
+        if self.child_mapping is None:
+            value = _tuple[0]
+            if self.bitfield["_fields"] is not None:
+                value = bitfield.BitField.from_int(value, **self.bitfield)
+                write_through(value, functools.partial(self.commit, instance, value, self.raw(instance)))
+                return value
+        elif isinstance(self.child_mapping, int):
+            value = _tuple  # NOTE: Struct keeps int arrays as tuples
+        else:  # list / dict
+            value = self.child_class.from_tuple(_tuple)
+        # NOTE: same as Struct.__setattr__
+        value = common.school(instance._struct_class, self.attr, value)
+        if isinstance(value, (mapped_array.MappedArray, bitfield.BitField)):
+            write_through(value, functools.partial(self.commit, instance, value, self.raw(instance)))
+        return value
+
+    def __set__(self, instance: StructView, value: Any):
+        _tuple = list()
+        codec.flatten(_tuple, value, self.types)
+        assert len(_tuple) == len(self.leaves), f"{self.attr} expects {len(self.leaves)} values"
+        for (leaf, offset), leaf_value in zip(self.leaves, _tuple):
+            leaf.pack_into(instance._buffer, instance._offset + offset, leaf_value)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.attr!r} @ 0x{id(self):016X}>"
+
+    def commit(self, instance: StructView, value: Any, snapshot: bytearray):
+        """called by write through children after they're edited"""
+        # NOTE: snapshot is the attr's bytes when value was decoded (or last committed)
+        # -- if they changed (e.g. the attr was reassigned), value is stale & is detached instead
+        if self.raw(instance) != snapshot:
+            write_through(value, None)
+            return
+        self.__set__(instance, value)
+        snapshot[:] = self.raw(instance)
+
+    def raw(self, instance: StructView) -> bytearray:
+        start, stop = self.span
+        return bytearray(instance._buffer[instance._offset + start:instance._offset + stop])
+
+
+class StructView:
+    """lazy, zero-copy Struct over a record in a buffer"""
+    __slots__ = ["_buffer", "_index", "_offset"]
+    _buffer: memoryview
+    _index: int  # record index
+    _offset: int  # byte offset of record
+    # generated by StructView.of(struct_class)
+    _struct_class: type = None
+    _size: int = 0
+
+    def __init__(self, buffer: Buffer, index: int = 0):
+        assert self._struct_class is not None, "use StructView.of(StructClass)"
+        self._buffer = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        self._index = index
+        self._offset = index * self._size
+        if not 0 <= self._offset <= len(self._buffer) - self._size:
+            raise IndexError(f"{self.__class__.__name__} #{index} is out of bounds")
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, StructView):
+            return other._struct_class is self._struct_class and other.as_bytes() == self.as_bytes()
+        elif isinstance(other, core_struct.Struct):
+            return isinstance(other, self._struct_class) and other.as_bytes() == self.as_bytes()
+        return False
+
+    def __iter__(self):
+        return iter([getattr(self, attr) for attr in self._struct_class.__slots__])
+
+    def __len__(self) -> int:
+        return len(self._struct_class.__slots__)
+
+    def __repr__(self) -> str:
+        descriptor = f"#{self._index} ({self._struct_class.__name__})"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def as_bytes(self) -> bytes:
+        return bytes(self._buffer[self._offset:self._offset + self._size])
+
+    def as_struct(self) -> core_struct.Struct:
+        """decode every field (eager copy)"""
+        return self._struct_class.from_bytes(self.as_bytes())
+
+    def as_tuple(self) -> list:
+        return self.as_struct().as_tuple()
+
+    @classmethod
+    def array_from_bytes(cls, raw_array: Buffer) -> ViewArray:
+        """lazy equivalent of Struct.array_from_bytes"""
+        return ViewArray(cls, raw_array)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def of(struct_class: type) -> type:
+        """generate (& cache) the StructView subclass for struct_class"""
+        assert issubclass(struct_class, core_struct.Struct)
+        mapping = {slot: struct_class._arrays.get(slot, None) for slot in struct_class.__slots__}
+        namespace = {
+            attr: LazyField(struct_class, attr, child_mapping, start, stop)
+            for attr, child_mapping, start, stop in codec.fields_of(mapping)}
+        namespace.update(
+            __slots__=list(),
+            __module__=struct_class.__module__,
+            _struct_class=struct_class,
+            _size=struct.calcsize(struct_class._format))
+        return type(f"{struct_class.__name__}View", (StructView,), namespace)
+
+
+class ViewArray(collections.abc.Sequence):
+    """tightly packed table of StructViews; nothing is decoded up front"""
+    buffer: memoryview
+    view_class: type  # StructView subclass
+
+    def __init__(self, view_class: type, raw_array: Buffer):
+        self.buffer = raw_array if isinstance(raw_array, memoryview) else memoryview(raw_array)
+        self.view_class = view_class
+        size = view_class._size
+        assert len(self.buffer) % size == 0, f"{len(self.buffer)} bytes is not a whole number of records"
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[StructView, List[StructView]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.view_class(self.buffer, index)
+
+    def __len__(self) -> int:
+        return len(self.buffer) // self.view_class._size
+
+    def __repr__(self) -> str:
+        descriptor = f"{len(self)} {self.view_class.__name__}s"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
@@ -1,6 +1,7 @@
 __all__ = [
-    "base", "parsed",
-    "CodePage", "DataType", "File",
+    "base", "cache", "detect", "parsed",
+    "CodePage", "DataType", "File", "HandlePool", "PooledStream", "SubStream",
+    "FormatRegistry", "IndexCache", "ListingCache", "handle_pool", "listing_cache", "copy_range", "read_at",
     "ByteStream", "DataStream", "TextStream",
     "ParsedFile", "FriendlyFile",
     "BinaryFile", "FriendlyBinaryFile",
@@ -8,11 +9,20 @@ __all__ = [
     "HybridFile", "FriendlyHybridFile"]
 
 from . import base
+from . import cache
+from . import detect
 from . import parsed
 
-from .base import CodePage, DataType, File
+from .base import CodePage, DataType, File, HandlePool, PooledStream, SubStream
+from .base import handle_pool  # shared by every File on disk
+from .base import copy_range, read_at
 from .base import ByteStream, DataStream, TextStream  # type hints
 
+from .cache import IndexCache, ListingCache
+from .cache import listing_cache  # shared by every FriendlyFile on disk
+
+from .detect import FormatRegistry
+
 from .parsed import ParsedFile, FriendlyFile  # base classes
 from .parsed import BinaryFile, FriendlyBinaryFile
 from .parsed import TextFile, FriendlyTextFile
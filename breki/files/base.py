@@ -1,15 +1,394 @@
 from __future__ import annotations
+import contextlib
 import enum
 import functools
 import io
+import mmap
 import os
-from typing import List, Union
+import sys
+import threading
+import weakref
+from typing import Dict, List, Set, Union
+
+
+class SubStream(io.RawIOBase):
+    """read-only view of [offset, offset + length) in a parent stream"""
+    # NOTE: reads w/ read_at, so many SubStreams can share a parent (across threads too)
+    parent: io.BufferedReader
+    offset: int  # start of view in parent
+    length: int
+    position: int  # relative to offset
+
+    def __init__(self, parent: io.BufferedReader, offset: int, length: int):
+        super().__init__()
+        assert offset >= 0 and length >= 0, "invalid range"
+        self.parent = parent
+        self.offset = offset
+        self.length = length
+        self.position = 0
+
+    def __repr__(self) -> str:
+        descriptor = f"[0x{self.offset:X}:0x{self.offset + self.length:X}] of {self.parent.__class__.__name__}"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def read(self, size: int = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed SubStream")
+        remaining = max(self.length - self.position, 0)
+        size = remaining if size is None or size < 0 else min(size, remaining)
+        if size == 0:
+            return b""
+        out = read_at(self.parent, self.offset + self.position, size)
+        self.position += len(out)
+        return out
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        memoryview(buffer).cast("B")[:len(data)] = data
+        return len(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 0:
+            position = offset
+        elif whence == 1:
+            position = self.position + offset
+        elif whence == 2:
+            position = self.length + offset
+        else:
+            raise ValueError(f"invalid whence ({whence}, should be 0, 1 or 2)")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self.position = position  # NOTE: can seek past the end, like a file
+        return self.position
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+
+class HandlePool:
+    """LRU cache of open file handles, shared by every File on disk"""
+    # NOTE: PooledStreams reopen evicted handles, so max_handles caps OS handles
+    # -- not the number of Files that can be open at once
+    max_handles: int
+    handles: Dict[str, io.FileIO]
+    # ^ {abspath: handle}, least recently used first
+    borrowed: Dict[io.FileIO, int]
+    # ^ {handle: num_borrowers}
+    retired: Set[io.FileIO]  # evicted while borrowed, closed once returned
+    lock: threading.RLock
+    # metrics
+    hits: int  # handle was already open
+    opens: int  # includes reopens after eviction
+    evictions: int
+
+    def __init__(self, max_handles: int = 128):
+        assert max_handles > 0, "pool must hold at least 1 handle"
+        self.max_handles = max_handles
+        self.handles = dict()
+        self.borrowed = dict()
+        self.retired = set()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.opens = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        descriptor = f"{len(self.handles)}/{self.max_handles} handles ({self.opens} opens, {self.hits} hits)"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    @contextlib.contextmanager
+    def borrow(self, filepath: str) -> io.FileIO:
+        """handle won't be closed until it's returned, even if evicted"""
+        handle = self.check_out(filepath)
+        try:
+            yield handle
+        finally:
+            self.check_in(handle)
+
+    def check_in(self, handle: io.FileIO):
+        with self.lock:
+            self.borrowed[handle] -= 1
+            if self.borrowed[handle] == 0:
+                del self.borrowed[handle]
+                if handle in self.retired:
+                    self.retired.remove(handle)
+                    handle.close()
+
+    def check_out(self, filepath: str) -> io.FileIO:
+        """.get, but the handle won't be closed until it's checked back in"""
+        with self.lock:
+            handle = self.get(filepath)
+            self.borrowed[handle] = self.borrowed.get(handle, 0) + 1
+        return handle
+
+    def close(self, filepath: str = None):
+        """close one handle, or all of them"""
+        with self.lock:
+            if filepath is None:
+                filepaths = list(self.handles)
+            else:
+                filepath = os.path.abspath(filepath)
+                filepaths = [filepath] if filepath in self.handles else list()
+            for filepath in filepaths:
+                self.evict(filepath)
+
+    def evict(self, filepath: str):
+        with self.lock:
+            handle = self.handles.pop(filepath)
+            if handle in self.borrowed:
+                self.retired.add(handle)
+            else:
+                handle.close()
+
+    def get(self, filepath: str) -> io.FileIO:
+        """NOTE: use .borrow if another thread could evict the handle"""
+        if not os.path.isabs(filepath):  # PooledStreams pass abspaths
+            filepath = os.path.abspath(filepath)
+        with self.lock:
+            handle = self.handles.pop(filepath, None)
+            if handle is not None:
+                self.hits += 1
+            else:
+                handle = open(filepath, "rb", buffering=0)
+                self.opens += 1
+                while len(self.handles) >= self.max_handles:
+                    self.evict(next(iter(self.handles)))  # least recently used
+                    self.evictions += 1
+            self.handles[filepath] = handle  # most recently used
+        return handle
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "open": len(self.handles), "max_handles": self.max_handles,
+            "hits": self.hits, "opens": self.opens, "evictions": self.evictions}
+
+    def read_at(self, filepath: str, offset: int, length: int) -> bytes:
+        """positional read, safe to call from multiple threads"""
+        handle = self.check_out(filepath)
+        try:
+            if hasattr(os, "pread"):
+                return os.pread(handle.fileno(), length, offset)
+            with self.lock:  # no os.pread on Windows
+                handle.seek(offset)
+                return handle.read(length)
+        finally:
+            self.check_in(handle)
+
+    def resize(self, max_handles: int):
+        """evicts least recently used handles if shrinking"""
+        assert max_handles > 0, "pool must hold at least 1 handle"
+        with self.lock:
+            self.max_handles = max_handles
+            while len(self.handles) > self.max_handles:
+                self.evict(next(iter(self.handles)))
+                self.evictions += 1
+
+
+handle_pool = HandlePool()
+
+
+class PooledStream(io.RawIOBase):
+    """unbuffered read-only file, w/ its OS handle borrowed from a HandlePool"""
+    # NOTE: reads are positional, so many PooledStreams can share a handle across threads
+    filepath: str  # absolute
+    pool: HandlePool
+    position: int
+
+    def __init__(self, filepath: str, pool: HandlePool = None):
+        super().__init__()
+        self.filepath = os.path.abspath(filepath)
+        self.pool = handle_pool if pool is None else pool
+        self.position = 0
+        self.pool.get(self.filepath)  # FileNotFoundError now, not on first read
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} "{self.filepath}" @ 0x{id(self):016X}>'
+
+    @property
+    def name(self) -> str:
+        return self.filepath
+
+    def fileno(self) -> int:
+        # NOTE: only valid until the handle is evicted
+        return self.pool.get(self.filepath).fileno()
+
+    def readall(self) -> bytes:
+        return self.read(max(os.path.getsize(self.filepath) - self.position, 0))
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed PooledStream")
+        data = self.pool.read_at(self.filepath, self.position, len(buffer))
+        memoryview(buffer).cast("B")[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 0:
+            position = offset
+        elif whence == 1:
+            position = self.position + offset
+        elif whence == 2:
+            position = os.path.getsize(self.filepath) + offset
+        else:
+            raise ValueError(f"invalid whence ({whence}, should be 0, 1 or 2)")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self.position = position
+        return self.position
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
 
 
 TextStream = Union[io.StringIO, io.TextIOWrapper]
-ByteStream = Union[io.BytesIO, io.BufferedReader]
+ByteStream = Union[io.BytesIO, io.BufferedReader, PooledStream, SubStream]
 DataStream = Union[TextStream, ByteStream]
 
+stream_locks = weakref.WeakKeyDictionary()
+# ^ {stream: threading.Lock} for read_at's fallback
+stream_locks_lock = threading.Lock()
+
+
+def read_at(stream: ByteStream, offset: int, length: int) -> bytes:
+    """positional read, doesn't move stream & is safe to call from multiple threads"""
+    if isinstance(getattr(stream, "raw", None), PooledStream):
+        stream = stream.raw
+    if isinstance(stream, PooledStream):
+        return stream.pool.read_at(stream.filepath, offset, length)
+    elif isinstance(stream, SubStream):
+        length = max(min(length, stream.length - offset), 0)
+        return read_at(stream.parent, stream.offset + offset, length)
+    elif isinstance(stream, io.BytesIO):
+        with stream.getbuffer() as view:
+            return bytes(view[offset:offset + length])
+    # fallback
+    with stream_locks_lock:
+        lock = stream_locks.setdefault(stream, threading.Lock())
+    with lock:
+        position = stream.tell()
+        stream.seek(offset)
+        out = stream.read(length)
+        stream.seek(position)
+    return out
+
+
+def kernel_copy(stream: io.FileIO, offset: int, length: int, out_file: io.BufferedWriter) -> int:
+    """copy w/ os.copy_file_range or os.sendfile, returns the number of bytes copied before EOF or an error"""
+    # NOTE: kernel copies move the OS file position, not out_file's
+    copied = 0
+    out_file.flush()
+    out_start = out_file.tell()
+    try:
+        while copied < length:
+            size = min(length - copied, 2 ** 30)
+            if hasattr(os, "copy_file_range"):
+                size = os.copy_file_range(stream.fileno(), out_file.fileno(), size, offset + copied)
+            else:
+                size = os.sendfile(out_file.fileno(), stream.fileno(), offset + copied, size)
+            if size == 0:  # EOF
+                break
+            copied += size
+    except OSError:  # e.g. sendfile to a file on macOS, or copy_file_range across filesystems on old kernels
+        pass
+    out_file.seek(out_start + copied)
+    return copied
+
+
+def chunked_copy(stream: ByteStream, offset: int, length: int, out_file: io.BufferedWriter, chunk_size: int) -> int:
+    """copy w/ read_at, chunk_size bytes at a time; returns the number of bytes copied before EOF"""
+    copied = 0
+    while copied < length:
+        chunk = read_at(stream, offset + copied, min(length - copied, chunk_size))
+        if len(chunk) == 0:  # EOF
+            break
+        out_file.write(chunk)
+        copied += len(chunk)
+    return copied
+
+
+def copy_range(stream: ByteStream, offset: int, length: int, out_file: io.BufferedWriter,
+               chunk_size: int = 2 ** 20) -> int:
+    """copy [offset, offset + length) of stream to out_file, returns the number of bytes copied"""
+    # NOTE: files on disk are copied in the kernel (os.copy_file_range / os.sendfile), w/o reading into python
+    # -- falls back to read_at in chunks; safe to call from multiple threads
+    while isinstance(stream, SubStream):
+        length = max(min(length, stream.length - offset), 0)
+        stream, offset = stream.parent, stream.offset + offset
+    if isinstance(getattr(stream, "raw", None), PooledStream):
+        stream = stream.raw
+    if isinstance(stream, PooledStream):
+        with stream.pool.borrow(stream.filepath) as handle:
+            return copy_range(handle, offset, length, out_file, chunk_size)
+    copied = 0
+    kernel_copyable = hasattr(os, "copy_file_range") or hasattr(os, "sendfile")
+    if kernel_copyable and isinstance(stream, (io.BufferedReader, io.FileIO)) and hasattr(out_file, "fileno"):
+        copied = kernel_copy(stream, offset, length, out_file)
+    return copied + chunked_copy(stream, offset + copied, length - copied, out_file, chunk_size)
+
+
+mmap_kwargs = dict(trackfd=False) if sys.version_info >= (3, 13) and os.name != "nt" else dict()
+# NOTE: mmap.mmap dups the fd (outside of handle_pool) unless trackfd=False (Python 3.13+, not on Windows)
+
+
+def map_stream(stream: DataStream) -> memoryview:
+    """read-only view of all bytes in stream, without copying where possible"""
+    if isinstance(stream, io.TextIOWrapper):
+        stream = stream.buffer
+    if isinstance(getattr(stream, "raw", None), PooledStream):
+        stream = stream.raw
+    if isinstance(stream, PooledStream):
+        with stream.pool.borrow(stream.filepath) as handle:
+            return map_stream(handle)
+    elif isinstance(stream, (io.BufferedReader, io.FileIO)):  # on disk
+        fileno = stream.fileno()
+        if os.fstat(fileno).st_size == 0:
+            return memoryview(b"")  # can't mmap an empty file
+        return memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ, **mmap_kwargs))
+    elif isinstance(stream, SubStream):
+        return map_stream(stream.parent)[stream.offset:stream.offset + stream.length]
+    elif isinstance(stream, io.BytesIO):
+        # NOTE: getvalue() shares an unmodified BytesIO's initial bytes
+        # -- .getbuffer() would stop the BytesIO from resizing (e.g. pkware.Zip appending)
+        return memoryview(stream.getvalue())
+    elif isinstance(stream, io.StringIO):
+        return memoryview(stream.getvalue().encode("utf-8"))
+    # fallback
+    position = stream.tell()
+    stream.seek(0)
+    out = memoryview(stream.read())
+    stream.seek(position)
+    return out
+
+
+class locked_cached_property(functools.cached_property):
+    """cached_property that holds instance.lock, so the getter only runs once"""
+    # NOTE: functools.cached_property stopped locking in Python 3.12
+    # -- & used one lock for every instance before that
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with instance.lock:
+            if self.attrname not in instance.__dict__:
+                instance.__dict__[self.attrname] = self.func(instance)
+        return instance.__dict__[self.attrname]
+
 
 class CodePage:
     encoding: str
@@ -61,10 +440,13 @@ class File:
     # data access
     archive: object  # ArchiveClass
     code_page = CodePage("utf-8", "strict")
-    stream: DataStream  # cached_property
+    stream: DataStream  # locked_cached_property
+    buffer: memoryview  # locked_cached_property
+    lock: threading.RLock  # for lazy initialisation
 
     def __init__(self, filepath: str, archive=None, code_page=None):
         self.archive = archive
+        self.lock = threading.RLock()
         folder, filename = os.path.split(filepath)
         self.folder = folder if folder != "" else "."
         self.filename = filename
@@ -89,21 +471,64 @@ class File:
         assert isinstance(type_, DataType)
         filepath = os.path.join(self.folder, self.filename)
         if self.archive is None:
-            mode = "rb" if type_ != DataType.TEXT else "r"
-            out = open(filepath, mode)
-        else:
-            if not self.archive.is_parsed:
-                self.archive.parse()
-            raw_bytes = self.archive.read(filepath)
+            out = io.BufferedReader(PooledStream(filepath))
             if type_ == DataType.TEXT:
-                raw_text = self.code_page.decode(raw_bytes)
+                out = io.TextIOWrapper(out)
+        else:
+            with self.archive.lock:
+                if not self.archive.is_parsed:
+                    self.archive.parse()
+            byte_range = self.archive.entry_range(filepath) if type_ != DataType.TEXT else None
+            if byte_range is not None:  # stored, no need to copy
+                out = SubStream(*byte_range)
+            elif type_ == DataType.TEXT:
+                raw_text = self.code_page.decode(self.archive.read(filepath))
                 out = io.StringIO(raw_text)
             else:
-                out = io.BytesIO(raw_bytes)
+                out = io.BytesIO(self.archive.read(filepath))
         self.type = type_  # side effect!
         return out
 
-    stream = functools.cached_property(_get_stream)
+    stream = locked_cached_property(_get_stream)
+
+    # .buffer property getter
+    def _get_buffer(self) -> memoryview:
+        """memory mapped if on disk; for decoding w/ struct.unpack_from instead of seeking"""
+        # NOTE: opt-in; before Python 3.13 every mapped .buffer holds an fd that handle_pool doesn't count
+        # -- prefer .read_at for files w/ many friends (e.g. _NNN.vpk & multi-track discs)
+        if self.archive is not None:
+            with self.archive.lock:
+                if not self.archive.is_parsed:
+                    self.archive.parse()
+            byte_range = self.archive.entry_range(self.filepath)
+            if byte_range is not None:  # stored, view the archive
+                parent, offset, length = byte_range
+                if parent is self.archive.stream:  # share the archive's mmap
+                    return self.archive.buffer[offset:offset + length]
+                return map_stream(SubStream(parent, offset, length))
+            return memoryview(self.archive.read(self.filepath))
+        elif "stream" in self.__dict__:  # from_stream or .stream already open
+            if isinstance(self.stream, io.StringIO):
+                return memoryview(self.code_page.encode(self.stream.getvalue()))
+            return map_stream(self.stream)
+        with handle_pool.borrow(self.filepath) as handle:
+            return map_stream(handle)  # NOTE: the mmap outlives the handle
+
+    buffer = locked_cached_property(_get_buffer)
+
+    def read_at(self, offset: int, length: int) -> bytes:
+        """read from .stream w/o moving it (thread-safe)"""
+        return read_at(self.stream, offset, length)
+
+    @property
+    def is_on_disk(self) -> bool:
+        """not in an archive or memory"""
+        if self.archive is not None:
+            return False
+        elif "stream" not in self.__dict__:  # not opened yet
+            return True
+        stream = self.stream.buffer if isinstance(self.stream, io.TextIOWrapper) else self.stream
+        return isinstance(getattr(stream, "raw", None), PooledStream)
 
     @functools.cached_property
     def filepath(self) -> str:
@@ -171,7 +596,7 @@ class File:
         """override .stream property"""
         type_ = cls.type if type_ is None else type_
         assert isinstance(type_, DataType)
-        is_binary = isinstance(stream, (io.BytesIO, io.BufferedReader))
+        is_binary = isinstance(stream, (io.BytesIO, io.BufferedReader, PooledStream, SubStream))
         is_text = isinstance(stream, (io.StringIO, io.TextIOWrapper))
         if not (is_binary or is_text):
             raise RuntimeError(
@@ -0,0 +1,198 @@
+from __future__ import annotations
+import hashlib
+import importlib.metadata
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Tuple, Union
+
+try:
+    version = importlib.metadata.version("breki")
+except importlib.metadata.PackageNotFoundError:  # running from source
+    version = "dev"
+
+format_version = 1
+header = struct.Struct("<4sII")
+# ^ (magic, format_version, num_sections)
+section_header = struct.Struct("<16sQQ")
+# ^ (name, offset, length)
+
+
+def read_sections(mapped: mmap.mmap) -> Dict[str, memoryview]:
+    """{name: section} from a mapped index; releases every view if it's invalid"""
+    view = memoryview(mapped)
+    sections = dict()
+    try:
+        magic, file_format_version, num_sections = header.unpack_from(view, 0)
+        assert magic == b"BKIX" and file_format_version == format_version, "not a valid index"
+        for i in range(num_sections):
+            name, offset, length = section_header.unpack_from(view, header.size + i * section_header.size)
+            assert offset + length <= len(view), "truncated index"
+            sections[name.rstrip(b"\x00").decode()] = view[offset:offset + length]
+    except BaseException:
+        for section in sections.values():
+            section.release()
+        view.release()
+        raise
+    return sections
+
+
+class IndexCache:
+    """folder of parsed indices, memory-mapped back in when a file is reopened"""
+    # NOTE: keyed on (abspath, size, mtime, class, breki version)
+    # -- any change to the file invalidates its index
+    folder: str
+    max_size: int  # in bytes, least recently used indices are deleted past this
+    # metrics
+    hits: int
+    misses: int
+
+    def __init__(self, folder: str = None, max_size: int = 256 * 2 ** 20):
+        if folder is None:
+            folder = os.path.join(os.path.expanduser("~"), ".cache", "breki")
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        descriptor = f'"{self.folder}" {len(self.index_files())} indices ({self.hits} hits, {self.misses} misses)'
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def clear(self):
+        for filename in self.index_files():
+            os.remove(os.path.join(self.folder, filename))
+
+    def index_files(self) -> Dict[str, os.stat_result]:
+        return {
+            filename: os.stat(os.path.join(self.folder, filename))
+            for filename in os.listdir(self.folder)
+            if filename.endswith(".idx")}
+
+    def index_path(self, parsed_file) -> str:
+        """folder/<path hash>-<state hash>.idx"""
+        filepath = os.path.abspath(parsed_file.filepath)
+        stat = os.stat(filepath)
+        cls = parsed_file.__class__
+        state = f"{stat.st_size}|{stat.st_mtime_ns}|{cls.__module__}.{cls.__qualname__}|{version}|{format_version}"
+        path_hash = hashlib.sha1(filepath.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        state_hash = hashlib.sha1(state.encode()).hexdigest()[:16]
+        return os.path.join(self.folder, f"{path_hash}-{state_hash}.idx")
+
+    def load(self, parsed_file) -> Union[Dict[str, memoryview], None]:
+        """{name: section} or None if there's no up to date index"""
+        index_path = self.index_path(parsed_file)
+        try:
+            with open(index_path, "rb") as index_file:
+                mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except ValueError:  # can't mmap an empty file
+            mapped = None
+        try:
+            if mapped is None:
+                raise AssertionError("empty index")
+            sections = read_sections(mapped)
+        except (AssertionError, struct.error):  # corrupt or truncated
+            # NOTE: Windows can't remove a mapped file, read_sections released its views
+            if mapped is not None:
+                mapped.close()
+            os.remove(index_path)
+            self.misses += 1
+            return None
+        os.utime(index_path)  # most recently used
+        self.hits += 1
+        return sections
+
+    def save(self, parsed_file, sections: Dict[str, bytes]):
+        index_path = self.index_path(parsed_file)
+        offset = header.size + section_header.size * len(sections)
+        table = list()
+        for name, data in sections.items():
+            assert len(name.encode()) <= 16, f"section name {name!r} is too long"
+            table.append(section_header.pack(name.encode(), offset, len(data)))
+            offset += len(data)
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as index_file:
+            index_file.write(header.pack(b"BKIX", format_version, len(sections)))
+            index_file.write(b"".join(table))
+            for data in sections.values():
+                index_file.write(data)
+        os.replace(temp_path, index_path)  # atomic, readers never see half an index
+        # invalidate older indices of the same file
+        path_hash = os.path.basename(index_path).partition("-")[0]
+        for filename in self.index_files():
+            if filename.startswith(f"{path_hash}-") and filename != os.path.basename(index_path):
+                os.remove(os.path.join(self.folder, filename))
+        self.trim()
+
+    def trim(self):
+        """delete least recently used indices until we're under max_size"""
+        index_files = sorted(self.index_files().items(), key=lambda f: f[1].st_mtime)
+        total_size = sum(stat.st_size for filename, stat in index_files)
+        for filename, stat in index_files:
+            if total_size <= self.max_size:
+                break
+            os.remove(os.path.join(self.folder, filename))
+            total_size -= stat.st_size
+
+
+class ListingCache:
+    """os.listdir results, shared by every FriendlyFile on disk"""
+    # NOTE: revalidated against the folder's mtime on every lookup
+    # -- call .invalidate after changing a folder if its filesystem has coarse timestamps
+    listings: Dict[str, Tuple[int, Dict[str, str]]]
+    # ^ {abspath: (mtime_ns, {os.path.normcase(filename): filename})}
+    lock: threading.Lock
+    # metrics
+    hits: int
+    misses: int  # includes folders which changed since they were listed
+
+    def __init__(self):
+        self.listings = dict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        descriptor = f"{len(self.listings)} folders ({self.hits} hits, {self.misses} misses)"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def invalidate(self, folder: str = None):
+        """forget one folder, or all of them"""
+        with self.lock:
+            if folder is None:
+                self.listings.clear()
+            else:
+                self.listings.pop(os.path.abspath(folder), None)
+
+    def listdir(self, folder: str) -> List[str]:
+        return list(self.names(folder).values())
+
+    def lookup(self, folder: str, filename: str) -> Union[str, None]:
+        """filename as it appears in folder, w/o scanning the folder"""
+        return self.names(folder).get(os.path.normcase(filename))
+
+    def metrics(self) -> Dict[str, int]:
+        return {"folders": len(self.listings), "hits": self.hits, "misses": self.misses}
+
+    def names(self, folder: str) -> Dict[str, str]:
+        """{os.path.normcase(filename): filename}"""
+        folder = os.path.abspath(folder)
+        mtime = os.stat(folder).st_mtime_ns
+        with self.lock:
+            listing = self.listings.get(folder)
+            if listing is not None and listing[0] == mtime:
+                self.hits += 1
+                return listing[1]
+            self.misses += 1
+        names = {os.path.normcase(filename): filename for filename in os.listdir(folder)}
+        with self.lock:
+            self.listings[folder] = (mtime, names)
+        return names
+
+
+listing_cache = ListingCache()
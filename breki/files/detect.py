@@ -0,0 +1,76 @@
+from __future__ import annotations
+import fnmatch
+import os
+from typing import Dict, List, Tuple, Union
+
+from . import base
+from . import parsed
+
+
+window_size = parsed.window_size  # minimum head & tail, for predicates
+
+
+class FormatRegistry:
+    """ranks ParsedFile classes which could open a file by their .probes"""
+    # NOTE: .probes only need a small head & tail window, so a wrong guess costs 1 read, not 1 failed parse
+    formats: Dict[str, List[parsed.ParsedFile]]
+    # ^ {"*.ext": [cls]}, preferred class first
+
+    def __init__(self, formats: Dict[str, List[parsed.ParsedFile]] = None):
+        self.formats = dict()
+        for pattern, classes in (formats or dict()).items():
+            for cls in classes:
+                self.register(cls, [pattern])
+
+    def __repr__(self) -> str:
+        num_classes = len({cls for classes in self.formats.values() for cls in classes})
+        descriptor = f"{num_classes} classes for {len(self.formats)} patterns"
+        return f"<{self.__class__.__name__} {descriptor} @ 0x{id(self):016X}>"
+
+    def candidates(self, filename: str) -> List[parsed.ParsedFile]:
+        """every class registered to a pattern matching filename"""
+        out = list()
+        for pattern, classes in self.formats.items():
+            if fnmatch.fnmatch(filename, pattern):
+                out.extend(cls for cls in classes if cls not in out)
+        return out
+
+    def detect(self, filepath: str, archive=None) -> Union[parsed.ParsedFile, None]:
+        """best candidate, or None if every candidate's probes failed"""
+        ranking = self.rank(filepath, archive)
+        return ranking[0] if len(ranking) != 0 else None
+
+    def rank(self, filepath: str, archive=None) -> List[parsed.ParsedFile]:
+        """candidates whose probes passed, most probes passed first"""
+        candidates = self.candidates(os.path.basename(filepath))
+        if len(candidates) == 0:
+            return list()
+        head, tail = self.window(filepath, archive, candidates)
+        scores = {cls: cls.sniff(head, tail) for cls in candidates}
+        # NOTE: sorted is stable, ties keep their registered order
+        return sorted(
+            [cls for cls in candidates if scores[cls] != -1],
+            key=lambda cls: -scores[cls])
+
+    def register(self, cls: parsed.ParsedFile, patterns: List[str] = None):
+        """patterns default to cls.exts"""
+        patterns = cls.exts if patterns is None else patterns
+        for pattern in patterns:
+            classes = self.formats.setdefault(pattern, list())
+            if cls not in classes:
+                classes.append(cls)
+
+    def window(self, filepath: str, archive, candidates: List[parsed.ParsedFile]) -> Tuple[bytes, bytes]:
+        """(head, tail) big enough for every candidate's probes"""
+        head_size, tail_size = window_size, window_size
+        for cls in candidates:
+            cls_head_size, cls_tail_size = cls.probe_window()
+            head_size = max(head_size, cls_head_size)
+            tail_size = max(tail_size, cls_tail_size)
+        if archive is None:
+            file = base.File.from_file(filepath, base.DataType.BINARY)
+        else:
+            file = base.File.from_archive(archive, filepath, base.DataType.BINARY)
+        # NOTE: .buffer is memory-mapped, so only the head & tail are read from disk
+        buffer = file.buffer
+        return bytes(buffer[:head_size]), bytes(buffer[max(len(buffer) - tail_size, 0):])
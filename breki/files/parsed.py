@@ -3,16 +3,68 @@ import fnmatch
 import functools
 import io
 import os
-from typing import Dict, List
+import re
+import shutil
+import struct
+import tempfile
+from typing import Callable, Dict, Generator, List, Tuple, Union
 
 from . import base
+from . import cache
+
+
+chunk_size = 2 ** 20  # for .as_chunks implementations which copy from a stream
+window_size = 4096  # minimum head & tail, for .probes predicates
+umask = os.umask(0o022)
+os.umask(umask)
+# ^ process umask at import, for the mode of files .save_as creates (os.umask can only be read by setting it)
+
+Probe = Union[Tuple[int, bytes], Callable[[bytes, bytes], bool]]
+# ^ (offset, b"magic") or predicate(head, tail)
+# NOTE: negative offsets are relative to the end of the file
+
+FriendPatterns = Tuple[Dict[str, base.DataType], Union[re.Pattern, None], List[base.DataType]]
+# ^ ({os.path.normcase(filename): type_}, globs as one regex, [type_ of each glob])
+
+
+@functools.lru_cache(maxsize=256)
+def compile_friend_patterns(patterns: Tuple[Tuple[str, base.DataType], ...]) -> FriendPatterns:
+    """split exact filenames (looked up directly) from globs (matched by one regex)"""
+    # NOTE: os.path.normcase is applied to both sides, just like fnmatch.fnmatch
+    exact, globs, glob_types = dict(), list(), list()
+    for pattern, type_ in patterns:
+        pattern = os.path.normcase(pattern)
+        if any(c in pattern for c in "*?["):
+            globs.append(f"(?P<friend_{len(globs)}>{fnmatch.translate(pattern)})")
+            glob_types.append(type_)
+        else:
+            exact[pattern] = type_
+    regex = re.compile("|".join(globs)) if len(globs) > 0 else None
+    return exact, regex, glob_types
+
+
+def match_friends(names: Dict[str, str], patterns: Dict[str, base.DataType]) -> Dict[str, base.DataType]:
+    """{filename: type_} for each of names that matches a friend pattern"""
+    # NOTE: names is {os.path.normcase(filename): filename}
+    exact, regex, glob_types = compile_friend_patterns(tuple(patterns.items()))
+    friends = dict()
+    for name, type_ in exact.items():
+        if name in names:  # no need to scan the whole folder
+            friends[names[name]] = type_
+    if regex is not None:
+        for name, filename in names.items():
+            match = regex.match(name)
+            if match is not None:
+                friends[filename] = glob_types[int(match.lastgroup[len("friend_"):])]
+    return friends
 
 
 def parse_first(method):
     def wrapper(self, *args, **kwargs):
-        if not self.is_parsed:
-            self.parse()
-            self.is_parsed = True
+        with self.lock:  # wait for .parse() in another thread to finish
+            if not self.is_parsed:
+                self.parse()
+                self.is_parsed = True
         return method(self, *args, **kwargs)
     return wrapper
 
@@ -21,8 +73,11 @@ class ParsedFile(base.File):
     exts: List[str] = list()  # class-level definition
     # ^ ["*.ext"]
     # NOTE: just a hint, not enforced
+    probes: List[Probe] = list()  # class-level definition
+    # ^ cheap checks against the head & tail of a file, see .sniff
     is_parsed: bool
     log: List[str]
+    index_cache: cache.IndexCache = None  # opt-in, can be set per class
 
     def __init__(self, filepath: str, archive=None, code_page=None):
         super().__init__(filepath, archive, code_page)
@@ -31,12 +86,77 @@ class ParsedFile(base.File):
 
     def as_bytes(self) -> bytes:
         """unparser"""
-        return b"\n".join(map(self.code_page.encode, self.as_lines()))
+        return b"".join(self.as_chunks())
+
+    def as_chunks(self) -> Generator[bytes, None, None]:
+        """unparser, one piece at a time so .save_as never holds the whole file"""
+        # NOTE: subclasses which only override .as_bytes (the old unparser) still work
+        if type(self).as_bytes is not ParsedFile.as_bytes:
+            yield self.as_bytes()
+            return
+        for i, line in enumerate(self.as_lines()):
+            yield self.code_page.encode(line) if i == 0 else b"\n" + self.code_page.encode(line)
 
     def as_lines(self) -> List[str]:
         """unparser"""
         raise NotImplementedError()
 
+    def index_as_sections(self) -> Dict[str, bytes]:
+        """parsed index -> {name: section} for .index_cache"""
+        raise NotImplementedError()
+
+    def index_from_sections(self, sections: Dict[str, memoryview]):
+        """inverse of .index_as_sections"""
+        raise NotImplementedError()
+
+    def load_index(self) -> bool:
+        """True if parse can be skipped"""
+        if self.index_cache is None or not self.is_on_disk:
+            return False
+        sections = self.index_cache.load(self)
+        if sections is None:
+            return False
+        self.index_from_sections(sections)
+        return True
+
+    @classmethod
+    def probe_window(cls) -> Tuple[int, int]:
+        """(head_size, tail_size) needed by .probes"""
+        head_size, tail_size = 0, 0
+        for probe in cls.probes:
+            if not callable(probe):
+                offset, magic = probe
+                if offset < 0:
+                    tail_size = max(tail_size, -offset)
+                else:
+                    head_size = max(head_size, offset + len(magic))
+        return head_size, tail_size
+
+    @classmethod
+    def sniff(cls, head: bytes, tail: bytes) -> int:
+        """number of .probes passed, -1 if any failed"""
+        # NOTE: predicates can index head & tail without checking their length
+        for probe in cls.probes:
+            if callable(probe):
+                try:
+                    if not probe(head, tail):
+                        return -1
+                except (IndexError, ValueError, struct.error):  # window too small
+                    return -1
+            else:
+                offset, magic = probe
+                if offset < 0:
+                    window, offset = tail, len(tail) + offset
+                else:
+                    window = head
+                if offset < 0 or window[offset:offset + len(magic)] != magic:
+                    return -1
+        return len(cls.probes)
+
+    def save_index(self):
+        if self.index_cache is not None and self.is_on_disk:
+            self.index_cache.save(self, self.index_as_sections())
+
     def parse(self):
         """deferred post-init stage"""
         raise NotImplementedError()
@@ -48,8 +168,27 @@ class ParsedFile(base.File):
 
     def save_as(self, filepath: str):
         """save changes to file"""
-        with open(filepath, "wb") as out_file:
-            out_file.write(self.as_bytes())
+        # NOTE: chunks can be read from filepath, so we only replace it once they're all written
+        link_path, filepath = filepath, os.path.realpath(filepath)  # replace a symlink's target, not the symlink
+        folder, filename = os.path.split(filepath)
+        handle, temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=folder)
+        try:
+            with os.fdopen(handle, "wb") as out_file:
+                for chunk in self.as_chunks():
+                    out_file.write(chunk)
+            if os.path.exists(filepath):
+                shutil.copymode(filepath, temp_path)
+            else:  # mkstemp creates files w/ 0o600
+                os.chmod(temp_path, 0o666 & ~umask)
+            for path in {link_path, filepath}:
+                base.handle_pool.close(path)  # stale after replace (& Windows can't replace open files)
+            os.replace(temp_path, filepath)  # atomic, readers never see half a file
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        for path in {link_path, filepath}:
+            cache.listing_cache.invalidate(os.path.dirname(os.path.abspath(path)))
 
     # intialisers
     # NOTE: wrapped to enforce cls.type
@@ -97,28 +236,28 @@ class FriendlyFile(ParsedFile):
         """post-initialisation friend collection"""
         # NOTE: friends can be found in all sorts of places
         archive = self.archive if archive is None else archive
-        if candidates is None:
-            # NOTE: is self.archive is not None, candidates must be provided
-            # -- if you want to make friends in self.folder outside of archives
-            if archive is None:
-                neighbours = os.listdir(self.folder)
+        names = self.friend_candidates(candidates, archive)
+        for filename, type_ in match_friends(names, self.friend_patterns).items():
+            if candidates is not None:
+                filepath = candidates[filename]
             else:
-                neighbours = archive.listdir(self.folder)
-            candidates = {
-                filename: os.path.join(self.folder, filename)
-                for filename in neighbours}
-        friends = {
-            filename: (filepath, type_)
-            for filename, filepath in candidates.items()
-            for pattern, type_ in self.friend_patterns.items()
-            if fnmatch.fnmatch(filename, pattern)}
-        for filename, (filepath, type_) in friends.items():
+                filepath = os.path.join(self.folder, filename)
             if archive is not None:
                 friend = base.File.from_archive(archive, filepath, type_)
             else:
                 friend = base.File.from_file(filepath, type_)
             self.friends[filename] = friend
 
+    def friend_candidates(self, candidates: Dict[str, str] = None, archive=None) -> Dict[str, str]:
+        """{os.path.normcase(filename): filename} of files we could befriend"""
+        if candidates is not None:
+            return {os.path.normcase(filename): filename for filename in candidates}
+        # NOTE: is self.archive is not None, candidates must be provided
+        # -- if you want to make friends in self.folder outside of archives
+        if archive is None:
+            return cache.listing_cache.names(self.folder)
+        return {os.path.normcase(filename): filename for filename in archive.listdir(self.folder)}
+
     @functools.cached_property
     def friend_patterns(self) -> Dict[str, base.DataType]:
         """glob patterns for files we can befriend"""
@@ -147,9 +286,11 @@ class BinaryFile(ParsedFile):
     # -- except FileNotFoundError():
     # --     stream = io.BytesIO(self._default)
 
-    def as_bytes(self) -> bytes:
+    def as_chunks(self) -> Generator[bytes, None, None]:
         """unparser"""
-        raise NotImplementedError()
+        if type(self).as_bytes is ParsedFile.as_bytes:
+            raise NotImplementedError()
+        yield self.as_bytes()  # subclass only overrides .as_bytes
 
     # initialisers
     @classmethod
@@ -208,9 +349,11 @@ class HybridFile(ParsedFile):
     # --     else:
     # --         raise RuntimeError(f"invalid _default type: {type(self._default)}")
 
-    def as_bytes(self) -> List[str]:
+    def as_chunks(self) -> Generator[bytes, None, None]:
         """binary unparser"""
-        raise NotImplementedError()
+        if type(self).as_bytes is ParsedFile.as_bytes:
+            raise NotImplementedError()
+        yield self.as_bytes()  # subclass only overrides .as_bytes
 
     def as_lines(self) -> List[str]:
         """text unparser"""
@@ -221,11 +364,23 @@ class HybridFile(ParsedFile):
     def identify(cls, filepath: str, stream: base.ByteStream) -> base.DataType:
         """determine type if ambiguous"""
         # get DataType from extension
-        for pattern, type_ in cls.exts.items():
+        type_ = base.DataType.EITHER
+        for pattern, ext_type in cls.exts.items():
             if fnmatch.fnmatch(filepath, pattern):
-                return type_
-        else:
-            return base.DataType.EITHER
+                type_ = ext_type
+                break
+        if type_ != base.DataType.EITHER or len(cls.probes) == 0:
+            return type_
+        # NOTE: .probes describe the binary format, so passing them means BINARY
+        head_size, tail_size = (max(size, window_size) for size in cls.probe_window())
+        position = stream.tell()
+        length = stream.seek(0, os.SEEK_END)
+        stream.seek(position)
+        head = base.read_at(stream, 0, head_size)
+        tail = base.read_at(stream, max(length - tail_size, 0), tail_size)
+        if cls.sniff(head, tail) > 0:
+            return base.DataType.BINARY
+        return base.DataType.EITHER
         # NOTE: subclasses should do further testing for patterns w/ type EITHER
         # -- brute force solution: (checks every byte)
         # -- stream.seek(0)
@@ -267,7 +422,7 @@ class HybridFile(ParsedFile):
         self.type = type_
         return stream
 
-    stream = functools.cached_property(_get_stream)
+    stream = base.locked_cached_property(_get_stream)
 
     # initialisers
     @classmethod
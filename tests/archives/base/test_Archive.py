@@ -0,0 +1,109 @@
+from __future__ import annotations
+from typing import List
+
+import pytest
+
+from breki.archives.base import Archive
+from breki.files.parsed import BinaryFile
+
+
+class DictArchive(Archive, BinaryFile):
+    exts = ["*.test"]
+    entries: List[str]
+
+    def __init__(self, filepath: str, entries: List[str]):
+        super().__init__(filepath)
+        self.entries = list(entries)
+        self.is_parsed = True  # nothing to parse
+
+    def namelist(self) -> List[str]:
+        return sorted(self.entries)
+
+    def read(self, filename: str) -> bytes:
+        return filename.encode()
+
+
+entries = [
+    "readme.txt",
+    "maps/test.bsp",
+    "materials/brick/wall01.vmt",
+    "materials/brick/wall01.vtf",
+    "materials/concrete/floor01.vmt",
+    "models/props/crate.mdl"]
+
+
+def test_is_dir():
+    archive = DictArchive("test.test", entries)
+    for root in (".", "./", "/", ""):
+        assert archive.is_dir(root)
+    assert archive.is_dir("materials")
+    assert archive.is_dir("./materials/brick/")
+    assert archive.is_dir("materials\\concrete")
+    assert not archive.is_dir("materials/brick/wall01.vmt")
+    assert not archive.is_dir("sound")
+    assert archive.is_file("./readme.txt")
+    assert not archive.is_file("materials")
+    assert archive.path_exists("models/props") and archive.path_exists("maps/test.bsp")
+
+
+def test_listdir():
+    archive = DictArchive("test.test", entries)
+    assert archive.listdir(".") == ["maps/", "materials/", "models/", "readme.txt"]
+    assert archive.listdir("materials") == ["brick/", "concrete/"]
+    assert archive.listdir("./materials/brick/") == ["wall01.vmt", "wall01.vtf"]
+    with pytest.raises(FileNotFoundError):
+        archive.listdir("sound")
+    with pytest.raises(FileNotFoundError):
+        archive.listdir("readme.txt")
+
+
+def test_walk():
+    archive = DictArchive("test.test", [*entries, "./scripts/test.txt"])
+    assert sorted(archive.walk()) == sorted(archive.namelist())
+    assert sorted(archive.walk("materials/")) == [
+        "materials/brick/wall01.vmt",
+        "materials/brick/wall01.vtf",
+        "materials/concrete/floor01.vmt"]
+    assert list(archive.walk("scripts")) == ["./scripts/test.txt"]  # as it appears in .namelist()
+    with pytest.raises(FileNotFoundError):
+        list(archive.walk("sound"))
+
+
+def test_tree(capsys):
+    archive = DictArchive("test.test", entries)
+    archive.tree()
+    assert capsys.readouterr().out.split("\n")[:6] == [
+        "maps/", "  test.bsp", "materials/", "  brick/", "    wall01.vmt", "    wall01.vtf"]
+
+
+def test_folder_entries():
+    """.zip files can list folders, which end in '/'"""
+    archive = DictArchive("test.test", ["empty/", "maps/", "maps/test.bsp"])
+    assert archive.listdir(".") == ["empty/", "maps/"]
+    assert archive.listdir("empty") == []
+    assert not archive.is_file("empty")
+
+
+def test_invalidate():
+    archive = DictArchive("test.test", entries)
+    assert not archive.is_dir("sound")
+    archive.entries.append("sound/ambience/wind.wav")
+    assert not archive.is_dir("sound")  # cached
+    archive.invalidate()
+    assert archive.is_dir("sound/ambience")
+    assert archive.listdir(".") == ["maps/", "materials/", "models/", "readme.txt", "sound/"]
+
+
+def test_names():
+    archive = DictArchive("test.test", entries)
+    names = archive.names
+    assert names is archive.names  # cached
+    assert names == archive.namelist()
+    assert "maps/test.bsp" in names and "maps" not in names
+    assert names.index("maps/test.bsp") == archive.namelist().index("maps/test.bsp")
+    with pytest.raises(ValueError):
+        names.index("maps")
+    assert list(names[:2]) == archive.namelist()[:2]
+    archive.entries.append("maps/test2.bsp")
+    archive.invalidate()
+    assert len(archive.names) == len(entries) + 1
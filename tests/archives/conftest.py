@@ -0,0 +1,27 @@
+import zipfile
+
+import pytest
+
+from breki.archives import cdrom, id_software, ion_storm, pkware, ritual, utoplanet, valve
+
+from .samples import contents, raw_apk, raw_dat, raw_iso, raw_pak, raw_sin, raw_vpks
+
+
+@pytest.fixture
+def archives(tmp_path):
+    """{name: archive}, unparsed"""
+    dir_vpk, archive_vpk = raw_vpks()
+    (tmp_path / "test_dir.vpk").write_bytes(dir_vpk)
+    (tmp_path / "test_000.vpk").write_bytes(archive_vpk)
+    (tmp_path / "test.iso").write_bytes(raw_iso())
+    with zipfile.ZipFile(str(tmp_path / "test.zip"), "w") as zip_file:
+        for i, (filename, data) in enumerate(contents.items()):
+            zip_file.writestr(filename, data, zipfile.ZIP_DEFLATED if i % 2 else zipfile.ZIP_STORED)
+    return {
+        "Apk": utoplanet.Apk.from_bytes("test.apk", raw_apk()),
+        "Dat": ion_storm.Dat.from_bytes("test.dat", raw_dat()),
+        "Iso": cdrom.Iso.from_file(str(tmp_path / "test.iso")),
+        "Pak": id_software.Pak.from_bytes("test.pak", raw_pak()),
+        "Sin": ritual.Sin.from_bytes("test.sin", raw_sin()),
+        "Vpk": valve.Vpk.from_file(str(tmp_path / "test_dir.vpk")),
+        "Zip": pkware.Zip.from_file(str(tmp_path / "test.zip"))}
@@ -81,3 +81,12 @@ def test_save_changes():
     assert zip_1.namelist() == zip_2.namelist()
     for filename in zip_1.namelist():
         assert zip_1.read(filename) == zip_2.read(filename)
+
+
+def test_writestr():
+    zip_ = pkware.Zip.from_bytes("empty.zip", zips["empty.zip"])
+    assert zip_.listdir(".") == []
+    zip_.writestr("maps/test.bsp", b"VBSP")
+    assert zip_.names == ["maps/test.bsp"]  # invalidated
+    assert zip_.listdir(".") == ["maps/"]
+    assert zip_.read("maps/test.bsp") == b"VBSP"
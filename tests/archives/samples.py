@@ -0,0 +1,117 @@
+"""synthetic archives for tests/archives, each stores the same contents"""
+import struct
+import zipfile
+import zlib
+
+from breki.archives import cdrom
+
+
+contents = {f"FILE_{i:02d}.BIN": bytes([i]) * (1000 + i * 1531) for i in range(12)}
+# ^ {filename: data}, different lengths so misplaced reads show
+
+
+def raw_pak(folder: str = "") -> bytes:
+    data = b"".join(contents.values())
+    entries = list()
+    offset = 12
+    for filename, file_data in contents.items():
+        entries.append(struct.pack("56s2I", f"{folder}{filename}".encode(), offset, len(file_data)))
+        offset += len(file_data)
+    return b"PACK" + struct.pack("2I", offset, len(entries) * 64) + data + b"".join(entries)
+
+
+def raw_vpks() -> (bytes, bytes):
+    """(_dir.vpk, _000.vpk); even files in the tree, odd files in _000"""
+    tree = b"BIN\x00 \x00"
+    dir_data, archive_data = b"", b""
+    for i, (filename, data) in enumerate(contents.items()):
+        tree += filename[:-4].encode() + b"\x00"
+        if i % 2 == 0:
+            tree += struct.pack("I2H2I", zlib.crc32(data), 0, 0x7FFF, len(dir_data), len(data)) + b"\xFF\xFF"
+            dir_data += data
+        else:
+            tree += struct.pack("I2H2I", zlib.crc32(data), 0, 0, len(archive_data), len(data)) + b"\xFF\xFF"
+            archive_data += data
+    tree += b"\x00\x00\x00"
+    return struct.pack("I2HI", 0x55AA1234, 1, 0, len(tree)) + tree + dir_data, archive_data
+
+
+def raw_record(name: bytes, lba: int, size: int, is_dir: bool = False) -> bytes:
+    length = 33 + len(name) + ((len(name) + 1) % 2)
+    return b"".join([
+        struct.pack("<2B", length, 0),
+        struct.pack("<I", lba), struct.pack(">I", lba),
+        struct.pack("<I", size), struct.pack(">I", size),
+        bytes([99, 12, 31, 23, 59, 59, 0]),
+        bytes([cdrom.FileFlag.DIRECTORY if is_dir else 0, 0, 0]),
+        struct.pack("<H", 1), struct.pack(">H", 1),
+        bytes([len(name)]), name,
+        b"\x00" if len(name) % 2 == 0 else b""])
+
+
+def both_endian(format_: str, value: int) -> bytes:
+    return struct.pack(f"<{format_}", value) + struct.pack(f">{format_}", value)
+
+
+def raw_iso() -> bytes:
+    """PVD @ 16, terminator @ 17, path table @ 18, root @ 20, files from 21"""
+    sectors = [b""] * 21
+    records = [raw_record(b"\x00", 20, 2048, True), raw_record(b"\x01", 20, 2048, True)]
+    for filename, data in contents.items():
+        records.append(raw_record(f"{filename};1".encode(), len(sectors), len(data)))
+        sectors.extend(data[i:i + 2048] for i in range(0, len(data), 2048))
+    sectors[20] = b"".join(records)
+    path_table = struct.pack("<2BIH", 1, 0, 20, 1) + b"\x00\x00"
+    sectors[18] = path_table
+    sectors[16] = b"".join([
+        b"\x01CD001\x01\x00", b" " * 32, b"TEST".ljust(32), b"\x00" * 8,
+        both_endian("I", len(sectors)), b"\x00" * 32,
+        both_endian("H", 1), both_endian("H", 1), both_endian("H", 2048),
+        both_endian("I", len(path_table)),
+        struct.pack("<2I", 18, 0), struct.pack(">2I", 19, 0),
+        raw_record(b"\x00", 20, 2048, True),
+        b" " * 128 * 4, b" " * 37 * 3, (b"0" * 16 + b"\x00") * 4,
+        b"\x01\x00", b" " * 512, b"\x00" * 653])
+    sectors[17] = b"\xFFCD001\x01"
+    return b"".join(sector.ljust(2048, b"\x00") for sector in sectors)
+
+
+def raw_zip(filepath: str):
+    with zipfile.ZipFile(filepath, "w") as zip_file:
+        for filename, data in contents.items():
+            zip_file.writestr(filename, data)
+
+
+def raw_dat() -> bytes:
+    """odd files are zlib compressed"""
+    data, entries, offset = list(), list(), 16
+    for i, (filename, file_data) in enumerate(contents.items()):
+        stored = zlib.compress(file_data) if i % 2 else file_data
+        compressed_length = len(stored) if i % 2 else 0
+        entries.append(struct.pack("128s4I", filename.encode(), offset, len(file_data), compressed_length, 0))
+        data.append(stored)
+        offset += len(stored)
+    header = struct.pack("4s3I", b"ADAT", offset, len(entries) * 144, 9)
+    return header + b"".join(data) + b"".join(entries)
+
+
+def raw_sin() -> bytes:
+    data = b"".join(contents.values())
+    entries, offset = list(), 12
+    for filename, file_data in contents.items():
+        entries.append(struct.pack("120s2I", filename.encode(), offset, len(file_data)))
+        offset += len(file_data)
+    return b"SPAK" + struct.pack("2I", offset, len(entries) * 0x80) + data + b"".join(entries)
+
+
+def raw_apk() -> bytes:
+    data = b"".join(contents.values())
+    dir_offset = 16 + len(data)
+    entries, offset = list(), 16
+    for filename, file_data in contents.items():
+        next_entry_offset = dir_offset + sum(map(len, entries)) + 4 + len(filename) + 1 + 16
+        entries.append(b"".join([
+            struct.pack("I", len(filename)), filename.encode() + b"\x00",
+            struct.pack("4I", offset, len(file_data), next_entry_offset, 0)]))
+        offset += len(file_data)
+    return struct.pack("4s3I", b"\x57\x23\x00\x00", 16, len(contents), dir_offset) + data + b"".join(entries)
@@ -0,0 +1,54 @@
+"""archives.detect picks the right class for ambiguous extensions"""
+import struct
+import zipfile
+
+import pytest
+
+from breki.archives import id_software, ion_storm, pkware, runecraft, troika, valve
+from breki import archives
+
+
+def raw_pak(sizeof_entry: int, num_entries: int = 8) -> bytes:
+    """id_software.Pak w/ sizeof_entry=64, ion_storm.Pak w/ sizeof_entry=72"""
+    # NOTE: 8 * 72 % 64 == 0
+    data = b"".join(bytes([i]) * (i + 1) * 100 for i in range(num_entries))
+    entries, offset = list(), 12
+    for i in range(num_entries):
+        entry = struct.pack("56s2I", f"folder/file_{i}.bin".encode(), offset, (i + 1) * 100)
+        entries.append(entry.ljust(sizeof_entry, b"\x00"))
+        offset += (i + 1) * 100
+    return b"PACK" + struct.pack("2I", offset, sizeof_entry * num_entries) + data + b"".join(entries)
+
+
+@pytest.mark.parametrize("raw_bytes,archive_class", [
+    (raw_pak(64), id_software.Pak),
+    (raw_pak(72), ion_storm.Pak),
+    (b"NPCK" + b"\x00" * 4, runecraft.Pak)])
+def test_pak(tmp_path, raw_bytes: bytes, archive_class):
+    (tmp_path / "test.pak").write_bytes(raw_bytes)
+    assert archives.detect(str(tmp_path / "test.pak")) is archive_class
+    archive = archive_class.from_file(str(tmp_path / "test.pak"))
+    archive.parse()
+
+
+@pytest.mark.parametrize("raw_bytes,archive_class", [
+    (struct.pack("I2HI", 0x55AA1234, 1, 0, 1) + b"\x00", valve.Vpk),
+    (b"data" + struct.pack("I", 8) + b"test.bin" + struct.pack("2I", 0, 4) + struct.pack("2IB", 1, 4, 0), troika.Vpk),
+    (b"data" + struct.pack("I", 8) + b"test.bin" + struct.pack("2I", 0, 4) + struct.pack("2IB", 1, 4, 1), troika.Vpk)])
+def test_vpk(tmp_path, raw_bytes: bytes, archive_class):
+    (tmp_path / "pack000.vpk").write_bytes(raw_bytes)
+    assert archives.detect(str(tmp_path / "pack000.vpk")) is archive_class
+
+
+def test_archived(tmp_path):
+    zip_path = str(tmp_path / "test.zip")
+    with zipfile.ZipFile(zip_path, "w") as zip_file:
+        zip_file.writestr("maps/test.pak", raw_pak(72))
+    zip_file = pkware.Zip.from_file(zip_path)
+    assert archives.detect("maps/test.pak", zip_file) is ion_storm.Pak
+
+
+def test_unknown(tmp_path):
+    (tmp_path / "test.pak").write_bytes(b"JUNK" * 4)
+    with pytest.raises(RuntimeError):
+        archives.detect(str(tmp_path / "test.pak"))
@@ -0,0 +1,51 @@
+"""Archive.extract_all plans folders once & extracts in stored order"""
+import os
+import struct
+
+import pytest
+
+from breki.archives import base, id_software, ion_storm
+
+from .samples import contents, raw_dat, raw_pak
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_extract_all(tmp_path, workers: int):
+    pak = id_software.Pak.from_bytes("test.pak", raw_pak("maps/"))
+    metrics = pak.extract_all(str(tmp_path), workers=workers)
+    for filename, data in contents.items():
+        assert (tmp_path / "maps" / filename).read_bytes() == data
+    assert metrics["files"] == len(contents)
+    assert metrics["bytes"] == sum(map(len, contents.values()))
+    assert metrics["mb_per_second"] > 0 and metrics["files_per_second"] > 0
+
+
+def test_copy_range(tmp_path, monkeypatch):
+    """stored files over base.copy_threshold are copied w/o .read()"""
+    (tmp_path / "test.pak").write_bytes(raw_pak())
+    pak = id_software.Pak(str(tmp_path / "test.pak"))
+    monkeypatch.setattr(base, "copy_threshold", 0)
+    monkeypatch.setattr(pak, "read", None)  # not called
+    pak.extract_all(str(tmp_path / "out"), workers=2)
+    for filename, data in contents.items():
+        assert (tmp_path / "out" / filename).read_bytes() == data
+
+
+def test_compressed(tmp_path):
+    dat = ion_storm.Dat.from_bytes("test.dat", raw_dat())
+    dat.extract_all(str(tmp_path), workers=4)
+    assert {fn: (tmp_path / fn).read_bytes() for fn in os.listdir(tmp_path)} == contents
+
+
+def test_physical_order():
+    pak = id_software.Pak.from_bytes("test.pak", raw_pak())
+    names = list(contents)
+    assert pak.physical_order(reversed(names)) == names
+
+
+def test_outside_to_path(tmp_path):
+    entry = struct.pack("56s2I", b"../escape.txt", 12, 4)
+    pak = id_software.Pak.from_bytes("test.pak", b"PACK" + struct.pack("2I", 16, len(entry)) + b"data" + entry)
+    with pytest.raises(ValueError):
+        pak.extract_all(str(tmp_path / "out"))
+    assert not (tmp_path / "escape.txt").exists()
@@ -0,0 +1,78 @@
+"""Archive.getinfo reports sizes & offsets w/o reading file data"""
+import zlib
+
+import pytest
+
+from breki.archives import base
+
+from .samples import contents
+
+
+@pytest.mark.parametrize("archive_name", ["Apk", "Dat", "Iso", "Pak", "Sin", "Vpk", "Zip"])
+def test_getinfo(archives, archive_name: str):
+    archive = archives[archive_name]
+    assert sorted(archive.namelist()) == sorted(contents)
+    expected = {filename: archive.read(filename) for filename in contents}
+
+    def no_read(filename: str):
+        raise AssertionError(f"read {filename!r}")
+
+    archive.read = no_read
+    for info in archive.infolist():
+        assert isinstance(info, base.EntryInfo)
+        data = expected[info.filename]
+        assert info.size == len(data) == archive.sizeof(info.filename)
+        if not info.is_compressed:
+            assert info.stored_size == info.size
+            entry_range = archive.entry_range(info.filename)
+            if entry_range is None:  # pkware.Zip
+                assert archive.read_at(info.offset, info.size) == data
+            else:
+                stream, offset, length = entry_range
+                assert (offset, length) == (info.offset, info.size)
+                stream.seek(offset)
+                assert stream.read(length) == data
+        if info.checksum is not None:
+            assert info.checksum == zlib.crc32(data)
+
+
+def test_compressed(archives):
+    dat = archives["Dat"]
+    info = dat.getinfo("FILE_01.BIN")
+    assert info.compression == "zlib"
+    assert info.stored_size == len(zlib.compress(contents["FILE_01.BIN"]))
+    assert dat.read_at(info.offset, info.stored_size) == zlib.compress(contents["FILE_01.BIN"])
+    zip_info = archives["Zip"].getinfo("FILE_01.BIN")
+    assert zip_info.compression == "deflate"
+    assert zip_info.checksum == zlib.crc32(contents["FILE_01.BIN"])
+    raw = archives["Zip"].read_at(zip_info.offset, zip_info.stored_size)
+    assert zlib.decompress(raw, -15) == contents["FILE_01.BIN"]
+
+
+def test_zip_lazy_offset(archives, monkeypatch):
+    """.sizeof & .infolist are central directory lookups, only .offset reads a local header"""
+    zip_file = archives["Zip"]
+    zip_file.parse()
+    reads = list()
+    read_at = zip_file.read_at
+    monkeypatch.setattr(zip_file, "read_at", lambda offset, length: reads.append(offset) or read_at(offset, length))
+    assert [zip_file.sizeof(filename) for filename in contents] == list(map(len, contents.values()))
+    infos = zip_file.infolist()
+    assert reads == list()
+    offsets = [info.offset for info in infos]
+    assert len(reads) == len(contents)
+    assert [zip_file.getinfo(filename).offset for filename in contents] == offsets  # cached
+    assert len(reads) == len(contents)
+
+
+def test_fallback():
+    """ArchiveClasses w/o .getinfo or .entry_range still have .sizeof"""
+
+    class Archive(base.Archive):
+        def read(self, filename: str) -> bytes:
+            return contents[filename]
+
+    archive = Archive("test.bin")
+    with pytest.raises(NotImplementedError):
+        archive.getinfo("FILE_00.BIN")
+    assert archive.sizeof("FILE_00.BIN") == len(contents["FILE_00.BIN"])
@@ -0,0 +1,75 @@
+"""Archive.search w/ compiled queries"""
+import pytest
+
+from breki.archives import query
+
+from .base.test_Archive import DictArchive
+
+
+names = [
+    "README.TXT",
+    "maps/test.bsp",
+    "maps/test.BSP.bak",
+    "materials/brick/wall01.vmt",
+    "materials/brick/WALL01.VTF",
+    "materials/concrete/floor01.vmt",
+    "models/props/crate.mdl",
+    "models/props/.vmt"]
+
+
+@pytest.fixture
+def archive():
+    return DictArchive("test.test", names)
+
+
+@pytest.mark.parametrize("pattern,case_sensitive,expected", [
+    ("*.vmt", False, ["materials/brick/wall01.vmt", "materials/concrete/floor01.vmt", "models/props/.vmt"]),
+    ("*.vtf", False, ["materials/brick/WALL01.VTF"]),
+    ("*.vtf", True, []),
+    ("*.VTF", True, ["materials/brick/WALL01.VTF"]),
+    ("*.bsp*", False, ["maps/test.BSP.bak", "maps/test.bsp"]),
+    ("readme.txt", False, ["README.TXT"]),
+    ("readme.txt", True, []),
+    ("materials/*/wall*", False, ["materials/brick/WALL01.VTF", "materials/brick/wall01.vmt"]),
+    (["*.mdl", "*.txt"], False, ["README.TXT", "models/props/crate.mdl"])])
+def test_globs(archive, pattern, case_sensitive: bool, expected):
+    assert archive.search(pattern, case_sensitive) == expected
+
+
+def test_filters(archive):
+    assert archive.search(regexes=r"\d{2}\.v") == [
+        "materials/brick/WALL01.VTF", "materials/brick/wall01.vmt", "materials/concrete/floor01.vmt"]
+    assert archive.search(regexes=r"^m.*s/", case_sensitive=True) == [
+        "maps/test.BSP.bak", "maps/test.bsp", "materials/brick/WALL01.VTF", "materials/brick/wall01.vmt",
+        "materials/concrete/floor01.vmt", "models/props/.vmt", "models/props/crate.mdl"]
+    assert archive.search(extensions=["vmt", ".VTF"]) == [
+        "materials/brick/WALL01.VTF", "materials/brick/wall01.vmt", "materials/concrete/floor01.vmt", "models/props/.vmt"]
+    assert archive.search(extensions=".vmt", folder="./Materials/") == [
+        "materials/brick/wall01.vmt", "materials/concrete/floor01.vmt"]
+    assert archive.search("*wall*", folder="materials/brick") == ["materials/brick/WALL01.VTF", "materials/brick/wall01.vmt"]
+    assert archive.search(folder="materials/bri") == []
+    # DictArchive.read returns the filename, so sizes are len(filename)
+    assert archive.search("*.vmt", min_size=20) == ["materials/brick/wall01.vmt", "materials/concrete/floor01.vmt"]
+    assert archive.search("*.vmt", max_size=20) == ["models/props/.vmt"]
+
+
+def test_compiled(archive):
+    vmts = query.compile_query(("*.vmt",), folder="materials")
+    assert query.compile_query(("*.vmt",), folder="materials") is vmts  # cached
+    assert vmts.pattern is None and vmts.glob_extensions == (".vmt",)  # extension lookup, no scan
+    assert archive.search(vmts) == ["materials/brick/wall01.vmt", "materials/concrete/floor01.vmt"]
+    other = DictArchive("other.test", ["materials/glass.vmt"])
+    assert other.search(vmts) == ["materials/glass.vmt"]
+    # invalidated w/ .names
+    other.entries.append("materials/metal.vmt")
+    other.invalidate()
+    assert other.search(vmts) == ["materials/glass.vmt", "materials/metal.vmt"]
+
+
+def test_prefixed(archive):
+    walls = query.compile_query(("Materials/*/wall*",))
+    assert walls.pattern is None and walls.prefixed[0][0] == "materials/"  # only scans "materials/"
+    assert archive.search(walls) == ["materials/brick/WALL01.VTF", "materials/brick/wall01.vmt"]
+    models = [archive.names.index(name) for name in ("models/props/crate.mdl", "models/props/.vmt")]
+    assert sorted(archive.search_index.with_prefix("MODELS/")) == sorted(models)
+    assert archive.search("Materials/*/wall*", case_sensitive=True) == []
@@ -0,0 +1,60 @@
+"""Archive.read_many reads files in stored order, merging neighbouring reads"""
+import os
+
+import pytest
+
+from breki.archives import id_software
+from breki import files
+
+from .base.test_Archive import DictArchive
+from .samples import contents, raw_pak
+
+
+@pytest.mark.parametrize("archive_name", ["Apk", "Dat", "Iso", "Pak", "Sin", "Vpk", "Zip"])
+def test_read_many(archives, archive_name: str):
+    archive = archives[archive_name]
+    requested = list(reversed(contents))[::2]
+    out = list(archive.read_many(requested))
+    assert sorted(filename for filename, data in out) == sorted(requested)
+    assert all(data == contents[filename] for filename, data in out)
+    # full read
+    assert dict(archive.read_many(archive.namelist())) == contents
+
+
+def test_coalesce(archives, monkeypatch):
+    pak = archives["Pak"]
+    reads = list()
+
+    def read_at(stream, offset: int, length: int) -> bytes:
+        reads.append((offset, length))
+        return files.base.read_at(stream, offset, length)
+
+    monkeypatch.setattr(files, "read_at", read_at)
+    names = list(contents)
+    assert [filename for filename, data in pak.read_many(reversed(names))] == names  # stored order
+    assert reads == [(12, sum(map(len, contents.values())))]  # 1 read
+    reads.clear()
+    assert dict(pak.read_many(names[::2], max_gap=0)) == {fn: contents[fn] for fn in names[::2]}
+    assert len(reads) == len(names[::2])  # gaps are odd files
+    reads.clear()
+    assert dict(pak.read_many(names, max_read=10000)) == contents
+    sizes = set(map(len, contents.values()))
+    assert len(reads) > 1 and all(length <= 10000 or length in sizes for offset, length in reads)
+    with pytest.raises(FileNotFoundError):
+        list(pak.read_many(["missing.bin"]))
+
+
+def test_truncated(tmp_path):
+    """a truncated archive fails like .read() does, instead of yielding short data"""
+    (tmp_path / "test.pak").write_bytes(raw_pak())
+    pak = id_software.Pak.from_file(str(tmp_path / "test.pak"))
+    names = pak.namelist()  # parsed before the data is cut off
+    os.truncate(tmp_path / "test.pak", 100)
+    with pytest.raises(AssertionError):
+        list(pak.read_many(names))
+
+
+def test_fallback():
+    """ArchiveClasses w/o .entry_range use .read(), in the order given"""
+    archive = DictArchive("test.test", ["b.txt", "a.txt"])
+    assert list(archive.read_many(["b.txt", "a.txt"])) == [("b.txt", b"b.txt"), ("a.txt", b"a.txt")]
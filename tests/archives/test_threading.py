@@ -0,0 +1,74 @@
+"""many threads reading from one archive at once"""
+import random
+import sys
+from concurrent import futures
+
+import pytest
+
+from breki.archives import cdrom, id_software, pkware, valve
+from breki import files
+
+from .samples import contents, raw_iso, raw_pak, raw_vpks, raw_zip
+
+
+@pytest.fixture(autouse=True)
+def switch_often():
+    """more thread switches, more chances to interleave"""
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(switch_interval)
+
+
+@pytest.fixture
+def archives(tmp_path, monkeypatch):
+    """{name: archive_class.from_file}, unparsed; overrides conftest.archives"""
+    # tiny pool, so handles are evicted while other threads are reading
+    monkeypatch.setattr(files.base, "handle_pool", files.HandlePool(max_handles=2))
+    (tmp_path / "test.pak").write_bytes(raw_pak())
+    dir_vpk, archive_vpk = raw_vpks()
+    (tmp_path / "test_dir.vpk").write_bytes(dir_vpk)
+    (tmp_path / "test_000.vpk").write_bytes(archive_vpk)
+    (tmp_path / "test.iso").write_bytes(raw_iso())
+    raw_zip(str(tmp_path / "test.zip"))
+    return {
+        "Pak": lambda: id_software.Pak.from_file(str(tmp_path / "test.pak")),
+        "Pak (bytes)": lambda: id_software.Pak.from_bytes("test.pak", raw_pak()),
+        "Vpk": lambda: valve.Vpk.from_file(str(tmp_path / "test_dir.vpk")),
+        "Iso": lambda: cdrom.Iso.from_file(str(tmp_path / "test.iso")),
+        "Zip": lambda: pkware.Zip.from_file(str(tmp_path / "test.zip"))}
+
+
+@pytest.mark.parametrize("archive_name", ["Pak", "Pak (bytes)", "Vpk", "Iso", "Zip"])
+def test_read(archives, archive_name: str):
+    archive = archives[archive_name]()
+    assert sorted(archive.namelist()) == sorted(contents)
+    for filename, data in contents.items():
+        assert archive.read(filename) == data
+
+
+@pytest.mark.parametrize("archive_name", ["Pak", "Pak (bytes)", "Vpk", "Iso", "Zip"])
+def test_threaded_read(archives, archive_name: str):
+    for attempt in range(4):
+        archive = archives[archive_name]()  # lazy parse races too
+        jobs = [*contents] * 16
+        random.shuffle(jobs)
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(archive.read, jobs))
+        for filename, data in zip(jobs, results):
+            assert data == contents[filename], f"{filename} was corrupted"
+
+
+def test_threaded_stream():
+    """Files from_archive share the archive's stream via SubStreams"""
+    pak = id_software.Pak.from_bytes("test.pak", raw_pak("data/"))
+
+    def read_file(filename: str) -> bytes:
+        file = files.File.from_archive(pak, f"data/{filename}", files.DataType.BINARY)
+        head = file.stream.read(100)
+        return head + file.stream.read()
+
+    jobs = [*contents] * 16
+    with futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(read_file, jobs))
+    assert results == [contents[filename] for filename in jobs]
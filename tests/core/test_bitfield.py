@@ -72,3 +72,43 @@ class TestBitField:
 
         assert actual_size == expected_size
         assert actual == expected
+
+    def test_decode_array(self):
+        _fields = {"flags": 2, "unknown": 6}
+        ints = [0x00, 0xFF, 0x81, 0x7F]
+        columns = bitfield.BitField.decode_array(ints, _fields=_fields, _format="B")
+        assert list(columns["flags"]) == [0, 3, 2, 1]
+        assert list(columns["unknown"]) == [0, 0x3F, 0x01, 0x3F]
+        assert list(bitfield.BitField.encode_array(columns, _fields=_fields, _format="B")) == ints
+        with pytest.raises(OverflowError):
+            bitfield.BitField.encode_array({"flags": [4], "unknown": [0]}, _fields=_fields, _format="B")
+        with pytest.raises(TypeError):
+            bitfield.BitField.encode_array({"flags": [1.5], "unknown": [0]}, _fields=_fields, _format="B")
+        with pytest.raises(TypeError):
+            bitfield.BitField.encode_array({"flags": [1], "unknown": ["0"]}, _fields=_fields, _format="B")
+
+    def test_decode_array_numpy(self):
+        np = pytest.importorskip("numpy")
+        _fields = {"foo": 4, "bar": 12}
+        ints = np.array([0xDEEE, 0x1234], dtype=np.uint16)
+        columns = bitfield.BitField.decode_array(ints, _fields=_fields, _format="H")
+        assert isinstance(columns["foo"], np.ndarray)
+        assert columns["foo"].tolist() == [0xD, 0x1]
+        assert columns["bar"].tolist() == [0xEEE, 0x234]
+        encoded = bitfield.BitField.encode_array(columns, _fields=_fields, _format="H")
+        assert encoded.tolist() == ints.tolist()
+        with pytest.raises(TypeError):
+            bitfield.BitField.encode_array({"foo": np.array([1.5]), "bar": np.array([0])}, _fields=_fields, _format="H")
+
+    def test_array_from_ints(self):
+        _fields = {"flags": 2, "unknown": 6}
+        _classes = {"flags": ExampleFlags}
+        ints = [0x00, 0xFF, 0x81]
+        samples = bitfield.BitField.array_from_ints(ints, _fields=_fields, _format="B", _classes=_classes)
+        for int_, sample in zip(ints, samples):
+            expected = bitfield.BitField.from_int(int_, _fields=_fields, _format="B", _classes=_classes)
+            assert isinstance(sample.flags, ExampleFlags)
+            assert list(sample) == list(expected)
+            assert sample.as_int() == int_
+        with pytest.raises(OverflowError):  # still validates writes
+            samples[0].unknown = 0x40
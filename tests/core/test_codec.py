@@ -0,0 +1,126 @@
+import enum
+import struct
+
+from breki import core
+from breki.core import codec
+
+
+class ExampleFlags(enum.IntFlag):
+    FOO = 0x01
+    BAR = 0x02
+
+
+class Example(core.Struct):
+    __slots__ = ["id", "position", "data", "flags", "bitfield"]
+    _format = "i3f3iI"
+    _arrays = {"position": [*"xyz"], "data": 2}
+    _classes = {"flags": ExampleFlags}
+    _bitfields = {"bitfield": {"foo": 24, "bar": 8}}
+
+
+class ExampleArray(core.MappedArray):
+    _mapping = {"id": None, "position": [*"xyz"], "data": 2}
+    _format = "i3f2h"
+
+
+raw_example = b"".join([
+    struct.pack("i3f3i", 1, 2.0, 3.0, 4.0, 5, 6, ExampleFlags.BAR),
+    (0xAABBCCDD).to_bytes(4, "little")])
+
+
+def test_fields_of():
+    expected = [("id", None, 0, 1), ("position", [*"xyz"], 1, 4), ("data", 2, 4, 6)]
+    assert codec.fields_of(ExampleArray._mapping) == expected
+    assert codec.fields_of([*"ab"]) == [("a", None, 0, 1), ("b", None, 1, 2)]
+
+
+def test_attr_formats():
+    expected = {"id": "i", "position": "fff", "data": "hh"}
+    assert codec.attr_formats(ExampleArray._mapping, ExampleArray._format) == expected
+    assert core.struct.struct_attr_formats[Example]["bitfield"] == "I"
+
+
+def test_invalid_spec():
+    class Invalid(core.Struct):
+        __slots__ = ["a", "b"]
+        _format = "3i"  # 1 too many
+
+    assert Invalid._codec is None
+
+
+class TestStruct:
+    def test_matches_generic(self):
+        compiled = Example.from_bytes(raw_example)
+        Example._codec, example_codec = None, Example._codec
+        try:
+            generic = Example.from_bytes(raw_example)
+        finally:
+            Example._codec = example_codec
+        for attr in Example.__slots__:
+            assert type(getattr(compiled, attr)) is type(getattr(generic, attr))
+        assert isinstance(compiled.flags, ExampleFlags)
+        assert isinstance(compiled.bitfield, core.BitField)
+        assert compiled.as_tuple() == generic.as_tuple()
+        assert compiled.as_bytes() == raw_example
+
+    def test_defaults(self):
+        assert Example().as_bytes() == b"\x00" * struct.calcsize(Example._format)
+
+    def test_override_init(self):
+        class Custom(core.Struct):
+            __slots__ = ["a", "b"]
+            _format = "2i"
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.b *= 2
+
+        assert Custom.from_bytes(struct.pack("2i", 1, 2)).b == 4
+
+
+class TestMappedArray:
+    def test_from_bytes(self):
+        raw = struct.pack(ExampleArray._format, 1, 2.0, 3.0, 4.0, 5, 6)
+        sample = ExampleArray.from_bytes(raw)
+        assert sample.id == 1
+        assert sample.position.y == 3.0
+        assert sample.data == [5, 6]
+        assert sample.as_tuple() == (1, 2.0, 3.0, 4.0, 5, 6)
+        assert sample.as_bytes() == raw
+
+    def test_override_spec(self):
+        """kwargs overriding the class-level spec skip the codec"""
+        sample = ExampleArray.from_tuple((1, 2), _mapping=[*"ab"], _format="2i")
+        assert sample._mapping == [*"ab"]
+        assert sample.as_bytes() == struct.pack("2i", 1, 2)
+
+
+def test_lazy_mapping():
+    raw_table = b"".join(Example(id=i).as_bytes() for i in range(3))
+    records = Example.array_from_bytes(raw_table, lazy=True)
+    mapping = codec.LazyMapping(["a", "b", "c"], records)
+    assert len(mapping) == 3
+    assert "b" in mapping and "d" not in mapping
+    assert len(mapping.decoded) == 0
+    assert mapping["b"].id == 1
+    mapping["b"].id = 5
+    assert mapping["b"].id == 5  # decoded once
+    assert list(mapping) == ["a", "b", "c"]
+    assert [r.id for r in mapping.values()] == [0, 5, 2]
+
+
+def test_lazy_path_table():
+    raw_table = b"".join(Example(id=i).as_bytes() for i in range(3))
+    records = Example.array_from_bytes(raw_table, lazy=True)
+    table = codec.LazyPathTable(["a/x", "a/y", "b/z"], records)
+    preload = table.parallel_table([10, 11, 12])
+    assert dict(preload) == {"a/x": 10, "a/y": 11, "b/z": 12}
+    assert preload.listdir("b") == ["z"]
+    assert isinstance(table, core.PathTable)
+    assert len(table) == 3
+    assert table.listdir("a") == ["x", "y"]
+    assert table["a/y"].id == 1
+    table["a/y"].id = 5
+    assert table["a/y"].id == 5  # decoded once
+    table.insert("b", "w", Example(id=7))
+    assert [r.id for r in table.values()] == [0, 5, 2, 7]
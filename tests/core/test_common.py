@@ -1,3 +1,5 @@
+import struct
+
 from breki.core import common
 
 
@@ -38,3 +40,12 @@ def test_split_format():
     expected = ("i", "I", "f", "f", "f", "16s", "h")
     actual = common.split_format(example)
     assert actual == expected
+
+
+def test_leaf_offsets():
+    assert common.leaf_offsets("") == ()
+    assert common.leaf_offsets("<BQ") == (0, 1)
+    assert common.leaf_offsets("BQ") == (0, 8)
+    # pad bytes don't unpack to a value, so they have no offset
+    assert common.leaf_offsets("<B3xI") == (0, 4)
+    assert len(common.leaf_offsets("<B3xI")) == len(struct.unpack("<B3xI", bytes(8)))
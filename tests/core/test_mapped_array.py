@@ -1,10 +1,16 @@
+import collections
 import enum
+import gc
+import io
+import pickle
 import struct
+import weakref
 from typing import List
 
 from breki.core import common
 from breki.core import bitfield
 from breki.core import mapped_array
+from breki.archives.respawn import rpak
 
 
 # TODO: test_mapping_length
@@ -159,3 +165,74 @@ class TestMappedArray:
 
         assert actual_size == expected_size
         assert actual == expected
+
+    def test_from_stream_many(self):
+        raw_table = struct.pack("6h", 1, 2, 3, 4, 5, 6)
+        table = mapped_array.MappedArray.from_stream_many(
+            io.BytesIO(raw_table), 3,
+            _mapping=[*"xy"],
+            _format="2h")
+        assert [(p.x, p.y) for p in table] == [(1, 2), (3, 4), (5, 6)]
+        lazy_table = mapped_array.MappedArray.array_from_bytes(
+            raw_table, lazy=True,
+            _mapping=[*"xy"],
+            _format="2h")
+        assert lazy_table[1].y == 4
+
+    def test_specialise(self):
+        x = mapped_array.MappedArray(1, 2, _mapping=[*"xy"], _format="2h")
+        y = mapped_array.MappedArray.from_bytes(struct.pack("2h", 3, 4), _mapping=[*"xy"], _format="2h")
+        assert x.__class__ is y.__class__  # cached per spec
+        assert x.__class__._mapping == [*"xy"]
+        x.note = "ad-hoc instances keep a __dict__"
+        z = mapped_array.MappedArray(1, 2, _mapping=[*"xy"], _format="2i")
+        assert z.__class__ is not x.__class__
+        assert x._attr_formats == {"x": "h", "y": "h"}
+
+    def test_compact_subclass(self):
+
+        class Compact(mapped_array.MappedArray):
+            __slots__ = ()
+            _mapping = ["flags", "size"]
+            _format = "2I"
+            _classes = {"flags": ExampleFlags}
+
+        sample = Compact.from_bytes(struct.pack("2I", ExampleFlags.BAR, 16))
+        assert isinstance(sample, Compact)
+        assert not hasattr(sample, "__dict__")
+        assert sample.flags == ExampleFlags.BAR
+        sample.flags = 1  # still converted
+        assert isinstance(sample.flags, ExampleFlags)
+        assert Compact(size=4).as_bytes() == struct.pack("2I", 0, 4)
+
+    def test_pickle(self):
+        segment = rpak.VirtualSegment(flags=1, type=2, size=3)
+        assert pickle.loads(pickle.dumps(segment)) == segment
+        assert pickle.loads(pickle.dumps(segment)).__class__ is segment.__class__
+        nested = mapped_array.MappedArray(
+            (1, 2), 3, _mapping={"a": [*"xy"], "b": None}, _format="3h", _classes={"b": ExampleFlags})
+        nested.note = "extra"
+        copy = pickle.loads(pickle.dumps(nested))
+        assert copy.as_tuple() == nested.as_tuple()
+        assert isinstance(copy.b, ExampleFlags)
+        assert copy.note == "extra"
+
+    def test_cache_limit(self, monkeypatch):
+        monkeypatch.setattr(mapped_array, "specialised_classes", weakref.WeakValueDictionary())
+        monkeypatch.setattr(mapped_array, "recent_classes", collections.OrderedDict())
+        monkeypatch.setattr(mapped_array, "max_specialised", 4)
+        samples = [mapped_array.MappedArray(i, _mapping=[f"x{i}"], _format="h") for i in range(8)]
+        assert len(mapped_array.recent_classes) == 4
+        assert [sample.as_tuple() for sample in samples] == [(i,) for i in range(8)]
+        # specs in use keep their class, even once they aren't recent
+        for i, sample in enumerate(samples):
+            assert mapped_array.MappedArray(0, _mapping=[f"x{i}"], _format="h").__class__ is sample.__class__
+        # least recently used specs are forgotten first
+        mapped_array.MappedArray.specialise(_mapping=["x0"], _format="h")
+        mapped_array.MappedArray.specialise(_mapping=["y"], _format="h")
+        assert [spec[1] for spec in mapped_array.recent_classes] == [
+            ("list", ("x6",)), ("list", ("x7",)), ("list", ("x0",)), ("list", ("y",))]
+        # unused classes are only kept alive by recent_classes
+        del samples
+        gc.collect()
+        assert len(mapped_array.specialised_classes) == 4
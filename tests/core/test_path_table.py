@@ -0,0 +1,64 @@
+import sys
+
+import pytest
+
+from breki import core
+
+
+paths = [
+    "readme.txt",
+    "materials/brick/wall01.vmt",
+    "materials/brick/wall02.vmt",
+    "materials/concrete/floor01.vmt",
+    "models/props/crate.mdl"]
+
+
+def test_mapping():
+    table = core.PathTable((path, i) for i, path in enumerate(paths))
+    assert len(table) == 5
+    assert list(table) == paths
+    assert table["materials/brick/wall02.vmt"] == 2
+    assert "materials/brick/wall03.vmt" not in table
+    assert "materials/brick" not in table  # folders aren't entries
+    with pytest.raises(KeyError):
+        table["nowhere/wall01.vmt"]
+    table["readme.txt"] = -1  # overwrite
+    assert len(table) == 5
+    del table["readme.txt"]
+    assert len(table) == 4
+    assert dict(table) == {path: i for i, path in enumerate(paths) if i != 0}
+
+
+def test_folders():
+    table = core.PathTable()
+    for i, path in enumerate(paths):
+        table.insert(*core.path_table.split(path), i)
+    assert table.is_dir("materials") and table.is_dir("materials/brick/")
+    assert not table.is_dir("materials/brick/wall01.vmt")
+    assert table.listdir() == ["materials/", "models/", "readme.txt"]
+    assert table.listdir("materials") == ["brick/", "concrete/"]
+    assert table.listdir("models/props") == ["crate.mdl"]
+    with pytest.raises(FileNotFoundError):
+        table.listdir("sounds")
+    assert list(table.walk("materials")) == paths[1:4]
+    assert list(table.walk("sounds")) == list()
+
+
+def test_shared_folders():
+    a = core.PathTable({"models/props/crate.mdl": 0})
+    b = core.PathTable({"models/props/crate.mdl": 1})
+    folder_a, folder_b = (next(k for k in t.folders if k.endswith("props")) for t in (a, b))
+    assert folder_a is folder_b
+    assert a.memory_usage()["total"] > sys.getsizeof("crate.mdl")
+
+
+def test_prune():
+    table = core.PathTable((path, i) for i, path in enumerate(paths))
+    del table["models/props/crate.mdl"]
+    assert not table.is_dir("models/props") and not table.is_dir("models")
+    assert table.listdir() == ["materials/", "readme.txt"]
+    del table["materials/concrete/floor01.vmt"]
+    assert table.listdir("materials") == ["brick/"]  # still has files
+    assert table.is_dir("")
+    del table["readme.txt"]
+    assert table.is_dir("")  # root is never pruned
@@ -1,7 +1,11 @@
 import enum
+import io
+import pickle
 import struct
 from typing import List
 
+import pytest
+
 from breki import core
 
 
@@ -109,3 +113,68 @@ class TestStruct:
         assert isinstance(test_Struct.e, list)
 
         assert len(test_Struct.as_bytes()) == struct.calcsize(AllChildTypes._format)
+
+    def test_array_from_bytes(self):
+        raw_table = b"".join(Example(id=i).as_bytes() for i in range(4))
+        table = Example.array_from_bytes(raw_table)
+        assert isinstance(table, list)
+        assert [e.id for e in table] == [0, 1, 2, 3]
+        lazy_table = Example.array_from_bytes(raw_table, lazy=True)
+        assert len(lazy_table) == 4
+        assert lazy_table[-1] == table[-1]
+        assert [e.id for e in lazy_table[1:3]] == [1, 2]
+        with pytest.raises(IndexError):
+            lazy_table[4]
+
+    def test_array_from_bytes_bitfields(self):
+        """BitFields are decoded a column at a time"""
+        raw_table = b"".join(
+            Example(id=i, flags=ExampleFlags.BAR, bitfield=0x01020300 | i).as_bytes()
+            for i in range(4))
+        table = Example.array_from_bytes(raw_table)
+        for i, e in enumerate(table):
+            assert isinstance(e.bitfield, core.BitField)
+            assert (e.bitfield.foo, e.bitfield.bar) == (0x010203, i)
+            assert isinstance(e.data, tuple)
+            assert e == Example.from_bytes(raw_table[i * 32:(i + 1) * 32])
+        assert b"".join(e.as_bytes() for e in table) == raw_table
+
+    def test_pack_many(self):
+        class Entry(core.Struct):
+            __slots__ = ["offset", "length", "flags"]
+            _format = "2IH"
+            _classes = {"flags": ExampleFlags}
+
+        raw_table = b"".join(struct.pack("2IH", i * 16, 16, ExampleFlags.FOO) for i in range(4))
+        table = Entry.array_from_bytes(raw_table)
+        assert table[0]._unpacked is not None  # cached until modified
+        assert Entry.pack_many(table) == raw_table
+        table[1].length = 8
+        assert table[1]._unpacked is None
+        expected = bytearray(raw_table)
+        struct.pack_into("2IH", expected, 10, 16, 8, ExampleFlags.FOO)
+        assert Entry.pack_many(table) == expected
+        buffer = bytearray(4 + len(raw_table))
+        assert Entry.pack_into(buffer, 4, table) == len(buffer)
+        assert buffer[4:] == expected
+        # Structs w/ mutable children are always rebuilt
+        assert getattr(Example.from_bytes(Example().as_bytes()), "_unpacked", None) is None
+        examples = [Example(id=i) for i in range(3)]
+        assert Example.pack_many(examples) == b"".join(e.as_bytes() for e in examples)
+
+    def test_from_stream_many(self):
+        raw_table = b"".join(Example(id=i).as_bytes() for i in range(4))
+        stream = io.BytesIO(raw_table + b"tail")
+        table = Example.from_stream_many(stream, 4)
+        assert [e.id for e in table] == [0, 1, 2, 3]
+        assert stream.read() == b"tail"
+        with pytest.raises(AssertionError):  # unexpected EOF
+            Example.from_stream_many(io.BytesIO(raw_table), 5)
+
+    def test_pickle(self):
+        """Structs w/ _arrays can be sent to a process pool"""
+        example = Example(id=1, position=(1.0, 2.0, 3.0), data=(4, 5), flags=ExampleFlags.BAR)
+        copy = pickle.loads(pickle.dumps(example))
+        assert copy == example
+        assert copy.as_bytes() == example.as_bytes()
+        assert isinstance(copy.position, core.MappedArray)
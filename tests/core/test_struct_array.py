@@ -0,0 +1,75 @@
+import io
+import struct
+
+import pytest
+
+from breki import core
+from breki.core import struct_array
+
+np = pytest.importorskip("numpy")
+
+
+class Entry(core.Struct):
+    __slots__ = ["name", "offset", "length", "position", "data"]
+    _format = "<8s2I3f2h"
+    _arrays = {"position": [*"xyz"], "data": 2}
+
+
+class Aligned(core.Struct):  # native alignment inserts padding
+    __slots__ = ["flag", "value"]
+    _format = "BQ"
+
+
+raw_entries = b"".join(
+    struct.pack(Entry._format, f"entry{i}".encode(), i * 0x10, i % 3, i, 0.5, -1.0, i, -i)
+    for i in range(8))
+
+
+def test_dtype_of():
+    dtype = struct_array.dtype_of(Entry)
+    assert dtype.itemsize == struct.calcsize(Entry._format)
+    assert dtype.names == tuple(Entry.__slots__)
+    assert dtype["position"].names == ("x", "y", "z")
+    assert dtype["data"].shape == (2,)
+    aligned = struct_array.dtype_of(Aligned)
+    assert aligned.itemsize == struct.calcsize(Aligned._format)
+    assert aligned.fields["value"][1] == struct.calcsize("BQ") - struct.calcsize("Q")
+
+
+class TestStructArray:
+    def test_from_bytes(self):
+        entries = core.StructArray.from_bytes(Entry, raw_entries)
+        assert len(entries) == 8
+        assert np.shares_memory(entries.array, np.frombuffer(raw_entries, dtype=np.uint8))
+        assert list(entries.offset) == [i * 0x10 for i in range(8)]
+        assert list(entries.position["x"]) == list(range(8))
+
+    def test_filter(self):
+        entries = core.StructArray.from_bytes(Entry, raw_entries)
+        empty = entries[entries.length == 0]
+        assert isinstance(empty, core.StructArray)
+        assert list(empty.offset) == [0x00, 0x30, 0x60]
+
+    def test_getitem(self):
+        entries = core.StructArray.from_bytes(Entry, raw_entries)
+        entry = entries[-1]
+        assert isinstance(entry, Entry)
+        assert entry.as_bytes() == raw_entries[-struct.calcsize(Entry._format):]
+        assert entry.position.z == -1.0
+        assert [e.as_bytes() for e in entries] == [
+            e.as_bytes() for e in Entry.array_from_bytes(raw_entries)]
+
+    def test_round_trip(self):
+        entries = core.StructArray.from_stream(Entry, io.BytesIO(raw_entries), 8)
+        assert entries.as_bytes() == raw_entries
+        structs = Entry.array_from_bytes(raw_entries)
+        assert core.StructArray.from_structs(Entry, structs).as_bytes() == raw_entries
+
+    def test_setitem(self):
+        entries = core.StructArray.from_bytes(Entry, bytearray(raw_entries))
+        entry = entries[0]
+        entry.length = 0xFF
+        entries[0] = entry
+        assert entries.length[0] == 0xFF
+        entries.offset[1] = 0xAB  # columns are writable views
+        assert entries[1].offset == 0xAB
@@ -0,0 +1,158 @@
+import enum
+import pickle
+import struct
+
+import pytest
+
+from breki import core
+
+
+class ExampleFlags(enum.IntFlag):
+    FOO = 0x01
+    BAR = 0x02
+
+
+class Example(core.Struct):
+    __slots__ = ["id", "position", "data", "flags", "bitfield"]
+    _format = "i3f2hIH"
+    _arrays = {"position": [*"xyz"], "data": 2}
+    _classes = {"flags": ExampleFlags}
+    _bitfields = {"bitfield": {"foo": 4, "bar": 12}}
+
+
+class Aligned(core.Struct):  # native alignment inserts padding
+    __slots__ = ["flag", "value"]
+    _format = "BQ"
+
+
+class Padded(core.Struct):  # explicit pad bytes don't unpack to a value
+    __slots__ = ["flag", "position"]
+    _format = "<B3x3f"
+    _arrays = {"position": [*"xyz"]}
+
+
+class Nested(core.Struct):
+    __slots__ = ["id", "child"]
+    _format = "4h"
+    _arrays = {"child": {"a": None, "b": [*"xy"]}}
+
+
+raw_examples = b"".join(
+    struct.pack(Example._format, i, 1.0, 2.0, float(i), i, -i, ExampleFlags.BAR, 0xA00F | i)
+    for i in range(4))
+
+
+def test_of():
+    ExampleView = core.StructView.of(Example)
+    assert ExampleView is core.StructView.of(Example)  # cached
+    assert ExampleView.__name__ == "ExampleView"
+    assert issubclass(ExampleView, core.StructView)
+
+
+class TestStructView:
+    def test_matches_struct(self):
+        views = core.StructView.of(Example).array_from_bytes(raw_examples)
+        structs = Example.array_from_bytes(raw_examples)
+        assert len(views) == len(structs) == 4
+        for view, struct_ in zip(views, structs):
+            assert view == struct_
+            assert view.as_tuple() == struct_.as_tuple()
+            assert view.position == struct_.position
+            assert view.bitfield.as_int() == struct_.bitfield.as_int()
+        view = views[-1]
+        assert isinstance(view.flags, ExampleFlags)
+        assert isinstance(view.bitfield, core.BitField)
+        assert view.bitfield.foo == 0xA
+        assert view.position.z == 3.0
+        assert view.as_struct().as_bytes() == raw_examples[-view._size:]
+
+    def test_out_of_bounds(self):
+        views = core.StructView.of(Example).array_from_bytes(raw_examples)
+        with pytest.raises(IndexError):
+            views[4]
+
+    def test_write(self):
+        buffer = bytearray(raw_examples)
+        view = core.StructView.of(Example).array_from_bytes(buffer)[1]
+        view.id = 0xFF
+        view.flags = ExampleFlags.FOO | ExampleFlags.BAR
+        view.data = [7, 8]
+        bitfield = view.bitfield
+        bitfield.bar = 0x123
+        view.bitfield = bitfield
+        struct_ = Example.array_from_bytes(buffer)[1]
+        assert struct_.id == 0xFF
+        assert struct_.flags == ExampleFlags.FOO | ExampleFlags.BAR
+        assert struct_.data == (7, 8)
+        assert struct_.bitfield.bar == 0x123
+        # neighbours are untouched
+        assert buffer[:view._size] == raw_examples[:view._size]
+        assert buffer[view._size * 2:] == raw_examples[view._size * 2:]
+
+    def test_write_through(self):
+        """edits to children returned by the view reach the buffer"""
+        buffer = bytearray(raw_examples)
+        view = core.StructView.of(Example).array_from_bytes(buffer)[2]
+        view.bitfield.bar = 0x456
+        view.position.z = 9.0
+        struct_ = Example.array_from_bytes(buffer)[2]
+        assert struct_.bitfield.bar == 0x456
+        assert struct_.bitfield.foo == 0xA  # untouched
+        assert struct_.position.z == 9.0
+        # children keep writing after other edits
+        position = view.position
+        view.id = 7
+        position.x = -1.0
+        assert Example.array_from_bytes(buffer)[2].position.as_tuple() == (-1.0, 2.0, 9.0)
+        assert buffer[:view._size * 2] == raw_examples[:view._size * 2]
+        # copies don't hold onto the buffer
+        copy = pickle.loads(pickle.dumps(view.position))
+        copy.x = 5.0
+        assert view.position.x == -1.0
+
+    def test_write_through_stale(self):
+        """children read before their attr was reassigned don't overwrite it"""
+        buffer = bytearray(raw_examples)
+        view = core.StructView.of(Example)(buffer)
+        stale_position, stale_bitfield = view.position, view.bitfield
+        view.position = (7.0, 7.0, 7.0)
+        view.bitfield = 0x1234
+        stale_position.y = 1.0
+        stale_bitfield.bar = 0x456
+        assert stale_position.y == 1.0  # still a usable copy
+        struct_ = Example.from_bytes(bytes(buffer[:view._size]))
+        assert struct_.position.as_tuple() == (7.0, 7.0, 7.0)
+        assert struct_.bitfield.as_int() == 0x1234
+        # children read after the reassignment still write through
+        position = view.position
+        position.y = 1.0
+        assert Example.from_bytes(bytes(buffer[:view._size])).position.as_tuple() == (7.0, 1.0, 7.0)
+
+    def test_write_through_nested(self):
+        buffer = bytearray(struct.pack(Nested._format, 1, 2, 3, 4))
+        view = core.StructView.of(Nested)(buffer)
+        view.child.b.y = 99
+        assert Nested.from_bytes(bytes(buffer)).child.b.y == 99
+
+    def test_read_only(self):
+        view = core.StructView.of(Example)(raw_examples)
+        with pytest.raises(TypeError):
+            view.id = 1
+        with pytest.raises(TypeError):  # children write through too
+            view.bitfield.bar = 1
+
+    def test_padded(self):
+        buffer = bytearray(struct.pack(Padded._format, 1, 2.0, 3.0, 4.0))
+        view = core.StructView.of(Padded)(buffer)
+        assert view.flag == 1
+        assert view.position.as_tuple() == (2.0, 3.0, 4.0)
+        view.position.z = 5.0
+        assert Padded.from_bytes(bytes(buffer)).position.as_tuple() == (2.0, 3.0, 5.0)
+        assert buffer[1:4] == b"\x00" * 3
+
+    def test_aligned(self):
+        buffer = bytearray(struct.pack(Aligned._format, 1, 2))
+        view = core.StructView.of(Aligned)(buffer)
+        assert (view.flag, view.value) == (1, 2)
+        view.value = 3
+        assert Aligned.from_bytes(bytes(buffer)).value == 3
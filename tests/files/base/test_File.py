@@ -8,3 +8,47 @@
 # -- DataType variants & input data variants
 # -- - open(..., "r") [io.TextIOWrapper] & StringIO
 # -- - open(..., "rb") [io.BufferedReader] & BytesIO
+import struct
+
+from breki.archives import id_software
+from breki.archives.respawn import rpak
+from breki import files
+
+
+def test_buffer_mmap(tmp_path):
+    raw = struct.pack("4s2I", b"TEST", 1, 2) + bytes(256)
+    filepath = tmp_path / "test.bin"
+    filepath.write_bytes(raw)
+    file = files.File.from_file(str(filepath), files.DataType.BINARY)
+    assert isinstance(file.buffer, memoryview)
+    assert file.buffer.readonly
+    assert struct.unpack_from("2I", file.buffer, 4) == (1, 2)
+    assert file.buffer == raw
+    assert file.stream.read(4) == b"TEST"  # .stream still works
+    (tmp_path / "empty.bin").write_bytes(b"")
+    assert len(files.File.from_file(str(tmp_path / "empty.bin")).buffer) == 0
+
+
+def test_buffer_from_bytes():
+    assert files.File.from_bytes("test.bin", b"0123456789").buffer[2:4] == b"23"
+    assert files.File.from_lines("test.txt", ["abc", "def"]).buffer == b"abc\ndef"
+
+
+def test_buffer_from_archive(tmp_path):
+    data = b"\x7FELF" + bytes(60)
+    entry = struct.pack("56s2I", b"maps/test.bsp", 12, len(data))
+    filepath = tmp_path / "test.pak"
+    filepath.write_bytes(b"PACK" + struct.pack("2I", 12 + len(data), len(entry)) + data + entry)
+    pak = id_software.Pak.from_file(str(filepath))
+    file = files.File.from_archive(pak, "maps/test.bsp", files.DataType.BINARY)
+    assert file.buffer == data
+    assert file.buffer.obj is pak.buffer.obj  # view of the archive's mmap
+
+
+def test_StaRPak():
+    entries = [(16, 4), (32, 8)]
+    raw_entries = b"".join(struct.pack("2Q", *entry) for entry in entries)
+    raw_starpak = b"SRPk" + struct.pack("I", 1) + bytes(40) + raw_entries + struct.pack("Q", len(entries))
+    starpak = rpak.StaRPak.from_bytes("test.starpak", raw_starpak)
+    starpak.parse()
+    assert [(e.offset, e.size) for e in starpak.entries] == entries
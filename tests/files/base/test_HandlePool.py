@@ -0,0 +1,81 @@
+import io
+import os
+
+import pytest
+
+from breki.archives import base
+from breki import files
+
+
+@pytest.fixture
+def filepaths(tmp_path):
+    out = list()
+    for i in range(4):
+        filepath = tmp_path / f"{i}.bin"
+        filepath.write_bytes(bytes([i]) * 16)
+        out.append(str(filepath))
+    return out
+
+
+def test_lru(filepaths):
+    pool = files.HandlePool(max_handles=2)
+    streams = [files.PooledStream(filepath, pool) for filepath in filepaths[:3]]
+    assert pool.metrics() == {"open": 2, "max_handles": 2, "hits": 0, "opens": 3, "evictions": 1}
+    # 0 was evicted, reopen transparently
+    streams[0].seek(8)
+    assert streams[0].read(4) == b"\x00" * 4
+    assert (pool.opens, pool.evictions) == (4, 2)
+    assert streams[2].read() == b"\x02" * 16  # still open
+    assert pool.hits == 1
+    assert list(pool.handles) == [streams[0].filepath, streams[2].filepath]
+    pool.resize(1)
+    assert len(pool.handles) == 1
+    pool.close()
+    assert len(pool.handles) == 0
+    assert streams[2].seek(-1, 2) == 15
+
+
+def test_shared_handle(filepaths):
+    """streams on the same file don't move each other"""
+    pool = files.HandlePool(max_handles=2)
+    a, b = (files.PooledStream(filepaths[1], pool) for i in range(2))
+    assert a.read(4) == b"\x01" * 4
+    assert b.read() == b"\x01" * 16
+    assert a.tell() == 4
+    assert len(pool.handles) == 1
+    with pytest.raises(FileNotFoundError):
+        files.PooledStream(filepaths[0] + ".missing", pool)
+
+
+def test_file_stream(filepaths, tmp_path):
+    opens = files.handle_pool.opens
+    file = files.File.from_file(filepaths[3], files.DataType.BINARY)
+    assert isinstance(file.stream, io.BufferedReader)
+    assert isinstance(file.stream.raw, files.PooledStream)
+    assert file.stream.read(2) == b"\x03\x03"
+    assert files.handle_pool.opens == opens + 1
+    text_filepath = tmp_path / "test.txt"
+    text_filepath.write_text("line 1\nline 2\n")
+    text_file = files.File.from_file(str(text_filepath), files.DataType.TEXT)
+    assert text_file.stream.readlines() == ["line 1\n", "line 2\n"]
+    files.handle_pool.close(filepaths[3])
+    file.stream.seek(0)
+    assert file.stream.read() == b"\x03" * 16
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="counts open fds w/ /proc/self/fd")
+def test_disc_tracks(tmp_path, monkeypatch):
+    """reading every track of a multi-track disc stays within the pool's limit"""
+    monkeypatch.setattr(files.base, "handle_pool", files.HandlePool(max_handles=2))
+    disc = base.DiscImage(str(tmp_path / "test.cue"))
+    disc.tracks, disc.friends = list(), dict()
+    for i in range(16):
+        (tmp_path / f"track_{i:02d}.bin").write_bytes(bytes([i]) * 2048 * 4)
+        disc.tracks.append(base.Track(base.TrackMode.BINARY_1, 2048, i * 4, 4, f"track_{i:02d}.bin"))
+        disc.friends[f"track_{i:02d}.bin"] = files.File.from_file(str(tmp_path / f"track_{i:02d}.bin"))
+    disc.is_parsed = True
+    num_fds = len(os.listdir("/proc/self/fd"))
+    for i in range(16):
+        assert disc.sector_read_at(i * 4 + 1, 2) == bytes([i]) * 2048 * 2
+    assert len(os.listdir("/proc/self/fd")) <= num_fds + 2
+    assert files.base.handle_pool.evictions == 14
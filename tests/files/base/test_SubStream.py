@@ -0,0 +1,81 @@
+import io
+import os
+import struct
+
+import pytest
+
+from breki.archives import id_software
+from breki import files
+
+
+def test_read_seek():
+    parent = io.BytesIO(b"header" + b"0123456789" + b"footer")
+    stream = files.SubStream(parent, 6, 10)
+    assert stream.read(4) == b"0123"
+    parent.seek(0)  # other readers can move the parent
+    assert stream.read() == b"456789"
+    assert stream.read(1) == b""  # bounded
+    assert stream.seek(-3, 2) == 7
+    assert stream.read(8) == b"789"
+    stream.seek(2)
+    buffer = bytearray(4)
+    assert stream.readinto(buffer) == 4
+    assert buffer == b"2345"
+    assert stream.seek(100) == 100
+    assert stream.read() == b""
+    with pytest.raises(ValueError):
+        stream.seek(-1)
+    # buffered readers work on top of it
+    assert io.BufferedReader(files.SubStream(parent, 6, 10)).read() == b"0123456789"
+
+
+def test_from_archive():
+    """stored files in archives are read straight from the archive's stream"""
+    data = b"\x7FELF" + bytes(60)
+    entry = struct.pack("56s2I", b"maps/test.bsp", 12, len(data))
+    raw_pak = b"PACK" + struct.pack("2I", 12 + len(data), len(entry)) + data + entry
+    pak = id_software.Pak.from_bytes("test.pak", raw_pak)
+    file = files.File.from_archive(pak, "maps/test.bsp", files.DataType.BINARY)
+    assert isinstance(file.stream, files.SubStream)
+    assert file.stream.read(4) == b"\x7FELF"
+    assert file.size == len(data)
+    file.stream.seek(0)
+    assert file.stream.read() == pak.read("maps/test.bsp")
+
+
+@pytest.mark.parametrize("on_disk", [True, False])
+def test_copy_range(tmp_path, on_disk: bool):
+    raw = b"header" + b"0123456789" * 1000 + b"footer"
+    if on_disk:  # copied in the kernel
+        (tmp_path / "parent.bin").write_bytes(raw)
+        parent = io.BufferedReader(files.PooledStream(str(tmp_path / "parent.bin")))
+    else:
+        parent = io.BytesIO(raw)
+    stream = files.SubStream(files.SubStream(parent, 6, 10000), 10, 9990)
+    with open(tmp_path / "out.bin", "wb") as out_file:
+        out_file.write(b"start")
+        assert files.copy_range(stream, 0, 9990, out_file, chunk_size=256) == 9990
+        assert files.copy_range(stream, 9980, 100, out_file) == 10  # bounded by SubStream
+        assert out_file.tell() == 5 + 10000
+        out_file.write(b"end")
+    assert (tmp_path / "out.bin").read_bytes() == b"start" + raw[16:10006] + raw[9996:10006] + b"end"
+
+
+def test_copy_range_fallback(tmp_path, monkeypatch):
+    """kernel copies that fail part way are finished w/ read_at"""
+    raw = bytes(range(256)) * 16
+    (tmp_path / "in.bin").write_bytes(raw)
+    calls = list()
+
+    def failing_copy(in_fileno: int, out_fileno: int, count: int, offset: int) -> int:
+        if len(calls) > 0:
+            raise OSError("unsupported")
+        calls.append(count)
+        return os.write(out_fileno, os.pread(in_fileno, 1000, offset))
+
+    monkeypatch.setattr(os, "copy_file_range", failing_copy, raising=False)
+    with open(tmp_path / "in.bin", "rb") as in_file, open(tmp_path / "out.bin", "wb") as out_file:
+        out_file.write(b"start")
+        assert files.copy_range(in_file, 0, len(raw), out_file, chunk_size=512) == len(raw)
+    assert len(calls) == 1
+    assert (tmp_path / "out.bin").read_bytes() == b"start" + raw
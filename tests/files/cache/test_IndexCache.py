@@ -0,0 +1,110 @@
+import mmap
+import os
+import struct
+
+import pytest
+
+from breki.archives import valve
+from breki import core
+from breki import files
+
+
+def raw_vpk(filenames) -> bytes:
+    data = b"".join(filename.encode() for filename in filenames)
+    tree = b"txt\x00folder\x00"
+    offset = 0
+    for filename in filenames:
+        tree += filename.encode() + b"\x00"
+        tree += struct.pack("I2H2I", 0, 0, 0x7FFF, offset, len(filename)) + b"\xFF\xFF"
+        offset += len(filename)
+    tree += b"\x00\x00\x00"  # end of folder, extension & tree
+    return struct.pack("I2HI", 0x55AA1234, 1, 0, len(tree)) + tree + data
+
+
+@pytest.fixture
+def index_cache(tmp_path, monkeypatch):
+    out = files.IndexCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(valve.Vpk, "index_cache", out)
+    return out
+
+
+def test_warm_reopen(tmp_path, index_cache):
+    filepath = tmp_path / "test.vpk"
+    filepath.write_bytes(raw_vpk(["a", "bb", "ccc"]))
+    cold = valve.Vpk.from_file(str(filepath))
+    assert (index_cache.hits, index_cache.misses) == (0, 1)
+    assert len(index_cache.index_files()) == 1
+    warm = valve.Vpk.from_file(str(filepath))
+    assert (index_cache.hits, index_cache.misses) == (1, 1)
+    assert warm.namelist() == cold.namelist() == ["folder/a.txt", "folder/bb.txt", "folder/ccc.txt"]
+    assert warm.entries == cold.entries
+    assert warm.preload_offset == cold.preload_offset
+    assert warm.read("folder/ccc.txt") == b"ccc"
+    # still a PathTable, same as after .parse()
+    assert isinstance(warm.entries, core.PathTable)
+    assert warm.entries.listdir("folder") == ["a.txt", "bb.txt", "ccc.txt"]
+    assert list(warm.entries.walk()) == list(cold.entries.walk())
+    del warm.entries["folder/a.txt"]
+    assert warm.namelist() == ["folder/bb.txt", "folder/ccc.txt"]
+    # in memory files aren't cached
+    valve.Vpk.from_bytes("test.vpk", raw_vpk(["a"])).parse()
+    assert (index_cache.hits, index_cache.misses) == (1, 1)
+
+
+def test_invalidation(tmp_path, index_cache):
+    filepath = tmp_path / "test.vpk"
+    filepath.write_bytes(raw_vpk(["a"]))
+    valve.Vpk.from_file(str(filepath))
+    filepath.write_bytes(raw_vpk(["a", "b"]))
+    os.utime(filepath, ns=(0, 0))  # in case the write landed on the same mtime
+    assert valve.Vpk.from_file(str(filepath)).namelist() == ["folder/a.txt", "folder/b.txt"]
+    assert (index_cache.hits, index_cache.misses) == (0, 2)
+    assert len(index_cache.index_files()) == 1  # stale index was removed
+    # corrupt indices are thrown away
+    index_filename = list(index_cache.index_files())[0]
+    with open(os.path.join(index_cache.folder, index_filename), "r+b") as index_file:
+        index_file.write(b"JUNK")
+    assert len(valve.Vpk.from_file(str(filepath)).namelist()) == 2
+    assert (index_cache.hits, index_cache.misses) == (0, 3)
+
+
+@pytest.mark.parametrize("raw_index", [
+    b"", b"JUNK" + bytes(12),
+    struct.pack("<4sII", b"BKIX", files.cache.format_version, 1) + struct.pack("<16sQQ", b"entries", 40, 100)])
+def test_corrupt(tmp_path, index_cache, monkeypatch, raw_index: bytes):
+    """the index is unmapped before it's removed (Windows can't remove mapped files)"""
+    filepath = tmp_path / "test.vpk"
+    filepath.write_bytes(raw_vpk(["a"]))
+    vpk = valve.Vpk(str(filepath))
+    os.makedirs(index_cache.folder, exist_ok=True)
+    index_path = index_cache.index_path(vpk)
+    with open(index_path, "wb") as index_file:
+        index_file.write(raw_index)
+    maps = list()
+
+    class RecordedMap(mmap.mmap):
+        def __new__(cls, *args, **kwargs):
+            out = super().__new__(cls, *args, **kwargs)
+            maps.append(out)
+            return out
+
+    def remove(path: str):
+        assert all(mapped.closed for mapped in maps), "removed a mapped file"
+        os.unlink(path)
+
+    monkeypatch.setattr(mmap, "mmap", RecordedMap)
+    monkeypatch.setattr(files.cache.os, "remove", remove)
+    assert index_cache.load(vpk) is None
+    assert index_cache.misses == 1
+    assert not os.path.exists(index_path)
+
+
+def test_max_size(tmp_path, index_cache):
+    for i in range(4):
+        filepath = tmp_path / f"{i}.vpk"
+        filepath.write_bytes(raw_vpk([f"file_{j}" for j in range(i + 1)]))
+        valve.Vpk.from_file(str(filepath))
+    sizes = [stat.st_size for stat in index_cache.index_files().values()]
+    index_cache.max_size = sum(sizes) - 1
+    index_cache.trim()
+    assert len(index_cache.index_files()) == 3
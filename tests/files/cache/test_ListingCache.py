@@ -0,0 +1,28 @@
+import os
+
+from breki import files
+
+
+def test_listdir(tmp_path):
+    listing_cache = files.ListingCache()
+    (tmp_path / "a.bin").write_bytes(b"")
+    assert listing_cache.listdir(str(tmp_path)) == ["a.bin"]
+    assert listing_cache.lookup(str(tmp_path), "a.bin") == "a.bin"
+    assert listing_cache.lookup(str(tmp_path), "b.bin") is None
+    assert (listing_cache.hits, listing_cache.misses) == (2, 1)
+    # folder mtime changes when a file is added
+    (tmp_path / "b.bin").write_bytes(b"")
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))  # in case of coarse timestamps
+    assert sorted(listing_cache.listdir(str(tmp_path))) == ["a.bin", "b.bin"]
+    assert listing_cache.misses == 2
+
+
+def test_invalidate(tmp_path):
+    listing_cache = files.ListingCache()
+    listing_cache.listdir(str(tmp_path))
+    assert listing_cache.metrics()["folders"] == 1
+    listing_cache.invalidate(str(tmp_path / "."))  # same abspath
+    assert listing_cache.metrics()["folders"] == 0
+    listing_cache.listdir(str(tmp_path))
+    listing_cache.invalidate()
+    assert listing_cache.listings == dict()
@@ -0,0 +1,54 @@
+import pytest
+
+from breki import files
+
+
+class Magic(files.BinaryFile):
+    exts = ["*.bin"]
+    probes = [(0, b"MAGC")]
+
+
+class MagicV2(files.BinaryFile):
+    exts = ["*.bin"]
+    probes = [(0, b"MAGC"), lambda head, tail: head[4] == 2]
+
+
+class Footer(files.BinaryFile):
+    exts = ["*.bin", "*.ftr"]
+    probes = [(-4, b"FOOT")]
+
+
+class Unknown(files.BinaryFile):
+    exts = ["*.bin"]
+
+
+@pytest.fixture
+def registry():
+    out = files.FormatRegistry()
+    for cls in (Unknown, Magic, MagicV2, Footer):
+        out.register(cls)
+    return out
+
+
+def test_sniff():
+    assert Magic.sniff(b"MAGC", b"") == 1
+    assert Magic.sniff(b"MAG", b"") == -1
+    assert MagicV2.sniff(b"MAGC\x02", b"") == 2
+    assert MagicV2.sniff(b"MAGC", b"") == -1  # IndexError
+    assert Footer.sniff(b"", b"FOOT") == 1
+    assert Footer.sniff(b"", b"OOT") == -1
+    assert Unknown.sniff(b"", b"") == 0
+    assert MagicV2.probe_window() == (4, 0)
+    assert Footer.probe_window() == (0, 4)
+
+
+def test_rank(registry, tmp_path):
+    assert registry.candidates("test.ftr") == [Footer]
+    assert registry.candidates("test.bin") == [Unknown, Magic, MagicV2, Footer]
+    (tmp_path / "v1.bin").write_bytes(b"MAGC\x01" + b"\x00" * 8192)
+    assert registry.rank(str(tmp_path / "v1.bin")) == [Magic, Unknown]
+    (tmp_path / "v2.bin").write_bytes(b"MAGC\x02" + b"\x00" * 8192 + b"FOOT")
+    assert registry.rank(str(tmp_path / "v2.bin")) == [MagicV2, Magic, Footer, Unknown]
+    (tmp_path / "empty.bin").write_bytes(b"")
+    assert registry.detect(str(tmp_path / "empty.bin")) is Unknown
+    assert registry.detect(str(tmp_path / "test.txt")) is None  # no candidates, not read
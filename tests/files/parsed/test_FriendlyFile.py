@@ -0,0 +1,45 @@
+from breki import files
+
+
+class Friendly(files.FriendlyBinaryFile):
+    friend_patterns = {
+        "main_000.bin": files.DataType.BINARY,
+        "main_*.txt": files.DataType.TEXT,
+        "[ab].bin": files.DataType.BINARY}
+
+
+def test_compile_friend_patterns():
+    exact, regex, glob_types = files.parsed.compile_friend_patterns(tuple(Friendly.friend_patterns.items()))
+    assert exact == {"main_000.bin": files.DataType.BINARY}
+    assert glob_types == [files.DataType.TEXT, files.DataType.BINARY]
+    assert regex.match("main_001.txt").lastgroup == "friend_0"
+    assert regex.match("b.bin").lastgroup == "friend_1"
+    assert regex.match("c.bin") is None
+
+
+def test_match_friends():
+    names = {"main_000.bin": "main_000.bin", "main_001.txt": "Main_001.TXT", "c.bin": "c.bin"}
+    friends = files.parsed.match_friends(names, Friendly.friend_patterns)
+    assert friends == {"main_000.bin": files.DataType.BINARY, "Main_001.TXT": files.DataType.TEXT}
+
+
+def test_make_friends(tmp_path, monkeypatch):
+    monkeypatch.setattr(files.cache, "listing_cache", files.ListingCache())
+    for filename in ("main.bin", "main_000.bin", "main_001.bin", "main_001.txt", "a.bin", "c.bin"):
+        (tmp_path / filename).write_bytes(b"")
+    main = Friendly.from_file(str(tmp_path / "main.bin"))
+    assert sorted(main.friends) == ["a.bin", "main_000.bin", "main_001.txt"]
+    assert main.friends["main_001.txt"].type == files.DataType.TEXT
+    # the folder is only listed once
+    Friendly.from_file(str(tmp_path / "main.bin"))
+    assert (files.cache.listing_cache.hits, files.cache.listing_cache.misses) == (1, 1)
+
+
+def test_make_friends_candidates(tmp_path):
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    (elsewhere / "main_000.bin").write_bytes(b"")
+    main = Friendly("main.bin")
+    main.make_friends(candidates={"main_000.bin": str(elsewhere / "main_000.bin"), "d.bin": "d.bin"})
+    assert list(main.friends) == ["main_000.bin"]
+    assert main.friends["main_000.bin"].filepath == str(elsewhere / "main_000.bin")
@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+from breki import files
+
+
+class Sniffed(files.HybridFile):
+    exts = {"*.bin": files.DataType.BINARY, "*.txt": files.DataType.TEXT, "*.dat": files.DataType.EITHER}
+    probes = [(0, b"MAGIC"), (-4, b"TAIL")]
+
+    def parse_binary(self):
+        self.parsed_as = "binary"
+
+    def parse_text(self):
+        self.parsed_as = "text"
+
+
+def test_identify():
+    binary = b"MAGIC" + b"\x00" * 8192 + b"TAIL"
+    # extension first
+    assert Sniffed.identify("test.txt", io.BytesIO(binary)) == files.DataType.TEXT
+    assert Sniffed.identify("test.bin", io.BytesIO(b"text")) == files.DataType.BINARY
+    # ambiguous extension, probes decide
+    stream = io.BytesIO(binary)
+    stream.seek(5)
+    assert Sniffed.identify("test.dat", stream) == files.DataType.BINARY
+    assert stream.tell() == 5  # cursor isn't moved
+    assert Sniffed.identify("test.unknown", io.BytesIO(binary)) == files.DataType.BINARY
+    assert Sniffed.identify("test.dat", io.BytesIO(b"MAGIC")) == files.DataType.EITHER
+    # no probes, no guess
+    assert files.HybridFile.identify("test.dat", io.BytesIO(binary)) == files.DataType.EITHER
+
+
+def test_parse_either(tmp_path):
+    (tmp_path / "binary.dat").write_bytes(b"MAGIC text TAIL")
+    sniffed = Sniffed.from_file(str(tmp_path / "binary.dat"))
+    sniffed.parse()
+    assert sniffed.parsed_as == "binary"
+    assert sniffed.type == files.DataType.BINARY
+    (tmp_path / "unknown.dat").write_bytes(b"plain text")
+    with pytest.raises(RuntimeError):
+        Sniffed.from_file(str(tmp_path / "unknown.dat")).parse()
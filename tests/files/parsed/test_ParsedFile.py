@@ -1 +1,105 @@
 # TODO: test .stream still works after .save (if initialised w/ .from_file)
+import os
+import stat
+import sys
+from concurrent import futures
+
+import pytest
+
+from breki import files
+
+
+class Lines(files.TextFile):
+    def as_lines(self):
+        return ["line 1", "line 2"]
+
+
+class Copy(files.BinaryFile):
+    """streams itself back out, like pkware.Zip"""
+    fail_after: int = None
+
+    def as_chunks(self):
+        offset = 0
+        chunk = self.read_at(offset, 4)
+        while len(chunk) != 0:
+            if self.fail_after is not None and offset >= self.fail_after:
+                raise RuntimeError("unparser failed")
+            yield chunk
+            offset += len(chunk)
+            chunk = self.read_at(offset, 4)
+
+
+class OldStyle(files.BinaryFile):
+    """only defines .as_bytes, the unparser before .as_chunks"""
+    def as_bytes(self):
+        return b"old style"
+
+
+class OldStyleHybrid(files.HybridFile):
+    def as_bytes(self):
+        return b"old style"
+
+
+def test_as_chunks():
+    lines = Lines("test.txt")
+    assert list(lines.as_chunks()) == [b"line 1", b"\nline 2"]
+    assert lines.as_bytes() == b"line 1\nline 2"
+    with pytest.raises(NotImplementedError):
+        files.BinaryFile("test.bin").as_bytes()
+
+
+def test_save_as(tmp_path):
+    filepath = str(tmp_path / "test.bin")
+    with open(filepath, "wb") as test_file:
+        test_file.write(b"0123456789")
+    copy = Copy.from_file(filepath)
+    copy.save_as(str(tmp_path / "copy.bin"))
+    assert (tmp_path / "copy.bin").read_bytes() == b"0123456789"
+    copy.save()  # reads from the file it's replacing
+    assert (tmp_path / "test.bin").read_bytes() == b"0123456789"
+    assert sorted(os.listdir(tmp_path)) == ["copy.bin", "test.bin"]  # no temp files left behind
+
+
+def test_save_as_failed(tmp_path):
+    filepath = str(tmp_path / "test.bin")
+    with open(filepath, "wb") as test_file:
+        test_file.write(b"0123456789")
+    copy = Copy.from_file(filepath)
+    copy.fail_after = 4
+    with pytest.raises(RuntimeError):
+        copy.save()
+    assert (tmp_path / "test.bin").read_bytes() == b"0123456789"  # untouched
+    assert os.listdir(tmp_path) == ["test.bin"]
+
+
+@pytest.mark.parametrize("file_class", [OldStyle, OldStyleHybrid])
+def test_save_as_bytes_only(tmp_path, file_class):
+    file = file_class("test.bin")
+    assert list(file.as_chunks()) == [b"old style"]
+    file.save_as(str(tmp_path / "test.bin"))
+    assert (tmp_path / "test.bin").read_bytes() == b"old style"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX modes & symlinks")
+def test_save_as_mode(tmp_path):
+    """.save keeps the file's permissions & replaces a symlink's target, not the symlink"""
+    filepath = tmp_path / "test.bin"
+    filepath.write_bytes(b"0123456789")
+    os.chmod(filepath, 0o640)
+    os.symlink(filepath, tmp_path / "link.bin")
+    Copy.from_file(str(tmp_path / "link.bin")).save()
+    assert os.path.islink(tmp_path / "link.bin")
+    assert filepath.read_bytes() == b"0123456789"
+    assert stat.S_IMODE(os.stat(filepath).st_mode) == 0o640
+    # new files get the usual mode, not mkstemp's 0o600
+    OldStyle("new.bin").save_as(str(tmp_path / "new.bin"))
+    assert stat.S_IMODE(os.stat(tmp_path / "new.bin").st_mode) == 0o666 & ~files.parsed.umask
+    assert sorted(os.listdir(tmp_path)) == ["link.bin", "new.bin", "test.bin"]
+
+
+def test_save_as_threaded(tmp_path):
+    """threads saving the same path don't share a temp file"""
+    with futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: OldStyle("test.bin").save_as(str(tmp_path / "test.bin")), range(32)))
+    assert (tmp_path / "test.bin").read_bytes() == b"old style"
+    assert os.listdir(tmp_path) == ["test.bin"]
@@ -0,0 +1,99 @@
+import io
+import struct
+
+import pytest
+
+from breki import binary
+
+
+def test_read_str():
+    stream = io.BytesIO(b"hello\0" + b"x" * 200 + b"\0tail")
+    assert binary.read_str(stream) == "hello"
+    assert stream.tell() == 6
+    assert binary.read_str(stream, chunk_size=4) == "x" * 200  # longer than chunk_size
+    assert stream.read() == b"tail"
+    with pytest.raises(AssertionError):  # unexpected EOF
+        binary.read_str(io.BytesIO(b"no terminator"))
+
+
+def test_read_strs():
+    raw_table = b"".join(f"string_{i}".encode() + b"\0" for i in range(100))
+    stream = io.BytesIO(raw_table + b"tail")
+    strings = binary.read_strs(stream, 100, chunk_size=16)
+    assert strings == [f"string_{i}" for i in range(100)]
+    assert stream.read() == b"tail"
+    assert binary.read_strs(io.BytesIO(b"\0\0"), 2) == ["", ""]
+    with pytest.raises(AssertionError):  # unexpected EOF
+        binary.read_strs(io.BytesIO(raw_table), 101)
+
+
+def test_split_strings():
+    assert binary.split_strings(b"a\0bc\0") == ["a", "bc"]
+    assert binary.split_strings(b"a\0bc") == ["a", "bc"]
+    assert binary.split_strings(b"\xEB\0", "latin_1") == ["\xEB"]
+    assert binary.split_strings(b"") == []
+
+
+def test_find_all():
+    assert binary.find_all(b"abcabcab", b"ab") == [0, 3, 6]
+    assert binary.find_all(b"aaaa", b"aa") == [0, 2]  # no overlaps
+    assert binary.find_all(b"abc", b"x") == []
+
+
+magics = [b"PACK", b"PK\x03\x04", "0F F5 ?? EE", b"\xF5\x00"]
+raw_data = b"..PACK..\x0F\xF5\x00\xEE..PK\x03\x04" + b"." * 32 + b"PACK"
+expected_hits = [
+    (2, b"PACK"), (8, "0F F5 ?? EE"), (9, b"\xF5\x00"),
+    (14, b"PK\x03\x04"), (14 + 4 + 32, b"PACK")]
+
+
+def test_scan():
+    assert list(binary.scan(raw_data, magics)) == expected_hits
+    # start & stop only limit where hits begin
+    assert list(binary.scan(raw_data, magics, 3, 10)) == expected_hits[1:3]
+    assert list(binary.scan(bytearray(raw_data), ["?? ??"], 0, 2)) == [(0, "?? ??"), (1, "?? ??")]
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_scan_file(tmp_path, workers):
+    filepath = tmp_path / "scan.bin"
+    filepath.write_bytes(raw_data)
+    # tiny chunks split hits across chunk boundaries
+    hits = list(binary.scan_file(str(filepath), magics, chunk_size=5, workers=workers))
+    assert hits == expected_hits
+    (tmp_path / "empty.bin").write_bytes(b"")
+    assert list(binary.scan_file(str(tmp_path / "empty.bin"), magics)) == []
+
+
+def test_struct_reader():
+    raw = b"\x01\x00\x02\x00\x00\x00" + b"name\0" + b"\xFF" * 8
+    for source in (raw, io.BytesIO(raw)):
+        reader = binary.StructReader(source, chunk_size=4)
+        assert reader.read_struct("H") == 1
+        assert reader.read_struct("I") == 2
+        assert reader.read_str() == "name"
+        assert reader.tell() == 11
+        reader.skip(4)
+        assert reader.read(2) == b"\xFF" * 2
+        reader.seek(2)
+        assert reader.read_struct("2H") == (2, 0)
+        reader.seek(-2, 2)
+        assert reader.read() == b"\xFF" * 2
+        with pytest.raises(struct.error):  # unexpected EOF
+            reader.read_struct("I")
+
+
+def test_struct_reader_sync():
+    """stream ends up where unbuffered reads would have left it"""
+    stream = io.BytesIO(b"\x01\x02\x03\x04" + b"\x00" * 8192)
+    with binary.StructReader(stream) as reader:
+        assert reader.read_struct("2B") == (1, 2)
+        with binary.StructReader.of(reader) as inner:
+            assert inner is reader
+            assert inner.read_struct("B") == 3
+        assert stream.tell() > 3  # read ahead
+    assert stream.tell() == 3
+    assert stream.read(1) == b"\x04"
+    with binary.StructReader(stream) as reader:
+        assert len(reader.read(4096)) == 4096  # large reads skip the read ahead
+    assert stream.tell() == 4 + 4096